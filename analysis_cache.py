@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from optimization_engine import SUGGESTION_PARAMETERS
+
+def params_key(process_params, geometry_params):
+    """Hashable, order-independent key for one parameter set"""
+    return (tuple(sorted((k, float(v)) for k, v in process_params.items())),
+            tuple(sorted((k, float(v)) for k, v in geometry_params.items())))
+
+class AnalysisCache:
+    """
+    Memoizes the Optimization Assistant's work per analysis
+
+    Suggestions, the optimized prediction and its score depend only on the
+    analysed parameters and the model, so they are computed once per
+    (model version, parameter set) and reused on every rerun. Applying
+    suggestions predicts just the new parameter set, which is cached the
+    same way. Entries are evicted least recently used first.
+
+    Predictions go through a geometry-bound predictor per part, so each new
+    parameter set only evaluates the process columns. With a SetpointIndex,
+    setpoint searches start from the recipes of similar parts and add their
+    result to the index.
+    """
+
+    def __init__(self, predictor, optimizer, max_entries=64, setpoint_index=None):
+        self.predictor = predictor
+        self.optimizer = optimizer
+        self.setpoint_index = setpoint_index
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, compute):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = self.entries[key] = compute()
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return value
+
+    def bound(self, geometry_params):
+        """Geometry-bound predictor for a part, built once per model version"""
+        geometry_key = tuple(sorted((k, float(v)) for k, v in geometry_params.items()))
+        key = ('bound', self.predictor.model_version, geometry_key)
+        return self._get(key, lambda: self.predictor.bind_geometry(geometry_params))
+
+    def predict(self, process_params, geometry_params):
+        """Predictions and quality score for one parameter set"""
+        def compute():
+            predictions = self.bound(geometry_params).predict(process_params)
+            quality = self.optimizer.calculate_quality_score(
+                predictions['warpage_percent'], predictions['sinkage_percent']
+            )
+            return {'predictions': predictions, 'quality_score': quality['overall_quality']}
+
+        key = ('predict', self.predictor.model_version, params_key(process_params, geometry_params))
+        return self._get(key, compute)
+
+    def assistant(self, analysis):
+        """
+        Suggestions and optimized outcome for an analysis record
+
+        Args:
+            analysis (dict): Record with 'process_params', 'geometry_params' and 'predictions'
+
+        Returns:
+            dict: 'suggestions' (generate_suggestions() output), 'optimized_predictions'
+                  and 'optimized_quality'
+        """
+        process_params, geometry_params = analysis['process_params'], analysis['geometry_params']
+
+        def compute():
+            suggestions = self.optimizer.generate_suggestions(
+                process_params, geometry_params, analysis['predictions']
+            )
+            optimized = self.predict(suggestions['optimized_parameters'], geometry_params)
+            return {
+                'suggestions': suggestions,
+                'optimized_predictions': optimized['predictions'],
+                'optimized_quality': optimized['quality_score']
+            }
+
+        key = ('assistant', self.predictor.model_version, params_key(process_params, geometry_params))
+        return self._get(key, compute)
+
+    def apply(self, analysis, applied):
+        """
+        Outcome of applying some of an analysis's suggestions
+
+        Args:
+            analysis (dict): The analysed record
+            applied (iterable): Display names of the applied suggestions
+
+        Returns:
+            dict: 'process_params' with the applied changes, plus the predict() result
+        """
+        optimized = self.assistant(analysis)['suggestions']['optimized_parameters']
+        process_params = dict(analysis['process_params'])
+        for name in applied:
+            key = SUGGESTION_PARAMETERS.get(name)
+            if key is not None:
+                process_params[key] = optimized[key]
+        return {'process_params': process_params, **self.predict(process_params, analysis['geometry_params'])}
+
+    def search(self, analysis):
+        """Model-searched process settings for an analysis's geometry (OptimizationEngine.search_setpoints)"""
+        process_params, geometry_params = analysis['process_params'], analysis['geometry_params']
+
+        def compute():
+            index = self.setpoint_index
+            starts = [recipe['process_params'] for recipe in index.query(geometry_params)] if index else None
+            best = self.optimizer.search_setpoints(self.bound(geometry_params), process_params, starts=starts)
+            if index is not None:
+                index.add(geometry_params, best['process_params'], best['quality_score'])
+            return best
+
+        key = ('search', self.predictor.model_version, params_key(process_params, geometry_params))
+        return self._get(key, compute)
+
+    def evict(self, count):
+        """Drop up to count least recently used entries; returns how many were dropped"""
+        count = min(count, len(self.entries))
+        for _ in range(count):
+            self.entries.popitem(last=False)
+        return count
+
+    def clear(self):
+        self.entries.clear()
+
+if __name__ == "__main__":
+    import time
+    from quality_predictor import MoldingQualityPredictor
+    from optimization_engine import OptimizationEngine
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models(inference_only=True):
+        predictor.train_models()
+    cache = AnalysisCache(predictor, OptimizationEngine())
+    process = {'melt_temp': 250, 'mold_temp': 40, 'part_temp': 60, 'injection_pressure': 75,
+               'holding_pressure': 45, 'holding_time': 8, 'cooling_time': 25}
+    geometry = {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8}
+    analysis = {'process_params': process, 'geometry_params': geometry,
+                'predictions': predictor.predict(process, geometry)}
+
+    for label in ["first render", "rerun"]:
+        start = time.perf_counter()
+        result = cache.assistant(analysis)
+        print(f"{label}: {(time.perf_counter() - start) * 1e6:.0f} µs, "
+              f"optimized score {result['optimized_quality']:.1f}%")
+    for suggestion in result['suggestions']['suggestions']:
+        applied = cache.apply(analysis, [suggestion['parameter']])
+        print(f"apply {suggestion['parameter']}: score {applied['quality_score']:.1f}%")
+    searched = cache.search(analysis)
+    print(f"searched setpoints: score {searched['quality_score']:.1f}% after {searched['evaluations']} evaluations")
+    print(f"{cache.hits} hits, {cache.misses} misses")
@@ -1,548 +1,781 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from quality_predictor import MoldingQualityPredictor
-from optimization_engine import OptimizationEngine
-import json
-from datetime import datetime
-import os
-
-st.set_page_config(
-    page_title="Injection Molding Quality Checker",
-    page_icon="🔍",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Initialize session state
-if 'predictor' not in st.session_state:
-    st.session_state.predictor = MoldingQualityPredictor()
-    # Load or train models
-    if not st.session_state.predictor.load_models():
-        with st.spinner("Training AI models... This happens only once"):
-            st.session_state.predictor.train_models()
-
-if 'optimizer' not in st.session_state:
-    st.session_state.optimizer = OptimizationEngine()
-
-if 'history' not in st.session_state:
-    st.session_state.history = []
-
-# Custom CSS
-st.markdown("""
-<style>
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 20px;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-    }
-    .quality-good {
-        background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-        color: white;
-        padding: 15px;
-        border-radius: 8px;
-        font-weight: bold;
-    }
-    .quality-warning {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        color: white;
-        padding: 15px;
-        border-radius: 8px;
-        font-weight: bold;
-    }
-    .suggestion-box {
-        border-left: 4px solid #667eea;
-        padding: 15px;
-        margin: 10px 0;
-        background-color: #f8f9fa;
-        border-radius: 5px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Header
-st.markdown("""
-    <h1 style="text-align: center; color: #2c3e50;">
-    🏭 Injection Molding Quality Checker
-    </h1>
-    <p style="text-align: center; color: #7f8c8d; font-size: 18px;">
-    AI-Powered Quality Prediction & Optimization System
-    </p>
-    <hr>
-""", unsafe_allow_html=True)
-
-# Sidebar
-st.sidebar.title("⚙️ Navigation")
-page = st.sidebar.radio("Select Page", [
-    "📊 Quality Analysis",
-    "🎯 Optimization Assistant",
-    "📈 History & Reports",
-    "ℹ️ About"
-])
-
-# ============================================================================
-# PAGE: Quality Analysis
-# ============================================================================
-if page == "📊 Quality Analysis":
-    st.markdown("## Input Process Parameters & Geometry")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("🔧 Process Parameters")
-        melt_temp = st.slider(
-            "Melt Temperature (°C)",
-            min_value=180.0, max_value=280.0, value=230.0, step=1.0
-        )
-        mold_temp = st.slider(
-            "Mold Temperature (°C)",
-            min_value=20.0, max_value=100.0, value=50.0, step=1.0
-        )
-        part_temp = st.slider(
-            "Part Temperature (°C)",
-            min_value=20.0, max_value=100.0, value=60.0, step=1.0
-        )
-        injection_pressure = st.slider(
-            "Injection Pressure (MPa)",
-            min_value=20.0, max_value=150.0, value=75.0, step=1.0
-        )
-        holding_pressure = st.slider(
-            "Holding Pressure (MPa)",
-            min_value=10.0, max_value=100.0, value=65.0, step=1.0
-        )
-    
-    with col2:
-        st.subheader("📐 Part Geometry")
-        holding_time = st.slider(
-            "Holding Time (seconds)",
-            min_value=2.0, max_value=60.0, value=15.0, step=0.5
-        )
-        cooling_time = st.slider(
-            "Cooling Time (seconds)",
-            min_value=5.0, max_value=120.0, value=35.0, step=1.0
-        )
-        time_to_fill = st.slider(
-            "Time to Fill (seconds)",
-            min_value=1.0, max_value=60.0, value=8.0, step=0.5
-        )
-        wall_thickness = st.slider(
-            "Wall Thickness (mm)",
-            min_value=0.5, max_value=5.0, value=2.5, step=0.1
-        )
-        part_volume = st.slider(
-            "Part Volume (cm³)",
-            min_value=10.0, max_value=300.0, value=80.0, step=5.0
-        )
-        aspect_ratio = st.slider(
-            "Aspect Ratio (Length/Width)",
-            min_value=0.5, max_value=4.0, value=1.5, step=0.1
-        )
-    
-    # Predict button
-    if st.button("🔍 Analyze Quality", use_container_width=True, key="analyze"):
-        process_params = {
-            'melt_temp': melt_temp,
-            'mold_temp': mold_temp,
-            'part_temp': part_temp,
-            'injection_pressure': injection_pressure,
-            'holding_pressure': holding_pressure,
-            'holding_time': holding_time,
-            'cooling_time': cooling_time
-        }
-        
-        geometry_params = {
-            'wall_thickness': wall_thickness,
-            'part_volume': part_volume,
-            'aspect_ratio': aspect_ratio,
-            'time_to_fill': time_to_fill
-        }
-        
-        # Get predictions
-        predictions = st.session_state.predictor.predict(process_params, geometry_params)
-        
-        # Calculate quality score
-        quality_data = st.session_state.optimizer.calculate_quality_score(
-            predictions['warpage_percent'],
-            predictions['sinkage_percent']
-        )
-        
-        # Store in history
-        st.session_state.history.append({
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'process_params': process_params,
-            'geometry_params': geometry_params,
-            'predictions': predictions,
-            'quality_score': quality_data['overall_quality']
-        })
-        
-        # Display results
-        st.markdown("---")
-        st.markdown("## 📊 Prediction Results")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(
-                "Warpage %",
-                f"{predictions['warpage_percent']:.2f}%",
-                delta=f"Target: < 5%",
-                delta_color="inverse"
-            )
-        
-        with col2:
-            st.metric(
-                "Sinkage %",
-                f"{predictions['sinkage_percent']:.2f}%",
-                delta=f"Target: < 2%",
-                delta_color="inverse"
-            )
-        
-        with col3:
-            quality_score = quality_data['overall_quality']
-            rating, color = st.session_state.optimizer.get_quality_rating(quality_score)
-            
-            if quality_data['meets_target']:
-                st.markdown(
-                    f'<div class="quality-good">Quality Score: {quality_score:.1f}%<br>{rating}</div>',
-                    unsafe_allow_html=True
-                )
-            else:
-                st.markdown(
-                    f'<div class="quality-warning">Quality Score: {quality_score:.1f}%<br>{rating}</div>',
-                    unsafe_allow_html=True
-                )
-        
-        # Visualizations
-        st.markdown("### 📈 Detailed Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Quality Score Gauge
-            fig_gauge = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=quality_score,
-                title={'text': "Overall Quality Score"},
-                delta={'reference': 95},
-                gauge={
-                    'axis': {'range': [0, 100]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 60], 'color': "#ff6b6b"},
-                        {'range': [60, 75], 'color': "#ffa726"},
-                        {'range': [75, 85], 'color': "#ffeb3b"},
-                        {'range': [85, 95], 'color': "#81c784"},
-                        {'range': [95, 100], 'color': "#66bb6a"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 95
-                    }
-                }
-            ))
-            fig_gauge.update_layout(height=400)
-            st.plotly_chart(fig_gauge, use_container_width=True)
-        
-        with col2:
-            # Defect Distribution
-            defect_data = {
-                'Defect Type': ['Warpage', 'Sinkage'],
-                'Percentage': [
-                    predictions['warpage_percent'],
-                    predictions['sinkage_percent']
-                ]
-            }
-            fig_defect = px.bar(
-                defect_data,
-                x='Defect Type',
-                y='Percentage',
-                color='Defect Type',
-                title="Quality Defects",
-                color_discrete_map={'Warpage': '#667eea', 'Sinkage': '#764ba2'}
-            )
-            fig_defect.add_hline(
-                y=5, line_dash="dash", line_color="red",
-                annotation_text="Acceptable Threshold"
-            )
-            fig_defect.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig_defect, use_container_width=True)
-        
-        # Process parameters radar chart
-        st.markdown("### 🎯 Process Parameters vs Optimal Range")
-        
-        param_names = ['Melt Temp\n(°C)', 'Mold Temp\n(°C)', 'Inj. Pressure\n(MPa)',
-                      'Hold Pressure\n(MPa)', 'Hold Time\n(s)', 'Cool Time\n(s)']
-        
-        current_vals = [
-            (melt_temp / 300) * 100,  # Normalize to 0-100
-            (mold_temp / 100) * 100,
-            (injection_pressure / 150) * 100,
-            (holding_pressure / 100) * 100,
-            (holding_time / 60) * 100,
-            (cooling_time / 120) * 100
-        ]
-        
-        optimal_ranges = [
-            ((230 / 300) * 100, (240 / 300) * 100),
-            ((50 / 100) * 100, (65 / 100) * 100),
-            ((60 / 150) * 100, (90 / 150) * 100),
-            ((60 / 100) * 100, (75 / 100) * 100),
-            ((12 / 60) * 100, (18 / 60) * 100),
-            ((30 / 120) * 100, (45 / 120) * 100)
-        ]
-        
-        optimal_vals = [np.mean(r) for r in optimal_ranges]
-        
-        fig_radar = go.Figure()
-        fig_radar.add_trace(go.Scatterpolar(
-            r=current_vals,
-            theta=param_names,
-            fill='toself',
-            name='Current Settings',
-            marker_color='#667eea'
-        ))
-        fig_radar.add_trace(go.Scatterpolar(
-            r=optimal_vals,
-            theta=param_names,
-            fill='toself',
-            name='Optimal Range',
-            marker_color='#38ef7d'
-        ))
-        fig_radar.update_layout(
-            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-            height=500
-        )
-        st.plotly_chart(fig_radar, use_container_width=True)
-
-
-# ============================================================================
-# PAGE: Optimization Assistant
-# ============================================================================
-elif page == "🎯 Optimization Assistant":
-    st.markdown("## AI-Powered Optimization Suggestions")
-    
-    if not st.session_state.history:
-        st.info("👉 First analyze a product in the 'Quality Analysis' tab to get optimization suggestions.")
-    else:
-        # Get the last analysis
-        last_analysis = st.session_state.history[-1]
-        
-        process_params = last_analysis['process_params']
-        geometry_params = last_analysis['geometry_params']
-        predictions = last_analysis['predictions']
-        
-        # Get suggestions
-        suggestions_data = st.session_state.optimizer.generate_suggestions(
-            process_params, geometry_params, predictions
-        )
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.metric("Current Quality Score", f"{last_analysis['quality_score']:.1f}%")
-        
-        with col2:
-            optimized_params = suggestions_data['optimized_parameters']
-            # Recalculate with optimized params
-            optimized_predictions = st.session_state.predictor.predict(
-                optimized_params, geometry_params
-            )
-            optimized_quality = st.session_state.optimizer.calculate_quality_score(
-                optimized_predictions['warpage_percent'],
-                optimized_predictions['sinkage_percent']
-            )['overall_quality']
-            
-            st.metric("Potential Optimized Score", f"{optimized_quality:.1f}%",
-                     delta=f"+{optimized_quality - last_analysis['quality_score']:.1f}%")
-        
-        st.markdown("---")
-        
-        if suggestions_data['suggestion_count'] == 0:
-            st.success("✅ Your process parameters are already optimized!")
-        else:
-            st.markdown(f"### 📋 {suggestions_data['suggestion_count']} Recommendations")
-            
-            # Sort by priority
-            high_priority = [s for s in suggestions_data['suggestions'] if s['priority'] == 'HIGH']
-            medium_priority = [s for s in suggestions_data['suggestions'] if s['priority'] == 'MEDIUM']
-            
-            for priority, suggestions in [('HIGH', high_priority), ('MEDIUM', medium_priority)]:
-                if suggestions:
-                    if priority == 'HIGH':
-                        st.markdown(f"### 🔴 High Priority Adjustments")
-                    else:
-                        st.markdown(f"### 🟡 Medium Priority Adjustments")
-                    
-                    for sugg in suggestions:
-                        with st.container():
-                            col1, col2 = st.columns([3, 1])
-                            with col1:
-                                st.markdown(f"""
-                                <div class="suggestion-box">
-                                    <b>{sugg['parameter']}</b><br>
-                                    Issue: {sugg['issue']}<br>
-                                    Current: {sugg['current']} → Suggested: {sugg['suggested']}<br>
-                                    Impact: {sugg['impact']}
-                                </div>
-                                """, unsafe_allow_html=True)
-                            with col2:
-                                if st.button("Apply", key=f"apply_{sugg['parameter']}"):
-                                    st.success(f"✅ Applied {sugg['parameter']} change!")
-        
-        # Comparison Chart
-        st.markdown("---")
-        st.markdown("### 📊 Current vs Optimized Parameters")
-        
-        comparison_data = {
-            'Parameter': list(process_params.keys()),
-            'Current': list(process_params.values()),
-            'Optimized': [optimized_params.get(k, v) for k, v in process_params.items()]
-        }
-        
-        fig_comparison = go.Figure()
-        fig_comparison.add_trace(go.Bar(
-            x=comparison_data['Parameter'],
-            y=comparison_data['Current'],
-            name='Current',
-            marker_color='#667eea'
-        ))
-        fig_comparison.add_trace(go.Bar(
-            x=comparison_data['Parameter'],
-            y=comparison_data['Optimized'],
-            name='Optimized',
-            marker_color='#38ef7d'
-        ))
-        fig_comparison.update_layout(barmode='group', height=400)
-        st.plotly_chart(fig_comparison, use_container_width=True)
-
-
-# ============================================================================
-# PAGE: History & Reports
-# ============================================================================
-elif page == "📈 History & Reports":
-    st.markdown("## Analysis History & Reports")
-    
-    if not st.session_state.history:
-        st.info("No analysis records yet. Start by analyzing a product!")
-    else:
-        # Convert history to DataFrame
-        history_data = []
-        for record in st.session_state.history:
-            history_data.append({
-                'Timestamp': record['timestamp'],
-                'Warpage %': f"{record['predictions']['warpage_percent']:.2f}%",
-                'Sinkage %': f"{record['predictions']['sinkage_percent']:.2f}%",
-                'Quality Score': f"{record['quality_score']:.1f}%",
-                'Status': '✅ PASS' if record['quality_score'] >= 95 else '⚠️ NEEDS IMPROVEMENT'
-            })
-        
-        df_history = pd.DataFrame(history_data)
-        st.dataframe(df_history, use_container_width=True)
-        
-        # Quality trend
-        st.markdown("### 📈 Quality Trend")
-        
-        trend_data = {
-            'Analysis #': list(range(1, len(st.session_state.history) + 1)),
-            'Quality Score': [h['quality_score'] for h in st.session_state.history],
-            'Warpage': [h['predictions']['warpage_percent'] for h in st.session_state.history],
-            'Sinkage': [h['predictions']['sinkage_percent'] for h in st.session_state.history]
-        }
-        
-        fig_trend = go.Figure()
-        fig_trend.add_trace(go.Scatter(
-            x=trend_data['Analysis #'],
-            y=trend_data['Quality Score'],
-            mode='lines+markers',
-            name='Quality Score',
-            marker=dict(size=10),
-            line=dict(width=2)
-        ))
-        fig_trend.add_hline(y=95, line_dash="dash", line_color="green",
-                           annotation_text="Target Quality")
-        fig_trend.update_layout(height=400, title="Quality Score Trend")
-        st.plotly_chart(fig_trend, use_container_width=True)
-        
-        # Export option
-        st.markdown("---")
-        if st.button("📥 Export Report as CSV"):
-            csv = df_history.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name="quality_report.csv",
-                mime="text/csv"
-            )
-
-
-# ============================================================================
-# PAGE: About
-# ============================================================================
-elif page == "ℹ️ About":
-    st.markdown("""
-    ## About This System
-    
-    ### 🎯 Purpose
-    This AI-powered quality checker helps manufacturers optimize injection molding processes
-    to minimize warpage and sinkage defects, ensuring products meet quality standards (>95%).
-    
-    ### 🧠 Technology
-    - **Machine Learning**: Multi-Layer Perceptron (Neural Network) models
-    - **Framework**: Scikit-learn & TensorFlow
-    - **Prediction Models**: 
-      - Warpage prediction model
-      - Sinkage prediction model
-    
-    ### 📊 Input Parameters
-    
-    **Process Parameters:**
-    - Melt Temperature (180-280°C)
-    - Mold Temperature (20-100°C)
-    - Injection Pressure (20-150 MPa)
-    - Holding Pressure (10-100 MPa)
-    - Holding Time (2-60 seconds)
-    - Cooling Time (5-120 seconds)
-    
-    **Part Geometry:**
-    - Wall Thickness (0.5-5.0 mm)
-    - Part Volume (10-300 cm³)
-    - Aspect Ratio (0.5-4.0)
-    
-    ### 📈 Output Metrics
-    - **Warpage Percentage**: Deviation from intended shape (%)
-    - **Sinkage Percentage**: Material shrinkage (%)
-    - **Quality Score**: Overall product quality (0-100%)
-    - **Optimization Suggestions**: Actionable recommendations to improve quality
-    
-    ### 🔬 Research Foundation
-    This system is based on research paper:
-    **"Multi-Objective Optimization of Injection Molding Process Parameters 
-    for Junction Boxes Based on BP Neural Network and NSGA-II Algorithm"**
-    
-    Reference: DOI: 10.3390/ma18030577
-    
-    ### 💡 Key Features
-    ✅ Real-time quality prediction
-    ✅ AI-powered optimization suggestions
-    ✅ Historical trend analysis
-    ✅ Interactive visualizations
-    ✅ Export reports to CSV
-    
-    ### 📝 Version
-    Quality Checker v1.0.0
-    Last Updated: February 2026
-    """)
-
-# Add footer
-st.markdown("---")
-st.markdown("""
-    <div style="text-align: center; color: #7f8c8d; font-size: 12px;">
-    <p>🏭 Injection Molding Quality Checker | Powered by AI & Machine Learning</p>
-    <p>For inquiries and support, contact the development team.</p>
-    </div>
-""", unsafe_allow_html=True)
+import streamlit as st
+import numpy as np
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES, PROCESS_FEATURES
+from optimization_engine import OptimizationEngine
+from history_store import HistoryStore
+from history_aggregates import HistoryAggregates, lttb, lttb_indices
+from spc_engine import SPCEngine, SPCMonitor
+from report_generator import QualityReport
+from analysis_cache import AnalysisCache, params_key
+from config_loader import parameter_bounds
+from setpoint_index import SetpointIndex, INDEX_FILE
+from checkpointed_training import CheckpointedTrainer
+from memory_accounting import MemoryAccountant, evict_analysis_cache, spill_history, MB
+from instrumentation import METRICS
+import json
+import uuid
+import atexit
+from datetime import datetime
+import os
+
+# pandas and plotly are imported inside the pages that draw tables and
+# charts, so the first render does not wait for them
+
+st.set_page_config(
+    page_title="Injection Molding Quality Checker",
+    page_icon="🔍",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+@st.cache_resource(show_spinner=False)
+def get_predictor():
+    """One predictor shared by every session; serving only reads it"""
+    predictor = MoldingQualityPredictor()
+    # Load or train models; loading includes the warm-up readiness check.
+    # Serving only needs the numpy forward pass, which skips importing scikit-learn
+    if not predictor.load_models(inference_only=True):
+        with st.spinner("Training AI models... This happens only once"):
+            # Checkpointed, so a restart during training resumes instead of starting over
+            CheckpointedTrainer(predictor).train()
+    return predictor
+
+# Initialize session state
+if 'predictor' not in st.session_state:
+    predictor = get_predictor()
+    # Only serve once the models have passed the readiness check
+    if not predictor.ready:
+        get_predictor.clear()
+        st.error(f"Models are not ready: {predictor.load_error}")
+        st.stop()
+    st.session_state.predictor = predictor
+
+# Opt-in metrics endpoint (MOLDING_METRICS=1 MOLDING_METRICS_PORT=9108); serve() starts it only once
+if METRICS.enabled and os.environ.get("MOLDING_METRICS_PORT"):
+    METRICS.serve(int(os.environ["MOLDING_METRICS_PORT"]))
+
+if 'optimizer' not in st.session_state:
+    st.session_state.optimizer = OptimizationEngine()
+
+# Suggestions and predictions per analysis, so reruns and Apply clicks reuse them
+if 'analysis_cache' not in st.session_state:
+    st.session_state.analysis_cache = AnalysisCache(st.session_state.predictor, st.session_state.optimizer)
+
+@st.cache_resource
+def get_history_store():
+    """One history database shared by every session and operator; queued rows are written on exit"""
+    store = HistoryStore()
+    atexit.register(store.close)
+    return store
+
+@st.cache_resource
+def get_history_aggregates():
+    """Running summary of the shared history, caught up incrementally on each render"""
+    return HistoryAggregates()
+
+@st.cache_resource
+def get_memory_accountant():
+    """Memory held by the shared components and every session, with the config.json budgets"""
+    accountant = MemoryAccountant()
+    accountant.register('predictor', get_predictor())
+    accountant.register('history_store', get_history_store(), trim=spill_history)
+    accountant.register('history_aggregates', get_history_aggregates())
+    return accountant
+
+# The shared components below are built on first use and register themselves then
+
+@st.cache_resource
+def get_spc_engine():
+    """Streaming SPC charts per machine, primed with the stored history"""
+    engine = SPCEngine().load_history(get_history_store())
+    get_memory_accountant().register('spc_engine', engine)
+    return engine
+
+@st.cache_resource
+def get_drift_monitor():
+    """Live input distribution against the training profile, primed with the stored history"""
+    monitor = get_predictor().drift_monitor()
+    history = get_history_store().column_arrays(FEATURE_NAMES)
+    monitor.update_batch(np.column_stack([history[name] for name in FEATURE_NAMES]))
+    get_memory_accountant().register('drift_monitor', monitor)
+    return monitor
+
+@st.cache_resource
+def get_setpoint_index(model_version):
+    """
+    Optimized setpoints by part geometry, shared by all sessions
+
+    The index is built offline, when the models are trained or with
+    `python setpoint_index.py`. Without one for these models it starts empty:
+    searches run cold and their results fill it as the app is used.
+    """
+    index = SetpointIndex.load_current(get_predictor())
+    if index is None:
+        index = SetpointIndex(model_version=model_version)
+    get_memory_accountant().register('setpoint_index', index)
+    return index
+
+@st.cache_resource
+def get_report_archive():
+    """Compressed archive of every analysis, written by a background thread; drained and sealed on exit"""
+    from report_archive import ReportArchive
+    archive = ReportArchive()
+    atexit.register(archive.close)
+    return archive
+
+@st.cache_resource(show_spinner=False)
+def get_chart_templates():
+    """Chart layouts and optimal ranges, built once; each session patches its own copy"""
+    from chart_templates import ChartTemplates
+    return ChartTemplates(OptimizationEngine())
+
+def session_charts():
+    """This session's figures, copied from the shared templates on first use"""
+    if 'charts' not in st.session_state:
+        st.session_state.charts = get_chart_templates().session_copy()
+        get_memory_accountant().register('charts', st.session_state.charts, session=st.session_state.session_id)
+    return st.session_state.charts
+
+history_store = get_history_store()
+
+# Account for this session's caches and keep every budget, at most once per check interval
+memory_accountant = get_memory_accountant()
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:8]
+    memory_accountant.register('analysis_cache', st.session_state.analysis_cache,
+                               session=st.session_state.session_id, trim=evict_analysis_cache)
+memory_accountant.enforce(min_interval=memory_accountant.budgets['check_interval_s'])
+
+# Last analysis of this session, used by the Optimization Assistant
+if 'last_analysis' not in st.session_state:
+    st.session_state.last_analysis = None
+
+# Custom CSS
+st.markdown("""
+<style>
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 20px;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+    }
+    .quality-good {
+        background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
+        color: white;
+        padding: 15px;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+    .quality-warning {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        color: white;
+        padding: 15px;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+    .suggestion-box {
+        border-left: 4px solid #667eea;
+        padding: 15px;
+        margin: 10px 0;
+        background-color: #f8f9fa;
+        border-radius: 5px;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Header
+st.markdown("""
+    <h1 style="text-align: center; color: #2c3e50;">
+    🏭 Injection Molding Quality Checker
+    </h1>
+    <p style="text-align: center; color: #7f8c8d; font-size: 18px;">
+    AI-Powered Quality Prediction & Optimization System
+    </p>
+    <hr>
+""", unsafe_allow_html=True)
+
+# Sidebar
+st.sidebar.title("⚙️ Navigation")
+page = st.sidebar.radio("Select Page", [
+    "📊 Quality Analysis",
+    "🎯 Optimization Assistant",
+    "📈 History & Reports",
+    "ℹ️ About"
+])
+st.sidebar.caption(
+    f"Models ready · first predict {st.session_state.predictor.readiness['cold_latency_ms']:.1f} ms, "
+    f"warm {st.session_state.predictor.readiness['warm_latency_ms']:.1f} ms"
+)
+with st.sidebar.expander("🧮 Memory"):
+    memory = memory_accountant.measure()
+    this_session = memory['sessions'].get(st.session_state.session_id, {})
+    st.caption(f"Process RSS {memory['rss_bytes'] / MB:.0f} MB of {memory['budgets']['process_mb']} MB · "
+               f"{len(memory['sessions'])} session(s) · {memory_accountant.evictions} items trimmed")
+    st.table([{'Component': name.replace('_', ' '), 'Scope': 'shared', 'MB': f"{size / MB:.2f}"}
+              for name, size in memory['process'].items()] +
+             [{'Component': name.replace('_', ' '), 'Scope': 'this session', 'MB': f"{size / MB:.2f}"}
+              for name, size in this_session.items()])
+
+# ============================================================================
+# PAGE: Quality Analysis
+# ============================================================================
+if page == "📊 Quality Analysis":
+    st.markdown("## Input Process Parameters & Geometry")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("🔧 Process Parameters")
+        melt_temp = st.slider(
+            "Melt Temperature (°C)",
+            min_value=180.0, max_value=280.0, value=230.0, step=1.0
+        )
+        mold_temp = st.slider(
+            "Mold Temperature (°C)",
+            min_value=20.0, max_value=100.0, value=50.0, step=1.0
+        )
+        part_temp = st.slider(
+            "Part Temperature (°C)",
+            min_value=20.0, max_value=100.0, value=60.0, step=1.0
+        )
+        injection_pressure = st.slider(
+            "Injection Pressure (MPa)",
+            min_value=20.0, max_value=150.0, value=75.0, step=1.0
+        )
+        holding_pressure = st.slider(
+            "Holding Pressure (MPa)",
+            min_value=10.0, max_value=100.0, value=65.0, step=1.0
+        )
+    
+    with col2:
+        st.subheader("📐 Part Geometry")
+        holding_time = st.slider(
+            "Holding Time (seconds)",
+            min_value=2.0, max_value=60.0, value=15.0, step=0.5
+        )
+        cooling_time = st.slider(
+            "Cooling Time (seconds)",
+            min_value=5.0, max_value=120.0, value=35.0, step=1.0
+        )
+        time_to_fill = st.slider(
+            "Time to Fill (seconds)",
+            min_value=1.0, max_value=60.0, value=8.0, step=0.5
+        )
+        wall_thickness = st.slider(
+            "Wall Thickness (mm)",
+            min_value=0.5, max_value=5.0, value=2.5, step=0.1
+        )
+        part_volume = st.slider(
+            "Part Volume (cm³)",
+            min_value=10.0, max_value=300.0, value=80.0, step=5.0
+        )
+        aspect_ratio = st.slider(
+            "Aspect Ratio (Length/Width)",
+            min_value=0.5, max_value=4.0, value=1.5, step=0.1
+        )
+    
+    # Recipes of similar parts as a starting point, instead of the slider defaults
+    if st.toggle("📌 Show proven setpoints for similar parts", key="show_setpoints"):
+        recipes = get_setpoint_index(st.session_state.predictor.model_version).query({
+            'wall_thickness': wall_thickness, 'part_volume': part_volume,
+            'aspect_ratio': aspect_ratio, 'time_to_fill': time_to_fill
+        }, k=3)
+        if not recipes:
+            st.info("No optimized setpoints indexed yet. Build them offline with `python setpoint_index.py`.")
+        else:
+            st.dataframe([
+                {'Predicted Quality (%)': round(recipe['quality_score'], 1), 'Distance': round(recipe['distance'], 3),
+                 **{name: round(value, 1) for name, value in recipe['process_params'].items()}}
+                for recipe in recipes
+            ], use_container_width=True)
+    
+    # Predict button
+    if st.button("🔍 Analyze Quality", use_container_width=True, key="analyze"):
+        process_params = {
+            'melt_temp': melt_temp,
+            'mold_temp': mold_temp,
+            'part_temp': part_temp,
+            'injection_pressure': injection_pressure,
+            'holding_pressure': holding_pressure,
+            'holding_time': holding_time,
+            'cooling_time': cooling_time
+        }
+        
+        geometry_params = {
+            'wall_thickness': wall_thickness,
+            'part_volume': part_volume,
+            'aspect_ratio': aspect_ratio,
+            'time_to_fill': time_to_fill
+        }
+        
+        # Get predictions
+        predictions = st.session_state.predictor.predict(process_params, geometry_params)
+        
+        # Calculate quality score
+        quality_data = st.session_state.optimizer.calculate_quality_score(
+            predictions['warpage_percent'],
+            predictions['sinkage_percent']
+        )
+        
+        # Prime the shared SPC charts and drift monitor with the stored history before this
+        # analysis joins it, so the analysis is not counted once by the priming and again by update()
+        spc_engine = get_spc_engine()
+        drift_monitor = get_drift_monitor()
+        
+        # Store in history
+        analysis = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'process_params': process_params,
+            'geometry_params': geometry_params,
+            'predictions': predictions,
+            'quality_score': quality_data['overall_quality']
+        }
+        # Written at once: batching only pays off for append_many(), and a queued row is lost on a crash
+        history_store.append(analysis)
+        history_store.flush()
+        get_report_archive().append(analysis)
+        st.session_state.last_analysis = analysis
+        spc_alarms = spc_engine.update(analysis)
+        inputs = {**process_params, **geometry_params}
+        drift_monitor.update([inputs[name] for name in FEATURE_NAMES])
+        
+        # Display results
+        st.markdown("---")
+        st.markdown("## 📊 Prediction Results")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "Warpage %",
+                f"{predictions['warpage_percent']:.2f}%",
+                delta=f"Target: < 5%",
+                delta_color="inverse"
+            )
+        
+        with col2:
+            st.metric(
+                "Sinkage %",
+                f"{predictions['sinkage_percent']:.2f}%",
+                delta=f"Target: < 2%",
+                delta_color="inverse"
+            )
+        
+        with col3:
+            quality_score = quality_data['overall_quality']
+            rating, color = st.session_state.optimizer.get_quality_rating(quality_score)
+            
+            if quality_data['meets_target']:
+                st.markdown(
+                    f'<div class="quality-good">Quality Score: {quality_score:.1f}%<br>{rating}</div>',
+                    unsafe_allow_html=True
+                )
+            else:
+                st.markdown(
+                    f'<div class="quality-warning">Quality Score: {quality_score:.1f}%<br>{rating}</div>',
+                    unsafe_allow_html=True
+                )
+        
+        # Inputs the models never saw during training
+        if predictions['extrapolated']:
+            st.warning(
+                "🧪 Extrapolated prediction: "
+                f"{', '.join(name.replace('_', ' ') for name in predictions['out_of_range'])} "
+                "outside the training range, so these predictions are less reliable"
+            )
+        
+        # Out-of-control signals from the SPC charts
+        for alarm in spc_alarms:
+            st.warning(
+                f"📉 SPC alarm: {alarm['chart']} chart for {alarm['metric'].replace('_', ' ')} "
+                f"is out of control ({alarm['direction']}, statistic {alarm['statistic']:.2f})"
+            )
+        
+        # Visualizations, patched into this session's chart templates
+        charts = session_charts()
+        st.markdown("### 📈 Detailed Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Quality Score Gauge
+            st.plotly_chart(charts.gauge(quality_score), use_container_width=True)
+        
+        with col2:
+            # Defect Distribution
+            st.plotly_chart(charts.defects(predictions), use_container_width=True)
+        
+        # Process parameters radar chart, against OptimizationEngine.optimal_ranges
+        st.markdown("### 🎯 Process Parameters vs Optimal Range")
+        st.plotly_chart(charts.radar(process_params), use_container_width=True)
+
+
+# ============================================================================
+# PAGE: Optimization Assistant
+# ============================================================================
+elif page == "🎯 Optimization Assistant":
+    st.markdown("## AI-Powered Optimization Suggestions")
+    
+    if st.session_state.last_analysis is None:
+        st.info("👉 First analyze a product in the 'Quality Analysis' tab to get optimization suggestions.")
+    else:
+        # Get the last analysis
+        last_analysis = st.session_state.last_analysis
+        
+        process_params = last_analysis['process_params']
+        geometry_params = last_analysis['geometry_params']
+        
+        # Get suggestions (computed once per analysis and model version)
+        assistant = st.session_state.analysis_cache.assistant(last_analysis)
+        suggestions_data = assistant['suggestions']
+        
+        # Suggestions applied so far, reset when a new analysis comes in
+        analysis_key = params_key(process_params, geometry_params)
+        if st.session_state.get('applied_suggestions', {}).get('key') != analysis_key:
+            st.session_state.applied_suggestions = {'key': analysis_key, 'names': set()}
+        applied_names = st.session_state.applied_suggestions['names']
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Current Quality Score", f"{last_analysis['quality_score']:.1f}%")
+        
+        with col2:
+            optimized_params = suggestions_data['optimized_parameters']
+            optimized_quality = assistant['optimized_quality']
+            
+            st.metric("Potential Optimized Score", f"{optimized_quality:.1f}%",
+                     delta=f"+{optimized_quality - last_analysis['quality_score']:.1f}%")
+        
+        with col3:
+            # Batched model search over the process settings for this geometry, warm-started
+            # from similar parts; the result is added to the shared setpoint index
+            setpoint_index = get_setpoint_index(st.session_state.predictor.model_version)
+            st.session_state.analysis_cache.setpoint_index = setpoint_index
+            searched = st.session_state.analysis_cache.search(last_analysis)
+            if setpoint_index.dirty:
+                setpoint_index.save(f"{st.session_state.predictor.model_path}{INDEX_FILE}")
+            st.metric("Model-Searched Score", f"{searched['quality_score']:.1f}%",
+                     delta=f"{searched['quality_score'] - last_analysis['quality_score']:+.1f}%",
+                     help=f"Best of {searched['evaluations']:,} settings within the optimal ranges")
+        
+        st.markdown("---")
+        
+        if suggestions_data['suggestion_count'] == 0:
+            st.success("✅ Your process parameters are already optimized!")
+        else:
+            st.markdown(f"### 📋 {suggestions_data['suggestion_count']} Recommendations")
+            
+            # Sort by priority
+            high_priority = [s for s in suggestions_data['suggestions'] if s['priority'] == 'HIGH']
+            medium_priority = [s for s in suggestions_data['suggestions'] if s['priority'] == 'MEDIUM']
+            
+            for priority, suggestions in [('HIGH', high_priority), ('MEDIUM', medium_priority)]:
+                if suggestions:
+                    if priority == 'HIGH':
+                        st.markdown(f"### 🔴 High Priority Adjustments")
+                    else:
+                        st.markdown(f"### 🟡 Medium Priority Adjustments")
+                    
+                    for sugg in suggestions:
+                        with st.container():
+                            col1, col2 = st.columns([3, 1])
+                            with col1:
+                                st.markdown(f"""
+                                <div class="suggestion-box">
+                                    <b>{sugg['parameter']}</b><br>
+                                    Issue: {sugg['issue']}<br>
+                                    Current: {sugg['current']} → Suggested: {sugg['suggested']}<br>
+                                    Impact: {sugg['impact']}
+                                </div>
+                                """, unsafe_allow_html=True)
+                            with col2:
+                                if st.button("Apply", key=f"apply_{sugg['parameter']}"):
+                                    applied_names.add(sugg['parameter'])
+                                    st.success(f"✅ Applied {sugg['parameter']} change!")
+            
+            if applied_names:
+                # Only the applied parameter set is predicted; everything else is cached
+                applied = st.session_state.analysis_cache.apply(last_analysis, applied_names)
+                st.metric(f"Score with {len(applied_names)} applied change(s)", f"{applied['quality_score']:.1f}%",
+                         delta=f"{applied['quality_score'] - last_analysis['quality_score']:+.1f}%")
+        
+        # Comparison Chart
+        import plotly.graph_objects as go
+        st.markdown("---")
+        st.markdown("### 📊 Current vs Optimized Parameters")
+        
+        comparison_data = {
+            'Parameter': list(process_params.keys()),
+            'Current': list(process_params.values()),
+            'Optimized': [optimized_params.get(k, v) for k, v in process_params.items()]
+        }
+        
+        fig_comparison = go.Figure()
+        fig_comparison.add_trace(go.Bar(
+            x=comparison_data['Parameter'],
+            y=comparison_data['Current'],
+            name='Current',
+            marker_color='#667eea'
+        ))
+        fig_comparison.add_trace(go.Bar(
+            x=comparison_data['Parameter'],
+            y=comparison_data['Optimized'],
+            name='Optimized',
+            marker_color='#38ef7d'
+        ))
+        fig_comparison.update_layout(barmode='group', height=400)
+        st.plotly_chart(fig_comparison, use_container_width=True)
+        
+        # What-if: sweep one process parameter with everything else held at the analysed values
+        st.markdown("---")
+        st.markdown("### 🔬 What-If Analysis")
+        what_if_param = st.selectbox("Parameter to vary", PROCESS_FEATURES, key="what_if_param")
+        lower, upper = parameter_bounds()
+        column = FEATURE_NAMES.index(what_if_param)
+        values = np.linspace(lower[column], upper[column], 100)
+        sweep = np.tile([process_params[name] for name in PROCESS_FEATURES], (len(values), 1)).astype(float)
+        sweep[:, PROCESS_FEATURES.index(what_if_param)] = values
+        sweep_predictions = st.session_state.analysis_cache.bound(geometry_params).predict_batch(sweep)
+        sweep_quality = st.session_state.optimizer.calculate_quality_scores(
+            sweep_predictions['warpage_percent'], sweep_predictions['sinkage_percent']
+        )['overall_quality']
+        
+        fig_what_if = go.Figure()
+        fig_what_if.add_trace(go.Scatter(x=values, y=sweep_quality, mode='lines', name='Quality Score',
+                                         line=dict(color='#667eea')))
+        fig_what_if.add_vline(x=process_params[what_if_param], line_dash='dash', line_color='#7f8c8d',
+                              annotation_text='Current')
+        fig_what_if.add_hline(y=st.session_state.optimizer.quality_target, line_dash='dot', line_color='green')
+        fig_what_if.update_layout(xaxis_title=what_if_param, yaxis_title='Predicted Quality Score (%)', height=350)
+        st.plotly_chart(fig_what_if, use_container_width=True)
+
+
+# ============================================================================
+# PAGE: History & Reports
+# ============================================================================
+elif page == "📈 History & Reports":
+    st.markdown("## Analysis History & Reports")
+    import pandas as pd
+    import plotly.graph_objects as go
+    
+    aggregates = get_history_aggregates().sync(history_store)
+    
+    if aggregates.count == 0:
+        st.info("No analysis records yet. Start by analyzing a product!")
+    else:
+        # All-time summary from the incrementally maintained aggregates
+        summary = aggregates.summary()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Analyses", f"{summary['count']:,}")
+        col2.metric("Pass Rate", f"{summary['pass_rate']:.1%}")
+        col3.metric("Mean Quality", f"{summary['quality_score']['mean']:.1f}%")
+        col4.metric("Quality Range",
+                    f"{summary['quality_score']['min']:.1f}–{summary['quality_score']['max']:.1f}%")
+        
+        # Time range and page selection; only the visible window is loaded
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            date_range = st.date_input("Date range", value=())
+        with col2:
+            page_size = st.selectbox("Records per page", [25, 50, 100, 250], index=1)
+        
+        start = end = None
+        if len(date_range) == 2:
+            start = f"{date_range[0]} 00:00:00"
+            end = f"{date_range[1]} 23:59:59"
+        matching_records = history_store.count(start, end)
+        page_count = max(1, -(-matching_records // page_size))
+        
+        with col3:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        
+        records = history_store.query(start, end, limit=page_size, offset=(page_number - 1) * page_size)
+        st.caption(f"Showing {len(records)} of {matching_records} records (page {page_number} of {page_count})")
+        
+        # Convert the visible window to a DataFrame; numbers stay numeric and are formatted for display only
+        history_data = []
+        for record in records:
+            history_data.append({
+                'Timestamp': record['timestamp'],
+                'Warpage %': record['predictions']['warpage_percent'],
+                'Sinkage %': record['predictions']['sinkage_percent'],
+                'Quality Score': record['quality_score'],
+                'Status': '✅ PASS' if record['quality_score'] >= 95 else '⚠️ NEEDS IMPROVEMENT'
+            })
+        
+        df_history = pd.DataFrame(history_data)
+        st.dataframe(df_history, use_container_width=True, column_config={
+            'Warpage %': st.column_config.NumberColumn(format="%.2f%%"),
+            'Sinkage %': st.column_config.NumberColumn(format="%.2f%%"),
+            'Quality Score': st.column_config.NumberColumn(format="%.1f%%")
+        })
+        
+        # Quality trend over the whole history, LTTB-decimated for large histories
+        st.markdown("### 📈 Quality Trend")
+        
+        st.plotly_chart(session_charts().trend(aggregates), use_container_width=True)
+        
+        # Statistical process control over the whole history, replayed in one vectorized pass
+        st.markdown("### 🧭 Statistical Process Control")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            spc_machine = st.selectbox("Machine", history_store.machine_ids())
+        with col2:
+            spc_metric = st.selectbox("Metric", SPCEngine.METRICS,
+                                      format_func=lambda m: m.replace('_', ' ').title())
+        
+        series = history_store.column_arrays([spc_metric], machine_id=spc_machine)[spc_metric]
+        monitor = SPCMonitor()
+        spc = monitor.replay(series)
+        
+        if monitor.charts is None:
+            st.info(f"SPC charts start after {monitor.calibration_size} analyses "
+                    f"({len(series)} recorded so far for this machine).")
+        else:
+            shots = np.arange(spc['offset'], len(series)) + 1
+            ewma = monitor.charts['ewma']
+            steady_width = ewma.L * ewma.sigma * np.sqrt(ewma.lam / (2 - ewma.lam))
+            alarm_shots = shots[spc['ewma']['alarm'] | spc['cusum']['alarm']]
+            
+            ewma_x, ewma_y = lttb(shots, spc['ewma']['statistic'], 2000)
+            fig_spc = go.Figure()
+            fig_spc.add_trace(go.Scatter(x=ewma_x, y=ewma_y, mode='lines', name='EWMA'))
+            fig_spc.add_hline(y=ewma.target, line_color="gray", annotation_text="Center")
+            fig_spc.add_hline(y=ewma.target + steady_width, line_dash="dash", line_color="red", annotation_text="UCL")
+            fig_spc.add_hline(y=ewma.target - steady_width, line_dash="dash", line_color="red", annotation_text="LCL")
+            fig_spc.update_layout(height=350, title=f"EWMA Chart ({len(alarm_shots)} out-of-control shots)")
+            st.plotly_chart(fig_spc, use_container_width=True)
+            
+            # Decimate both sides at the same shots, picked from the larger excursion
+            keep = lttb_indices(shots, np.maximum(spc['cusum']['upper'], spc['cusum']['lower']), 2000)
+            fig_cusum = go.Figure()
+            fig_cusum.add_trace(go.Scatter(x=shots[keep], y=spc['cusum']['upper'][keep], mode='lines', name='CUSUM+'))
+            fig_cusum.add_trace(go.Scatter(x=shots[keep], y=spc['cusum']['lower'][keep], mode='lines', name='CUSUM−'))
+            fig_cusum.add_hline(y=monitor.charts['cusum'].h, line_dash="dash", line_color="red",
+                                annotation_text="Decision Interval")
+            fig_cusum.update_layout(height=300, title="CUSUM Chart")
+            st.plotly_chart(fig_cusum, use_container_width=True)
+        
+        # Per-shift statistics for the selected date range, computed in one vectorized pass
+        st.markdown("### 🕒 Shift Summary")
+        shift_columns = history_store.column_arrays(
+            ['timestamp', 'quality_score', 'warpage_percent', 'sinkage_percent'], start, end
+        )
+        if len(shift_columns['timestamp']) == 0:
+            st.info("No analyses in the selected date range.")
+        else:
+            shifts = QualityReport.shift_summary(
+                shift_columns['timestamp'], shift_columns['quality_score'],
+                shift_columns['warpage_percent'], shift_columns['sinkage_percent']
+            )
+            st.dataframe(pd.DataFrame({
+                'Shift Start': shifts['shift_start'],
+                'Shots': shifts['count'],
+                'Pass Rate': [f"{rate:.1%}" for rate in shifts['pass_rate']],
+                'Mean Quality': [f"{q:.1f}%" for q in shifts['quality_mean']],
+                'Min Quality': [f"{q:.1f}%" for q in shifts['quality_min']],
+                'Mean Warpage': [f"{w:.2f}%" for w in shifts['warpage_mean']],
+                'Mean Sinkage': [f"{s:.2f}%" for s in shifts['sinkage_mean']]
+            }), use_container_width=True)
+        
+        # Live inputs compared with the data the models were trained on
+        st.markdown("### 🧪 Input Drift")
+        drift = get_drift_monitor().report()
+        drift_data = []
+        for name, stats in drift.items():
+            drift_data.append({
+                'Parameter': name.replace('_', ' ').title(),
+                'Training Range': f"{stats['training_range'][0]:.1f}–{stats['training_range'][1]:.1f}",
+                'Live Mean': f"{stats['mean']:.1f}",
+                'Out of Range': f"{stats['out_of_range_rate']:.1%}",
+                'PSI': round(stats['psi'], 3),
+                'KS': round(stats['ks'], 3),
+                'Status': '⚠️ DRIFT' if stats['drifted'] else '✅ OK'
+            })
+        st.dataframe(pd.DataFrame(drift_data), use_container_width=True)
+        
+        # Export option
+        st.markdown("---")
+        if st.button("📥 Export Report as CSV"):
+            # Every analysis in the selected date range, read from the store in chunks
+            import io
+            csv_buffer = io.StringIO()
+            exported = QualityReport.stream_csv(history_store.iter_records(start, end), csv_buffer)
+            st.caption(f"{exported:,} analyses exported")
+            st.download_button(
+                label="Download CSV",
+                data=csv_buffer.getvalue(),
+                file_name="quality_report.csv",
+                mime="text/csv"
+            )
+
+
+# ============================================================================
+# PAGE: About
+# ============================================================================
+elif page == "ℹ️ About":
+    st.markdown("""
+    ## About This System
+    
+    ### 🎯 Purpose
+    This AI-powered quality checker helps manufacturers optimize injection molding processes
+    to minimize warpage and sinkage defects, ensuring products meet quality standards (>95%).
+    
+    ### 🧠 Technology
+    - **Machine Learning**: Multi-Layer Perceptron (Neural Network) models
+    - **Framework**: Scikit-learn & TensorFlow
+    - **Prediction Models**: 
+      - Warpage prediction model
+      - Sinkage prediction model
+    
+    ### 📊 Input Parameters
+    
+    **Process Parameters:**
+    - Melt Temperature (180-280°C)
+    - Mold Temperature (20-100°C)
+    - Injection Pressure (20-150 MPa)
+    - Holding Pressure (10-100 MPa)
+    - Holding Time (2-60 seconds)
+    - Cooling Time (5-120 seconds)
+    
+    **Part Geometry:**
+    - Wall Thickness (0.5-5.0 mm)
+    - Part Volume (10-300 cm³)
+    - Aspect Ratio (0.5-4.0)
+    
+    ### 📈 Output Metrics
+    - **Warpage Percentage**: Deviation from intended shape (%)
+    - **Sinkage Percentage**: Material shrinkage (%)
+    - **Quality Score**: Overall product quality (0-100%)
+    - **Optimization Suggestions**: Actionable recommendations to improve quality
+    
+    ### 🔬 Research Foundation
+    This system is based on research paper:
+    **"Multi-Objective Optimization of Injection Molding Process Parameters 
+    for Junction Boxes Based on BP Neural Network and NSGA-II Algorithm"**
+    
+    Reference: DOI: 10.3390/ma18030577
+    
+    ### 💡 Key Features
+    ✅ Real-time quality prediction
+    ✅ AI-powered optimization suggestions
+    ✅ Historical trend analysis
+    ✅ Interactive visualizations
+    ✅ Export reports to CSV
+    
+    ### 📝 Version
+    Quality Checker v1.0.0
+    Last Updated: February 2026
+    """)
+
+# Add footer
+st.markdown("---")
+st.markdown("""
+    <div style="text-align: center; color: #7f8c8d; font-size: 12px;">
+    <p>🏭 Injection Molding Quality Checker | Powered by AI & Machine Learning</p>
+    <p>For inquiries and support, contact the development team.</p>
+    </div>
+""", unsafe_allow_html=True)
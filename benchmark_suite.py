@@ -0,0 +1,266 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+import numpy as np
+import sklearn
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+from optimization_engine import OptimizationEngine
+
+RESULTS_DIR = "benchmarks/"
+
+def machine_info():
+    """Host and library versions stored with every result, so runs on different machines are not compared blindly"""
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scikit-learn': sklearn.__version__
+    }
+
+def best_rate(function, items, rounds=5):
+    """Items per second from the fastest of several rounds; slower rounds are scheduler or cache noise"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return items / best
+
+def latency_stats(seconds, prefix, unit='ms'):
+    """Percentiles of a list of timings, keyed as benchmark metrics"""
+    scale = {'ms': 1e3, 'us': 1e6}[unit]
+    values = np.asarray(seconds) * scale
+    return {
+        f"{prefix}_{name}_{unit}": {'value': float(stat), 'unit': unit, 'better': 'lower'}
+        for name, stat in [('p50', np.percentile(values, 50)), ('p90', np.percentile(values, 90)),
+                           ('p99', np.percentile(values, 99)), ('mean', values.mean())]
+    }
+
+class BenchmarkSuite:
+    """
+    Timing benchmarks for training, loading, inference, scoring and suggestions
+
+    Every benchmark runs against models trained into a temporary directory,
+    so the shipped models/ are never touched. Each metric records its unit
+    and whether lower or higher is better, which compare() uses to decide
+    what counts as a regression.
+    """
+
+    BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+    def __init__(self, repeats=1000, quick=False):
+        self.repeats = 100 if quick else repeats
+        self.batch_sizes = self.BATCH_SIZES[:4] if quick else self.BATCH_SIZES
+        self.model_path = os.path.join(tempfile.mkdtemp(prefix="benchmark_models_"), "")
+        self.predictor = MoldingQualityPredictor(model_path=self.model_path)
+        self.optimizer = OptimizationEngine()
+        self.inputs, _, _ = self.predictor.generate_training_data(samples=max(self.batch_sizes), seed=99)
+
+    def sample_params(self, i):
+        """Process and geometry dicts for row i of the benchmark inputs"""
+        row = dict(zip(FEATURE_NAMES, self.inputs[i % len(self.inputs)]))
+        return ({name: row[name] for name in PROCESS_FEATURES},
+                {name: row[name] for name in GEOMETRY_FEATURES})
+
+    def bench_train(self):
+        """Wall-clock time of train_models(), including saving"""
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.predictor.train_models()
+        return {'train_models_s': {'value': time.perf_counter() - start, 'unit': 's', 'better': 'lower'}}
+
+    def bench_load(self):
+        """Cold-start time of load_models(), with and without the warm-up check and the pickles"""
+        results = {}
+        for name, warm_up, inference_only in [('load_models_s', False, False),
+                                              ('load_models_warm_up_s', True, False),
+                                              ('load_models_inference_only_s', True, True)]:
+            predictor = MoldingQualityPredictor(model_path=self.model_path)
+            start = time.perf_counter()
+            predictor.load_models(warm_up=warm_up, inference_only=inference_only)
+            results[name] = {'value': time.perf_counter() - start, 'unit': 's', 'better': 'lower'}
+        return results
+
+    def bench_predict(self):
+        """Single-row predict() latency percentiles, unbound and geometry-bound"""
+        params = [self.sample_params(i) for i in range(self.repeats)]
+        self.predictor.predict(*params[0])
+        timings = np.empty(self.repeats)
+        for i, (process, geometry) in enumerate(params):
+            start = time.perf_counter()
+            self.predictor.predict(process, geometry)
+            timings[i] = time.perf_counter() - start
+        results = latency_stats(timings, 'predict_latency')
+        
+        # Same process settings on one bound geometry: only the process columns are evaluated
+        bound = self.predictor.bind_geometry(params[0][1])
+        bound.predict(params[0][0])
+        for i, (process, _) in enumerate(params):
+            start = time.perf_counter()
+            bound.predict(process)
+            timings[i] = time.perf_counter() - start
+        results.update(latency_stats(timings, 'bound_predict_latency'))
+        return results
+
+    def bench_batch(self):
+        """predict_batch() throughput for each batch size"""
+        results = {}
+        for size in self.batch_sizes:
+            batch = self.inputs[:size]
+            calls = max(3, min(200, 20000 // size))
+            self.predictor.predict_batch(batch)
+
+            def run_calls():
+                for _ in range(calls):
+                    self.predictor.predict_batch(batch)
+
+            results[f"predict_batch_{size}_rows_per_s"] = {
+                'value': best_rate(run_calls, size * calls), 'unit': 'rows/s', 'better': 'higher'
+            }
+        return results
+
+    def bench_suggestions(self):
+        """generate_suggestions() latency for varied inputs"""
+        params = [self.sample_params(i) for i in range(self.repeats)]
+        predictions = self.predictor.predict_batch(self.inputs[:self.repeats])
+        timings = np.empty(self.repeats)
+        for i, (process, geometry) in enumerate(params):
+            prediction = {
+                'warpage_percent': predictions['warpage_percent'][i % len(predictions['warpage_percent'])],
+                'sinkage_percent': predictions['sinkage_percent'][i % len(predictions['sinkage_percent'])]
+            }
+            start = time.perf_counter()
+            self.optimizer.generate_suggestions(process, geometry, prediction)
+            timings[i] = time.perf_counter() - start
+        return latency_stats(timings, 'suggestions_latency', unit='us')
+
+    def bench_scoring(self, rows=100000):
+        """Quality scoring throughput, one call per row and vectorized"""
+        rng = np.random.default_rng(0)
+        warpage = rng.uniform(0, 10, rows)
+        sinkage = rng.uniform(0, 5, rows)
+
+        count = min(rows, self.repeats * 10)
+        pairs = list(zip(warpage[:count].tolist(), sinkage[:count].tolist()))
+
+        def score_each():
+            for w, s in pairs:
+                self.optimizer.calculate_quality_score(w, s)
+
+        scalar = best_rate(score_each, count)
+        vectorized = best_rate(lambda: self.optimizer.calculate_quality_scores(warpage, sinkage), rows)
+        return {
+            'quality_score_rows_per_s': {'value': scalar, 'unit': 'rows/s', 'better': 'higher'},
+            'quality_scores_vectorized_rows_per_s': {'value': vectorized, 'unit': 'rows/s', 'better': 'higher'}
+        }
+
+    def run(self):
+        """
+        Run every benchmark
+
+        Returns:
+            dict: 'machine', 'timestamp', 'repeats' and 'benchmarks' (metric name ->
+                  value, unit and which direction is better)
+        """
+        benchmarks = {}
+        try:
+            # Training first: it produces the models every other benchmark uses
+            for bench in [self.bench_train, self.bench_load, self.bench_predict,
+                          self.bench_batch, self.bench_suggestions, self.bench_scoring]:
+                benchmarks.update(bench())
+        finally:
+            shutil.rmtree(self.model_path, ignore_errors=True)
+        return {
+            'machine': machine_info(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'repeats': self.repeats,
+            'benchmarks': benchmarks
+        }
+
+def save_results(results, filename):
+    """Write benchmark results as JSON"""
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return filename
+
+def load_results(filename):
+    """Read benchmark results written by save_results()"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compare results with a baseline run
+
+    Args:
+        results (dict): Output of BenchmarkSuite.run()
+        baseline (dict): Earlier results to compare against
+        threshold (float): Relative slowdown tolerated before a metric counts as a regression
+
+    Returns:
+        list: One dict per metric present in both runs, with baseline and current
+              values, relative change (positive = better) and a regression flag
+    """
+    rows = []
+    for name, current in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['value']
+        after = current['value']
+        change = (after - before) / before if before else 0.0
+        if current['better'] == 'lower':
+            change = -change
+        rows.append({
+            'metric': name,
+            'unit': current['unit'],
+            'baseline': before,
+            'current': after,
+            'change': change,
+            'regression': change < -threshold
+        })
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark inference, optimization and training")
+    parser.add_argument("--output", default=f"{RESULTS_DIR}latest.json", help="Where to write the results")
+    parser.add_argument("--baseline", default=f"{RESULTS_DIR}baseline.json", help="Results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative regression threshold")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and smaller batches")
+    args = parser.parse_args()
+
+    results = BenchmarkSuite(quick=args.quick).run()
+    save_results(results, args.output)
+    for name, metric in results['benchmarks'].items():
+        print(f"{name:<42} {metric['value']:>14,.3f} {metric['unit']}")
+    print(f"\nResults saved to {args.output}")
+
+    regressions = []
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        baseline = load_results(args.baseline)
+        if baseline['machine'] != results['machine']:
+            print("⚠️  Baseline was recorded on a different machine or library versions")
+        print(f"\nComparison with {args.baseline} (threshold {args.threshold:.0%}):")
+        for row in compare(results, baseline, args.threshold):
+            flag = "❌ REGRESSION" if row['regression'] else "✅"
+            print(f"{row['metric']:<42} {row['change']:>+8.1%}  {flag}")
+            if row['regression']:
+                regressions.append(row['metric'])
+
+    sys.exit(1 if regressions else 0)
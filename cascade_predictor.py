@@ -0,0 +1,134 @@
+import numpy as np
+from optimization_engine import OptimizationEngine
+from surrogate_model import PolynomialSurrogate
+
+class CascadePredictor:
+    """
+    Two-stage quality scoring for high-rate batches
+
+    A polynomial surrogate scores every shot first. Only shots whose surrogate
+    quality score lies within a calibrated margin of the PASS/FAIL threshold
+    are escalated to the full warpage and sinkage networks.
+    """
+
+    def __init__(self, predictor, optimizer=None, degree=2, coverage=0.999):
+        self.predictor = predictor
+        self.optimizer = optimizer or OptimizationEngine()
+        self.surrogate = PolynomialSurrogate(degree=degree)
+        self.coverage = coverage
+        self.margin = None
+        self.calibration_report = None
+        self.rows_scored = 0
+        self.rows_escalated = 0
+
+    def _surrogate_predict(self, features):
+        """Warpage and sinkage from the surrogate, clipped like the full model"""
+        features_scaled = self.predictor.scaler.transform(features)
+        outputs = np.maximum(0, self.surrogate.predict(features_scaled))
+        return outputs[:, 0], outputs[:, 1]
+
+    def fit(self, samples=6000, seed=7):
+        """
+        Distill the surrogate from the full models and calibrate the escalation margin
+
+        Samples are split in three: one part fits the surrogate, one sets the
+        margin from a quantile of the surrogate's score error, and one validates that no
+        PASS/FAIL decision differs from the full model. If the validation set
+        still finds a disagreement the margin is widened to cover it.
+
+        Returns:
+            dict: Calibration report with margin, escalation rate and disagreements
+        """
+        X, _, _ = self.predictor.generate_training_data(samples=samples, seed=seed)
+        full = self.predictor.predict_batch(X)
+        full_scores = self.optimizer.calculate_quality_scores(
+            full['warpage_percent'], full['sinkage_percent']
+        )['overall_quality']
+
+        fit_idx, cal_idx, val_idx = np.array_split(np.arange(samples), 3)
+
+        # Stage 1: distill the surrogate
+        X_fit_scaled = self.predictor.scaler.transform(X[fit_idx])
+        targets = np.column_stack([full['warpage_percent'][fit_idx], full['sinkage_percent'][fit_idx]])
+        self.surrogate.fit(X_fit_scaled, targets)
+
+        # Stage 2: margin from a high quantile of the surrogate's score error on held-out rows
+        warpage, sinkage = self._surrogate_predict(X[cal_idx])
+        cal_scores = self.optimizer.calculate_quality_scores(warpage, sinkage)['overall_quality']
+        self.margin = float(np.quantile(np.abs(cal_scores - full_scores[cal_idx]), self.coverage))
+
+        # Stage 3: validation must show zero PASS/FAIL disagreements
+        target = self.optimizer.quality_target
+        warpage, sinkage = self._surrogate_predict(X[val_idx])
+        val_scores = self.optimizer.calculate_quality_scores(warpage, sinkage)['overall_quality']
+        decided = np.abs(val_scores - target) > self.margin
+        disagree = decided & ((val_scores >= target) != (full_scores[val_idx] >= target))
+        widened = bool(disagree.any())
+        if widened:
+            self.margin = float(np.max(np.abs(val_scores[disagree] - target))) + 1e-9
+            decided = np.abs(val_scores - target) > self.margin
+            disagree = decided & ((val_scores >= target) != (full_scores[val_idx] >= target))
+
+        self.calibration_report = {
+            'margin': self.margin,
+            'margin_widened': widened,
+            'validation_rows': len(val_idx),
+            'validation_escalation_rate': float(1 - decided.mean()),
+            'validation_disagreements': int(disagree.sum())
+        }
+        return self.calibration_report
+
+    def predict_batch(self, features):
+        """
+        Score a batch of shots through the cascade
+
+        Args:
+            features (array-like): Raw feature matrix of shape (n, 11)
+
+        Returns:
+            dict: Warpage, sinkage and quality arrays plus the escalated mask.
+                  Non-escalated rows carry the surrogate's estimates.
+        """
+        if self.margin is None:
+            raise RuntimeError("CascadePredictor must be fitted before scoring")
+
+        features = np.asarray(features, dtype=float).reshape(-1, self.predictor.scaler.n_features_in_)
+        warpage, sinkage = self._surrogate_predict(features)
+        quality = self.optimizer.calculate_quality_scores(warpage, sinkage)['overall_quality']
+        escalated = np.abs(quality - self.optimizer.quality_target) <= self.margin
+
+        if escalated.any():
+            full = self.predictor.predict_batch(features[escalated])
+            warpage[escalated] = full['warpage_percent']
+            sinkage[escalated] = full['sinkage_percent']
+            quality[escalated] = self.optimizer.calculate_quality_scores(
+                full['warpage_percent'], full['sinkage_percent']
+            )['overall_quality']
+
+        self.rows_scored += len(features)
+        self.rows_escalated += int(escalated.sum())
+
+        return {
+            'warpage_percent': warpage,
+            'sinkage_percent': sinkage,
+            'quality_score': quality,
+            'meets_target': quality >= self.optimizer.quality_target,
+            'escalated': escalated
+        }
+
+    @property
+    def escalation_rate(self):
+        """Fraction of all scored rows that needed the full networks"""
+        return self.rows_escalated / self.rows_scored if self.rows_scored else 0.0
+
+if __name__ == "__main__":
+    from quality_predictor import MoldingQualityPredictor
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models():
+        predictor.train_models()
+    cascade = CascadePredictor(predictor)
+    report = cascade.fit()
+    print(f"Escalation margin: {report['margin']:.2f} points")
+    print(f"Escalated on validation: {report['validation_escalation_rate']:.1%}")
+    print(f"PASS/FAIL disagreements: {report['validation_disagreements']}")
@@ -0,0 +1,208 @@
+import copy
+import numpy as np
+import plotly.graph_objects as go
+from config_loader import load_config, parameter_spec
+
+# Radar axes: model feature and label
+RADAR_AXES = [
+    ('melt_temp', 'Melt Temp\n(°C)'),
+    ('mold_temp', 'Mold Temp\n(°C)'),
+    ('injection_pressure', 'Inj. Pressure\n(MPa)'),
+    ('holding_pressure', 'Hold Pressure\n(MPa)'),
+    ('holding_time', 'Hold Time\n(s)'),
+    ('cooling_time', 'Cool Time\n(s)')
+]
+
+# Gauge band colour per config.json quality rating
+RATING_COLORS = {
+    'poor': "#ff6b6b",
+    'needs_improvement': "#ffa726",
+    'acceptable': "#ffeb3b",
+    'good': "#81c784",
+    'excellent': "#66bb6a"
+}
+
+# Above this many points the trend is drawn without markers
+TREND_MARKER_LIMIT = 200
+
+class ChartTemplates:
+    """
+    Plotly figures for the Quality Analysis and History pages, built once
+
+    Everything that does not depend on the analysis (layout, colours, the
+    quality bands, the optimal-range trace of the radar) is set up here from
+    the OptimizationEngine and config.json, so the ranges drawn are the ones
+    the optimizer works with. Each render then only patches the data of the
+    trace that changed, which costs microseconds instead of rebuilding and
+    validating whole figures.
+
+    Figures are patched in place, so every session needs its own copy:
+    keep one instance per process as the template and call session_copy().
+    """
+
+    def __init__(self, optimizer, config=None):
+        config = config or load_config()
+        self.quality_target = optimizer.quality_target
+        names = [name for name, _ in RADAR_AXES]
+        self.radar_scale = np.array([parameter_spec(config, name)['max'] for name in names], dtype=float)
+        self.optimal_ranges = {name: optimizer.optimal_ranges[name] for name in names}
+        self.trend_count = None
+        self.figures = {
+            'gauge': self._gauge(config),
+            'defects': self._defects(config),
+            'radar': self._radar(),
+            'trend': self._trend()
+        }
+
+    def _gauge(self, config):
+        ratings = config['quality_ratings']
+        steps = sorted(({'range': ratings[name]['range'], 'color': color} for name, color in RATING_COLORS.items()),
+                       key=lambda step: step['range'][0])
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number+delta",
+            value=0,
+            title={'text': "Overall Quality Score"},
+            delta={'reference': self.quality_target},
+            gauge={
+                'axis': {'range': [0, 100]},
+                'bar': {'color': "darkblue"},
+                'steps': steps,
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': self.quality_target
+                }
+            }
+        ))
+        fig.update_layout(height=400)
+        return fig
+
+    def _defects(self, config):
+        fig = go.Figure(go.Bar(
+            x=['Warpage', 'Sinkage'],
+            y=[0, 0],
+            marker_color=['#667eea', '#764ba2'],
+            hovertemplate="%{x}: %{y:.2f}%<extra></extra>"
+        ))
+        fig.add_hline(
+            y=config['quality_targets']['warpage_percent']['target'], line_dash="dash", line_color="red",
+            annotation_text="Acceptable Threshold"
+        )
+        fig.update_layout(height=400, showlegend=False, title="Quality Defects",
+                          xaxis_title="Defect Type", yaxis_title="Percentage")
+        return fig
+
+    def _radar(self):
+        labels = [label for _, label in RADAR_AXES]
+        optimal = self.normalize({name: np.mean(bounds) for name, bounds in self.optimal_ranges.items()})
+        ranges = [f"{low}–{high}" for low, high in self.optimal_ranges.values()]
+        fig = go.Figure()
+        fig.add_trace(go.Scatterpolar(
+            r=[0] * len(labels),
+            theta=labels,
+            fill='toself',
+            name='Current Settings',
+            marker_color='#667eea'
+        ))
+        fig.add_trace(go.Scatterpolar(
+            r=optimal,
+            theta=labels,
+            fill='toself',
+            name='Optimal Range',
+            marker_color='#38ef7d',
+            customdata=ranges,
+            hovertemplate="%{theta}: %{customdata}<extra>Optimal Range</extra>"
+        ))
+        fig.update_layout(
+            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+            height=500
+        )
+        return fig
+
+    def _trend(self):
+        fig = go.Figure(go.Scatter(
+            x=[],
+            y=[],
+            mode='lines+markers',
+            name='Quality Score',
+            marker=dict(size=10),
+            line=dict(width=2)
+        ))
+        fig.add_hline(y=self.quality_target, line_dash="dash", line_color="green",
+                      annotation_text="Target Quality")
+        fig.update_layout(height=400, title="Quality Score Trend")
+        return fig
+
+    def session_copy(self):
+        """Independent figures to patch for one session; the template itself stays untouched"""
+        charts = copy.copy(self)
+        charts.figures = {name: go.Figure(fig) for name, fig in self.figures.items()}
+        return charts
+
+    def normalize(self, process_params):
+        """Radar values: each setting as a percentage of its config.json maximum"""
+        values = np.array([process_params[name] for name, _ in RADAR_AXES], dtype=float)
+        return (values / self.radar_scale * 100).tolist()
+
+    def gauge(self, quality_score):
+        fig = self.figures['gauge']
+        fig.data[0].value = float(quality_score)
+        return fig
+
+    def defects(self, predictions):
+        fig = self.figures['defects']
+        fig.data[0].y = [float(predictions['warpage_percent']), float(predictions['sinkage_percent'])]
+        return fig
+
+    def radar(self, process_params):
+        fig = self.figures['radar']
+        fig.data[0].r = self.normalize(process_params)
+        return fig
+
+    def trend(self, aggregates, max_points=2000):
+        """
+        Quality score trend from HistoryAggregates
+
+        The series is only re-decimated when analyses were added since the last
+        call. It is sent as int32 analysis numbers and float32 scores, which
+        plotly encodes as binary arrays at about half the size of float64.
+        """
+        fig = self.figures['trend']
+        if aggregates.count != self.trend_count:
+            x, y = aggregates.trend.points(max_points=max_points)
+            fig.data[0].update(
+                x=np.asarray(x, dtype=np.int32),
+                y=np.asarray(y, dtype=np.float32),
+                mode='lines+markers' if len(x) <= TREND_MARKER_LIMIT else 'lines'
+            )
+            self.trend_count = aggregates.count
+        return fig
+
+if __name__ == "__main__":
+    import time
+    import plotly.io as pio
+    from optimization_engine import OptimizationEngine
+    from history_aggregates import HistoryAggregates
+
+    optimizer = OptimizationEngine()
+    start = time.perf_counter()
+    templates = ChartTemplates(optimizer)
+    print(f"Templates built in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    charts = templates.session_copy()
+
+    rng = np.random.default_rng(0)
+    aggregates = HistoryAggregates()
+    for record_id in range(1, 20001):
+        aggregates.update(record_id, rng.uniform(60, 100), rng.uniform(0, 8), rng.uniform(0, 4))
+
+    process = {'melt_temp': 230, 'mold_temp': 55, 'injection_pressure': 80, 'holding_pressure': 65,
+               'holding_time': 15, 'cooling_time': 35}
+    renders = 50
+    start = time.perf_counter()
+    for i in range(renders):
+        figures = [charts.gauge(80 + i % 10), charts.defects({'warpage_percent': 3.1, 'sinkage_percent': 1.2 + i / 100}),
+                   charts.radar(dict(process, melt_temp=225 + i % 10)), charts.trend(aggregates)]
+    patched = (time.perf_counter() - start) / renders
+    sizes = [len(pio.to_json(fig.to_dict(), validate=False)) for fig in figures]
+    print(f"Patch per render: {patched * 1e3:.2f} ms; payload: "
+          + ", ".join(f"{name} {size / 1024:.1f} KB" for name, size in zip(charts.figures, sizes)))
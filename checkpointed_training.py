@@ -0,0 +1,191 @@
+import os
+import copy
+import time
+import warnings
+import numpy as np
+import joblib
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES
+from drift_monitor import TrainingProfile
+from setpoint_index import SetpointIndex
+
+CHECKPOINT_FILE = "training_checkpoint.pkl"
+TARGETS = ['warpage', 'sinkage']
+
+class CheckpointedTrainer:
+    """
+    Resumable, time-budgeted training of both networks
+
+    Trains epoch by epoch with partial_fit() and writes a checkpoint every
+    few epochs: the training data and scaler, each network with its Adam
+    optimizer state, and the best network so far by validation RMSE. A new
+    trainer on the same model path picks up from that checkpoint, so an
+    interrupted run loses at most checkpoint_every epochs.
+
+    A network stops once its validation RMSE has not improved by tol for
+    patience epochs. train() also stops at its wall-clock budget; either
+    way the best networks found so far are installed and saved.
+    """
+
+    def __init__(self, predictor, checkpoint_every=10, patience=10, tol=1e-4, validation_fraction=0.1, seed=42):
+        self.predictor = predictor
+        self.checkpoint_every = checkpoint_every
+        self.patience = patience
+        self.tol = tol
+        self.validation_fraction = validation_fraction
+        self.seed = seed
+        self.checkpoint_file = f"{predictor.model_path}{CHECKPOINT_FILE}"
+        self.state = None
+
+    def start(self, X=None, y_warpage=None, y_sinkage=None, params=None):
+        """Fresh training state: data split, fitted scaler and untrained networks"""
+        from sklearn.preprocessing import StandardScaler
+
+        if X is None:
+            X, y_warpage, y_sinkage = self.predictor.generate_training_data(samples=500)
+        X = np.asarray(X, dtype=float)
+        order = np.random.default_rng(self.seed).permutation(len(X))
+        n_validation = max(1, int(len(X) * self.validation_fraction))
+        scaler = StandardScaler().fit(X)
+        params = dict(params or {}, early_stopping=False)
+        self.state = {
+            'X': X,
+            'targets': {'warpage': np.asarray(y_warpage, dtype=float), 'sinkage': np.asarray(y_sinkage, dtype=float)},
+            'train': order[n_validation:],
+            'validation': order[:n_validation],
+            'scaler': scaler,
+            'models': {name: MoldingQualityPredictor.build_model(params) for name in TARGETS},
+            'best_models': {name: None for name in TARGETS},
+            'best_rmse': {name: np.inf for name in TARGETS},
+            'stale_epochs': {name: 0 for name in TARGETS},
+            'epoch': 0,
+            'seconds': 0.0
+        }
+        return self.state
+
+    def resume(self):
+        """Load the latest checkpoint, if there is one"""
+        if not os.path.exists(self.checkpoint_file):
+            return None
+        self.state = joblib.load(self.checkpoint_file)
+        return self.state
+
+    def checkpoint(self):
+        """Write the training state, replacing the previous checkpoint atomically"""
+        temporary = f"{self.checkpoint_file}.tmp"
+        joblib.dump(self.state, temporary)
+        os.replace(temporary, self.checkpoint_file)
+        return self.checkpoint_file
+
+    def converged(self, name):
+        return self.state['stale_epochs'][name] >= self.patience
+
+    def run_epoch(self):
+        """One partial_fit pass per unconverged network, then update the best-so-far networks"""
+        state = self.state
+        X_scaled = state['scaler'].transform(state['X'])
+        train, validation = state['train'], state['validation']
+        for name in TARGETS:
+            if self.converged(name):
+                continue
+            model, y = state['models'][name], state['targets'][name]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model.partial_fit(X_scaled[train], y[train])
+            rmse = float(np.sqrt(np.mean((model.predict(X_scaled[validation]) - y[validation]) ** 2)))
+            if rmse < state['best_rmse'][name] - self.tol:
+                state['best_rmse'][name] = rmse
+                state['best_models'][name] = copy.deepcopy(model)
+                state['stale_epochs'][name] = 0
+            else:
+                state['stale_epochs'][name] += 1
+        state['epoch'] += 1
+
+    def train(self, budget_seconds=None, max_epochs=500, X=None, y_warpage=None, y_sinkage=None, params=None):
+        """
+        Train, resuming from the latest checkpoint when there is one
+
+        Args:
+            budget_seconds (float): Wall-clock limit for this call; None trains to convergence
+            max_epochs (int): Total epochs across all resumed runs
+            X, y_warpage, y_sinkage (array): Training data for a fresh start;
+                                             defaults to generate_training_data()
+            params (dict): MLPRegressor settings for a fresh start
+
+        Returns:
+            dict: 'epochs', 'resumed_from' (epoch, or None for a fresh start), 'seconds'
+                  for this call, 'total_seconds' across resumed runs, 'stopped'
+                  ('converged', 'budget' or 'max_epochs') and the best validation
+                  RMSE per target
+        """
+        start = time.perf_counter()
+        resumed = self.resume()
+        resumed_from = resumed['epoch'] if resumed else None
+        if resumed is None:
+            self.start(X, y_warpage, y_sinkage, params)
+        state = self.state
+
+        stopped = 'max_epochs'
+        base_seconds = state['seconds']
+        last_checkpoint = state['epoch']
+        while state['epoch'] < max_epochs:
+            if all(self.converged(name) for name in TARGETS):
+                stopped = 'converged'
+                break
+            # The budget only ends training once both networks have a best-so-far model
+            trained = all(state['best_models'][name] is not None for name in TARGETS)
+            if budget_seconds is not None and trained and time.perf_counter() - start >= budget_seconds:
+                stopped = 'budget'
+                break
+            self.run_epoch()
+            if state['epoch'] - last_checkpoint >= self.checkpoint_every:
+                state['seconds'] = base_seconds + time.perf_counter() - start
+                self.checkpoint()
+                last_checkpoint = state['epoch']
+
+        seconds = time.perf_counter() - start
+        state['seconds'] = base_seconds + seconds
+        if stopped == 'budget':
+            # Keep the checkpoint so the next call carries on from here
+            self.checkpoint()
+        elif os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+        self.install()
+
+        return {
+            'epochs': state['epoch'],
+            'resumed_from': resumed_from,
+            'seconds': seconds,
+            'total_seconds': state['seconds'],
+            'stopped': stopped,
+            'warpage_rmse': state['best_rmse']['warpage'],
+            'sinkage_rmse': state['best_rmse']['sinkage']
+        }
+
+    def install(self):
+        """
+        Put the best networks so far (and the scaler) into the predictor, save and warm up
+
+        Once the models pass warm-up, the setpoint index for them is built and
+        saved too, so serving never has to build it on a request.
+        """
+        state = self.state
+        predictor = self.predictor
+        predictor.scaler = state['scaler']
+        predictor.training_profile = TrainingProfile.from_data(state['X'], FEATURE_NAMES)
+        predictor.warpage_model = state['best_models']['warpage'] or state['models']['warpage']
+        predictor.sinkage_model = state['best_models']['sinkage'] or state['models']['sinkage']
+        predictor.save_models()
+        ready = predictor.warm_up()
+        if ready:
+            SetpointIndex.build_and_save(predictor)
+        return ready
+
+if __name__ == "__main__":
+    predictor = MoldingQualityPredictor()
+    trainer = CheckpointedTrainer(predictor)
+    # A short budget first, then a second call that resumes from its checkpoint
+    for budget in [1.0, None]:
+        report = trainer.train(budget_seconds=budget)
+        print(f"Stopped ({report['stopped']}) at epoch {report['epochs']}, resumed from {report['resumed_from']}, "
+              f"{report['total_seconds']:.1f} s in total; validation RMSE warpage {report['warpage_rmse']:.3f}, "
+              f"sinkage {report['sinkage_rmse']:.3f}")
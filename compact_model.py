@@ -0,0 +1,54 @@
+"""
+Dependency-free evaluator for distilled quality models
+
+This file and the exported JSON model are all a machine-side controller
+needs: evaluation uses only basic arithmetic on a few hundred numbers.
+"""
+
+import json
+
+class CompactQualityModel:
+    """Sparse polynomial approximation of the warpage and sinkage networks"""
+
+    def __init__(self, model):
+        self.features = model['features']
+        self.center = model['center']
+        self.half_range = model['half_range']
+        self.outputs = model['outputs']
+
+    @classmethod
+    def load(cls, filename):
+        """Load an exported model file"""
+        with open(filename, 'r') as f:
+            return cls(json.load(f))
+
+    def predict_values(self, values):
+        """
+        Predict from a plain list of feature values in model feature order
+
+        Returns:
+            dict: Warpage and sinkage percentages
+        """
+        z = [(v - c) / h for v, c, h in zip(values, self.center, self.half_range)]
+        result = {}
+        for name, output in self.outputs.items():
+            total = output['intercept']
+            for indices, coef in output['terms']:
+                term = coef
+                for i in indices:
+                    term *= z[i]
+                total += term
+            result[name] = max(0.0, total)
+        return result
+
+    def predict(self, process_params, geometry_params):
+        """Same call signature as MoldingQualityPredictor.predict"""
+        params = dict(process_params)
+        params.update(geometry_params)
+        return self.predict_values([params[name] for name in self.features])
+
+    def quality_score(self, warpage, sinkage):
+        """Quality score using the OptimizationEngine formula"""
+        warpage_score = max(0.0, 100 - warpage * 10)
+        sinkage_score = max(0.0, 100 - sinkage * 20)
+        return warpage_score * 0.5 + sinkage_score * 0.5
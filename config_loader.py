@@ -0,0 +1,54 @@
+import json
+import numpy as np
+from quality_predictor import FEATURE_NAMES
+
+CONFIG_PATH = "config.json"
+
+# Location of each model feature in config.json
+CONFIG_KEYS = {
+    'melt_temp': ('process_parameters', 'melt_temperature'),
+    'mold_temp': ('process_parameters', 'mold_temperature'),
+    'part_temp': ('process_parameters', 'part_temperature'),
+    'injection_pressure': ('process_parameters', 'injection_pressure'),
+    'holding_pressure': ('process_parameters', 'holding_pressure'),
+    'holding_time': ('process_parameters', 'holding_time'),
+    'cooling_time': ('process_parameters', 'cooling_time'),
+    'wall_thickness': ('geometry_parameters', 'wall_thickness'),
+    'part_volume': ('geometry_parameters', 'part_volume'),
+    'aspect_ratio': ('geometry_parameters', 'aspect_ratio'),
+    'time_to_fill': ('geometry_parameters', 'time_to_fill')
+}
+
+def load_config(path=CONFIG_PATH):
+    """Load the application configuration"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parameter_spec(config, feature):
+    """Return the config.json entry (min, max, optimal_range, default) for a model feature"""
+    section, key = CONFIG_KEYS[feature]
+    return config[section][key]
+
+def parameter_bounds(config=None):
+    """
+    Get min/max bounds for every model feature
+
+    Returns:
+        tuple: (lower, upper) arrays in FEATURE_NAMES order
+    """
+    config = config or load_config()
+    lower = np.array([parameter_spec(config, name)['min'] for name in FEATURE_NAMES], dtype=float)
+    upper = np.array([parameter_spec(config, name)['max'] for name in FEATURE_NAMES], dtype=float)
+    return lower, upper
+
+# Used when config.json has no memory_budgets section
+DEFAULT_MEMORY_BUDGETS = {
+    'process_mb': 1024,
+    'session_mb': 32,
+    'check_interval_s': 5
+}
+
+def memory_budgets(config=None):
+    """Memory budgets from config.json, with defaults for any missing entry"""
+    config = config or load_config()
+    return {**DEFAULT_MEMORY_BUDGETS, **config.get('memory_budgets', {})}
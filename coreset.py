@@ -0,0 +1,236 @@
+import time
+import inspect
+import warnings
+import numpy as np
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES
+from config_loader import parameter_bounds
+
+class KMeansCoreset:
+    """
+    Streaming weighted coreset by merge-and-reduce k-means
+
+    Rows arrive in chunks. Each chunk is merged with the current coreset and
+    clustered into `size` weighted k-means clusters over the features
+    (normalized by the config.json ranges). From every cluster the row
+    nearest its center is kept, weighted by the total weight of the cluster.
+    Memory stays at `size` plus one chunk however many rows are seen.
+    """
+
+    def __init__(self, size=512, seed=0):
+        self.size = size
+        self.seed = seed
+        lower, upper = parameter_bounds()
+        self.offset, self.span = lower, upper - lower
+        self.X = np.empty((0, len(FEATURE_NAMES)))
+        self.y = np.empty((0, 2))
+        self.weights = np.empty(0)
+        self.rows_seen = 0
+
+    def partial_fit(self, X, y_warpage, y_sinkage):
+        """Fold one chunk of rows into the coreset"""
+        from sklearn.cluster import KMeans
+
+        X = np.vstack([self.X, np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))])
+        y = np.vstack([self.y, np.column_stack([y_warpage, y_sinkage])])
+        weights = np.concatenate([self.weights, np.ones(len(X) - len(self.weights))])
+        self.rows_seen += len(X) - len(self.weights)
+
+        if len(X) > self.size:
+            normalized = (X - self.offset) / self.span
+            kmeans = KMeans(n_clusters=self.size, n_init=1, max_iter=20, random_state=self.seed)
+            labels = kmeans.fit_predict(normalized, sample_weight=weights)
+            distances = ((normalized - kmeans.cluster_centers_[labels]) ** 2).sum(axis=1)
+            # Nearest member of each cluster: sort by (cluster, distance) and take the first of each
+            order = np.lexsort((distances, labels))
+            first = order[np.flatnonzero(np.r_[True, labels[order][1:] != labels[order][:-1]])]
+            cluster_weights = np.bincount(labels, weights=weights, minlength=self.size)
+            # Targets are the cluster's weighted mean, which also averages out measurement noise
+            cluster_y = np.column_stack([
+                np.bincount(labels, weights=weights * y[:, k], minlength=self.size) for k in range(y.shape[1])
+            ]) / np.maximum(cluster_weights, 1e-12)[:, None]
+            X, y, weights = X[first], cluster_y[labels[first]], cluster_weights[labels[first]]
+
+        self.X, self.y, self.weights = X, y, weights
+        return self
+
+    def coreset(self):
+        """
+        Returns:
+            tuple: (X, y_warpage, y_sinkage, weights); weights sum to the rows seen
+        """
+        return self.X, self.y[:, 0], self.y[:, 1], self.weights
+
+class LeverageCoreset:
+    """
+    Two-pass streaming coreset by leverage-score sampling
+
+    The first pass accumulates the Gram matrix of the normalized features
+    (plus a bias column). The second pass scores each row by its leverage,
+    mixed half and half with uniform probability, and keeps a weighted
+    reservoir sample (Efraimidis-Spirakis) of `size` rows. Kept rows are
+    weighted by their inverse inclusion probability.
+    """
+
+    def __init__(self, size=512, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        lower, upper = parameter_bounds()
+        self.offset, self.span = lower, upper - lower
+        self.gram = np.zeros((len(FEATURE_NAMES) + 1, len(FEATURE_NAMES) + 1))
+        self.rows_seen = 0
+        self.keys = np.empty(0)
+        self.probabilities = np.empty(0)
+        self.X = np.empty((0, len(FEATURE_NAMES)))
+        self.y = np.empty((0, 2))
+
+    def design_matrix(self, X):
+        X = (np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES)) - self.offset) / self.span
+        return np.column_stack([np.ones(len(X)), X])
+
+    def first_pass(self, X):
+        """Accumulate the Gram matrix over one chunk"""
+        A = self.design_matrix(X)
+        self.gram += A.T @ A
+        self.rows_seen += len(A)
+        return self
+
+    def second_pass(self, X, y_warpage, y_sinkage):
+        """Sample from one chunk; call after first_pass() has seen every chunk"""
+        A = self.design_matrix(X)
+        leverage = np.einsum('ij,jk,ik->i', A, np.linalg.pinv(self.gram), A)
+        probabilities = 0.5 * leverage / A.shape[1] + 0.5 / self.rows_seen
+        keys = self.rng.random(len(A)) ** (1 / probabilities)
+
+        self.keys = np.concatenate([self.keys, keys])
+        self.probabilities = np.concatenate([self.probabilities, probabilities])
+        self.X = np.vstack([self.X, np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))])
+        self.y = np.vstack([self.y, np.column_stack([y_warpage, y_sinkage])])
+        if len(self.keys) > self.size:
+            keep = np.argpartition(self.keys, -self.size)[-self.size:]
+            self.keys, self.probabilities = self.keys[keep], self.probabilities[keep]
+            self.X, self.y = self.X[keep], self.y[keep]
+        return self
+
+    def coreset(self):
+        """
+        Returns:
+            tuple: (X, y_warpage, y_sinkage, weights); weights sum to the rows seen
+        """
+        weights = 1 / (len(self.probabilities) * self.probabilities)
+        weights *= self.rows_seen / weights.sum()
+        return self.X, self.y[:, 0], self.y[:, 1], weights
+
+def build_coreset(X, y_warpage, y_sinkage, size=512, method='kmeans', chunk_size=4096, seed=0):
+    """
+    Reduce a training set to a weighted coreset, reading it in chunks
+
+    Args:
+        X (array-like): Raw feature matrix of shape (n, 11)
+        y_warpage (array-like): Warpage targets
+        y_sinkage (array-like): Sinkage targets
+        size (int): Rows in the coreset
+        method (str): 'kmeans' or 'leverage'
+        chunk_size (int): Rows read at a time
+
+    Returns:
+        tuple: (X, y_warpage, y_sinkage, weights)
+    """
+    X, y_warpage, y_sinkage = np.asarray(X, dtype=float), np.asarray(y_warpage), np.asarray(y_sinkage)
+    chunks = [slice(start, start + chunk_size) for start in range(0, len(X), chunk_size)]
+    if method == 'kmeans':
+        builder = KMeansCoreset(size=size, seed=seed)
+        for chunk in chunks:
+            builder.partial_fit(X[chunk], y_warpage[chunk], y_sinkage[chunk])
+    elif method == 'leverage':
+        builder = LeverageCoreset(size=size, seed=seed)
+        for chunk in chunks:
+            builder.first_pass(X[chunk])
+        for chunk in chunks:
+            builder.second_pass(X[chunk], y_warpage[chunk], y_sinkage[chunk])
+    else:
+        raise ValueError(f"Unknown coreset method '{method}', expected 'kmeans' or 'leverage'")
+    return builder.coreset()
+
+# Rows per coreset row when weights are applied by resampling instead of sample_weight
+RESAMPLE_FACTOR = 4
+
+def fit_weighted(model, X, y, weights=None, seed=0):
+    """
+    Fit a model to weighted rows
+
+    MLPRegressor.fit() takes sample_weight from scikit-learn 1.7. On older
+    versions the rows are resampled instead: systematic resampling of
+    RESAMPLE_FACTOR times as many rows, so each row appears in proportion
+    to its weight.
+
+    Args:
+        model: Unfitted estimator
+        X (array): Feature matrix
+        y (array): Targets
+        weights (array): Row weights; None fits the rows unweighted
+
+    Returns:
+        The fitted model
+    """
+    if weights is None:
+        return model.fit(X, y)
+    if 'sample_weight' in inspect.signature(model.fit).parameters:
+        return model.fit(X, y, sample_weight=weights)
+    X, y, weights = np.asarray(X), np.asarray(y), np.asarray(weights, dtype=float)
+    count = RESAMPLE_FACTOR * len(X)
+    positions = (np.random.default_rng(seed).random() + np.arange(count)) / count
+    rows = np.searchsorted(np.cumsum(weights) / weights.sum(), positions, side='right')
+    rows = np.minimum(rows, len(X) - 1)
+    return model.fit(X[rows], y[rows])
+
+def compare_coreset_sizes(sizes=(128, 256, 512, 1024), samples=20000, holdout=2000, method='kmeans', seed=0):
+    """
+    Accuracy and training time of coreset training against full-data training
+
+    Trains the warpage and sinkage networks on the full synthetic set and on
+    coresets of each size, and scores all of them against the noise-free
+    process response on a holdout set.
+
+    Returns:
+        list: One dict per run with 'rows', 'coreset_seconds', 'train_seconds'
+              and holdout 'warpage_rmse' and 'sinkage_rmse'; the last is full data
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    predictor = MoldingQualityPredictor()
+    X, y_warpage, y_sinkage = predictor.generate_training_data(samples=samples, seed=seed)
+    X_test, _, _ = predictor.generate_training_data(samples=holdout, seed=seed + 1)
+    y_test = MoldingQualityPredictor.simulate_shots(X_test, noise=False)
+    scaler = StandardScaler().fit(X)
+
+    def train(X_fit, warpage, sinkage, weights):
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            models = [fit_weighted(MoldingQualityPredictor.build_model(), scaler.transform(X_fit), y, weights)
+                      for y in (warpage, sinkage)]
+        seconds = time.perf_counter() - start
+        errors = [float(np.sqrt(np.mean((model.predict(scaler.transform(X_test)) - truth) ** 2)))
+                  for model, truth in zip(models, y_test)]
+        return seconds, errors
+
+    report = []
+    for size in sizes:
+        start = time.perf_counter()
+        X_core, warpage, sinkage, weights = build_coreset(X, y_warpage, y_sinkage, size=size, method=method, seed=seed)
+        coreset_seconds = time.perf_counter() - start
+        seconds, errors = train(X_core, warpage, sinkage, weights)
+        report.append({'rows': size, 'coreset_seconds': coreset_seconds, 'train_seconds': seconds,
+                       'warpage_rmse': errors[0], 'sinkage_rmse': errors[1]})
+    seconds, errors = train(X, y_warpage, y_sinkage, None)
+    report.append({'rows': samples, 'coreset_seconds': 0.0, 'train_seconds': seconds,
+                   'warpage_rmse': errors[0], 'sinkage_rmse': errors[1]})
+    return report
+
+if __name__ == "__main__":
+    for method in ['kmeans', 'leverage']:
+        print(f"\n{method} coresets vs full data (holdout RMSE against the noise-free response):")
+        print(f"{'rows':>7} {'coreset s':>10} {'train s':>8} {'warpage':>8} {'sinkage':>8}")
+        for row in compare_coreset_sizes(method=method):
+            print(f"{row['rows']:>7} {row['coreset_seconds']:>10.2f} {row['train_seconds']:>8.2f} "
+                  f"{row['warpage_rmse']:>8.3f} {row['sinkage_rmse']:>8.3f}")
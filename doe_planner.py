@@ -0,0 +1,223 @@
+import warnings
+import numpy as np
+from scipy.stats import qmc
+from scipy.spatial import cKDTree
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES
+from optimization_engine import OptimizationEngine
+from config_loader import parameter_bounds
+
+# Small, quick networks for the bootstrap ensemble; only their disagreement is used
+ENSEMBLE_PARAMS = {
+    'hidden_layer_sizes': (32, 16),
+    'max_iter': 300,
+    'early_stopping': False
+}
+
+class DOEPlanner:
+    """
+    Design-of-experiments planner for trial shots
+
+    Generates space-filling Latin-hypercube and Sobol designs over all 11
+    features within the config.json limits, and proposes the next trial
+    shots where a bootstrap ensemble disagrees most on the quality score,
+    spread out so the proposals do not bunch up.
+    """
+
+    def __init__(self, config=None, members=5, seed=0):
+        self.lower, self.upper = parameter_bounds(config)
+        self.members = members
+        self.seed = seed
+        self.optimizer = OptimizationEngine()
+        self.scaler = None
+        self.ensemble = []
+
+    def to_unit(self, X):
+        return (np.asarray(X, dtype=float) - self.lower) / (self.upper - self.lower)
+
+    def from_unit(self, U):
+        return qmc.scale(U, self.lower, self.upper)
+
+    def design(self, n, method='lhs', seed=None):
+        """
+        Space-filling design of n settings
+
+        Args:
+            n (int): Number of settings
+            method (str): 'lhs' (Latin hypercube) or 'sobol' (scrambled Sobol;
+                          balanced when n is a power of two)
+            seed (int): Random seed; defaults to the planner's seed
+
+        Returns:
+            array: Shape (n, 11), columns in FEATURE_NAMES order
+        """
+        seed = self.seed if seed is None else seed
+        if method == 'lhs':
+            sampler = qmc.LatinHypercube(d=len(FEATURE_NAMES), seed=seed)
+        elif method == 'sobol':
+            sampler = qmc.Sobol(d=len(FEATURE_NAMES), scramble=True, seed=seed)
+        else:
+            raise ValueError(f"Unknown design method '{method}', expected 'lhs' or 'sobol'")
+        with warnings.catch_warnings():
+            # Sobol warns when n is not a power of two; the design is still usable
+            warnings.simplefilter("ignore", UserWarning)
+            return self.from_unit(sampler.random(n))
+
+    def discrepancy(self, X):
+        """Centered L2 discrepancy of a design; lower is more evenly spread"""
+        return float(qmc.discrepancy(np.clip(self.to_unit(X), 0, 1)))
+
+    def fit(self, X, y_warpage, y_sinkage):
+        """
+        Fit the bootstrap ensemble on the shots measured so far
+
+        Each member is one network predicting warpage and sinkage together,
+        trained on a bootstrap resample of the shots.
+        """
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.neural_network import MLPRegressor
+        from sklearn.exceptions import ConvergenceWarning
+
+        X = np.asarray(X, dtype=float)
+        y = np.column_stack([y_warpage, y_sinkage])
+        self.scaler = StandardScaler().fit(X)
+        X_scaled = self.scaler.transform(X)
+        rng = np.random.default_rng(self.seed)
+        self.ensemble = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            for member in range(self.members):
+                rows = rng.integers(0, len(X), len(X))
+                model = MLPRegressor(random_state=self.seed + member, **ENSEMBLE_PARAMS)
+                self.ensemble.append(model.fit(X_scaled[rows], y[rows]))
+        return self
+
+    def predict(self, X):
+        """Ensemble mean warpage and sinkage, shape (n, 2)"""
+        return self.member_predictions(X).mean(axis=0)
+
+    def member_predictions(self, X):
+        """Every member's warpage and sinkage, shape (members, n, 2); one batched call per member"""
+        if not self.ensemble:
+            raise RuntimeError("DOEPlanner must be fitted before predicting")
+        X_scaled = self.scaler.transform(np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES)))
+        return np.maximum(0, np.stack([model.predict(X_scaled) for model in self.ensemble]))
+
+    def disagreement(self, X):
+        """Standard deviation of the members' quality scores for each setting"""
+        outputs = self.member_predictions(X)
+        scores = self.optimizer.calculate_quality_scores(outputs[..., 0], outputs[..., 1])['overall_quality']
+        return scores.std(axis=0)
+
+    def score_designs(self, designs):
+        """
+        Score candidate designs; all of their rows go through the ensemble as one batch
+
+        Returns:
+            list: Per design, its 'discrepancy' and, once fitted, 'mean_disagreement'
+        """
+        scores = [{'discrepancy': self.discrepancy(design)} for design in designs]
+        if self.ensemble:
+            spread = self.disagreement(np.vstack(designs))
+            for score, part in zip(scores, np.split(spread, np.cumsum([len(d) for d in designs])[:-1])):
+                score['mean_disagreement'] = float(part.mean())
+        return scores
+
+    def propose(self, X_existing, n, pool_size=2048, strategy='disagreement'):
+        """
+        Next trial shots
+
+        Candidates come from a Sobol pool. Each pick maximizes the distance to
+        the existing and already picked shots ('distance'), or that distance
+        times the ensemble disagreement ('disagreement', needs fit()).
+
+        Args:
+            X_existing (array-like): Settings already measured, shape (m, 11)
+            n (int): Number of shots to propose
+            pool_size (int): Candidate pool size
+            strategy (str): 'disagreement' or 'distance'
+
+        Returns:
+            array: Shape (n, 11), the proposed settings
+        """
+        if strategy not in ('disagreement', 'distance'):
+            raise ValueError(f"Unknown strategy '{strategy}', expected 'disagreement' or 'distance'")
+        pool = self.design(pool_size, method='sobol', seed=self.seed + len(X_existing))
+        unit = self.to_unit(pool)
+
+        if len(X_existing):
+            distance, _ = cKDTree(np.clip(self.to_unit(X_existing), 0, 1)).query(unit)
+        else:
+            distance = np.full(len(pool), np.sqrt(len(FEATURE_NAMES)))
+        weight = np.ones(len(pool))
+        if strategy == 'disagreement':
+            weight = self.disagreement(pool)
+            weight = weight / weight.max() if weight.max() > 0 else np.ones(len(pool))
+
+        picked = []
+        for _ in range(min(n, len(pool))):
+            i = int(np.argmax(weight * distance))
+            picked.append(i)
+            distance = np.minimum(distance, np.sqrt(((unit - unit[i]) ** 2).sum(axis=1)))
+        return pool[picked]
+
+def simulate_campaign(strategy, initial=32, batch=16, rounds=6, holdout=2000, seed=0):
+    """
+    Compare trial-shot strategies on the synthetic process
+
+    Starts from an initial design, then adds a batch of simulated shots per
+    round and records the ensemble's RMSE against the noise-free process
+    response on a holdout set, against the shot count.
+
+    Args:
+        strategy (str): 'random' (uniform), 'lhs', 'sobol' or 'active'
+                        (LHS start, then disagreement-driven proposals)
+
+    Returns:
+        list: (shots, warpage RMSE, sinkage RMSE) per round
+    """
+    planner = DOEPlanner(seed=seed)
+    rng = np.random.default_rng(seed)
+    X_test = planner.design(holdout, method='sobol', seed=seed + 1000)
+    y_test = np.column_stack(MoldingQualityPredictor.simulate_shots(X_test, noise=False))
+
+    def draw(n, round_index):
+        if strategy == 'random':
+            return rng.uniform(planner.lower, planner.upper, size=(n, len(FEATURE_NAMES)))
+        method = 'sobol' if strategy == 'sobol' else 'lhs'
+        return planner.design(n, method=method, seed=seed + round_index)
+
+    X = draw(initial, 0)
+    y = np.column_stack(MoldingQualityPredictor.simulate_shots(X, seed=seed))
+    curve = []
+    for round_index in range(1, rounds + 1):
+        planner.fit(X, y[:, 0], y[:, 1])
+        error = np.sqrt(((planner.predict(X_test) - y_test) ** 2).mean(axis=0))
+        curve.append((len(X), float(error[0]), float(error[1])))
+        if strategy == 'active':
+            X_next = planner.propose(X, batch)
+        elif strategy == 'sobol':
+            # Continue the same low-discrepancy sequence instead of starting a new one
+            X_next = planner.design(len(X) + batch, method='sobol', seed=seed)[len(X):]
+        else:
+            X_next = draw(batch, round_index)
+        y_next = np.column_stack(MoldingQualityPredictor.simulate_shots(X_next, seed=seed + round_index))
+        X, y = np.vstack([X, X_next]), np.vstack([y, y_next])
+    return curve
+
+if __name__ == "__main__":
+    planner = DOEPlanner()
+    uniform = np.random.default_rng(0).uniform(planner.lower, planner.upper, size=(64, len(FEATURE_NAMES)))
+    print("Discrepancy of 64 shots (lower is more even):")
+    print(f"  uniform {planner.discrepancy(uniform):.4f}  lhs {planner.discrepancy(planner.design(64)):.4f}  "
+          f"sobol {planner.discrepancy(planner.design(64, method='sobol')):.4f}")
+
+    print("\nEnsemble holdout RMSE (warpage / sinkage) by trial shots:")
+    for strategy in ['random', 'lhs', 'sobol', 'active']:
+        curve = simulate_campaign(strategy)
+        print(f"  {strategy:<7}" + "  ".join(f"{shots}: {w:.2f}/{s:.2f}" for shots, w, s in curve))
+
+    X = planner.design(64)
+    planner.fit(X, *MoldingQualityPredictor.simulate_shots(X, seed=0))
+    print("\nNext 5 trial shots:")
+    for row in planner.propose(X, 5):
+        print("  " + ", ".join(f"{name}={value:.1f}" for name, value in zip(FEATURE_NAMES, row)))
@@ -0,0 +1,192 @@
+import threading
+import numpy as np
+
+# Proportions are floored at this value so empty bins keep PSI finite
+PSI_EPSILON = 1e-4
+
+class TrainingProfile:
+    """
+    Per-feature summary of the data the models were trained on
+
+    Holds the observed range and a fixed-bin histogram per feature. Bins
+    are the interior edges plus an underflow and an overflow bin, so any
+    live value falls in exactly one bin.
+    """
+
+    def __init__(self, feature_names, lower, upper, edges, proportions):
+        self.feature_names = list(feature_names)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.edges = np.asarray(edges, dtype=float)
+        self.proportions = np.asarray(proportions, dtype=float)
+
+    @property
+    def n_bins(self):
+        """Bins per feature, including underflow and overflow"""
+        return self.edges.shape[1] + 1
+
+    @classmethod
+    def from_data(cls, X, feature_names, bins=10):
+        """
+        Profile a training matrix with equal-frequency bins
+
+        Args:
+            X (array): Raw training features, one column per feature
+            feature_names (list): Column names
+            bins (int): Number of bins inside the training range
+        """
+        X = np.asarray(X, dtype=float)
+        edges = np.quantile(X, np.linspace(0, 1, bins + 1), axis=0).T
+        profile = cls(feature_names, X.min(axis=0), X.max(axis=0), edges, None)
+        profile.proportions = profile.histogram(X) / len(X)
+        return profile
+
+    @classmethod
+    def from_scaler(cls, scaler, feature_names, bins=10):
+        """
+        Approximate profile from a fitted StandardScaler's mean_ and var_
+
+        Used for models saved without a profile. Features are taken as
+        uniform, which is how the training data is generated, so the range
+        is mean ± sqrt(3) * std with equal mass in equal-width bins.
+        """
+        half_width = np.sqrt(3 * scaler.var_)
+        lower, upper = scaler.mean_ - half_width, scaler.mean_ + half_width
+        edges = np.linspace(lower, upper, bins + 1).T
+        proportions = np.zeros((len(lower), bins + 2))
+        proportions[:, 1:-1] = 1 / bins
+        return cls(feature_names, lower, upper, edges, proportions)
+
+    def bin_index(self, X):
+        """Bin of every value, shape (n, features); 0 is underflow, n_bins - 1 overflow"""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.feature_names))
+        index = np.empty(X.shape, dtype=int)
+        for j in range(X.shape[1]):
+            # Interior edges only, so values on the outer edges stay in range
+            index[:, j] = np.searchsorted(self.edges[j, 1:-1], X[:, j], side='right') + 1
+        index[X < self.lower] = 0
+        index[X > self.upper] = self.n_bins - 1
+        return index
+
+    def histogram(self, X):
+        """Counts per feature and bin, shape (features, n_bins)"""
+        index = self.bin_index(X)
+        offsets = index + np.arange(index.shape[1]) * self.n_bins
+        counts = np.bincount(offsets.ravel(), minlength=index.shape[1] * self.n_bins)
+        return counts.reshape(index.shape[1], self.n_bins)
+
+    def out_of_range(self, X):
+        """Boolean mask, shape (n, features), of values outside the training range"""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.feature_names))
+        return (X < self.lower) | (X > self.upper)
+
+    def extrapolated_features(self, row):
+        """Names of the features of one input that lie outside the training range"""
+        mask = self.out_of_range(row)[0]
+        return [name for name, outside in zip(self.feature_names, mask) if outside]
+
+class DriftMonitor:
+    """
+    Streaming comparison of live inputs with the training profile
+
+    Keeps running mean/variance (Welford, merged per batch with Chan's
+    formula), min/max and bin counts per feature. Memory is constant per
+    feature however many inputs are seen.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        n_features = len(profile.feature_names)
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.min = np.full(n_features, np.inf)
+        self.max = np.full(n_features, -np.inf)
+        self.counts = np.zeros((n_features, profile.n_bins), dtype=np.int64)
+        self.out_of_range_count = np.zeros(n_features, dtype=np.int64)
+        self.lock = threading.Lock()
+
+    def update(self, row):
+        """Add one input vector"""
+        self.update_batch(np.asarray(row, dtype=float).reshape(1, -1))
+
+    def update_batch(self, X):
+        """Add many input vectors at once"""
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.profile.feature_names))
+        if not len(X):
+            return
+        n = len(X)
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        counts = self.profile.histogram(X)
+        outside = self.profile.out_of_range(X).sum(axis=0)
+
+        with self.lock:
+            total = self.count + n
+            delta = batch_mean - self.mean
+            self.mean = self.mean + delta * n / total
+            self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+            self.count = total
+            self.min = np.minimum(self.min, X.min(axis=0))
+            self.max = np.maximum(self.max, X.max(axis=0))
+            self.counts += counts
+            self.out_of_range_count += outside
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.zeros_like(self.mean)
+
+    def live_proportions(self):
+        return self.counts / max(self.count, 1)
+
+    def psi(self):
+        """Population stability index per feature against the training histogram"""
+        expected = np.maximum(self.profile.proportions, PSI_EPSILON)
+        actual = np.maximum(self.live_proportions(), PSI_EPSILON)
+        return np.sum((actual - expected) * np.log(actual / expected), axis=1)
+
+    def ks(self):
+        """Largest gap between training and live CDFs, evaluated at the bin edges"""
+        expected = np.cumsum(self.profile.proportions, axis=1)
+        actual = np.cumsum(self.live_proportions(), axis=1)
+        return np.max(np.abs(actual - expected), axis=1)
+
+    def report(self, psi_threshold=0.2, min_count=30):
+        """
+        Drift summary per feature
+
+        Args:
+            psi_threshold (float): PSI above which a feature counts as drifted;
+                                   0.1-0.2 is usually read as moderate, above 0.2 as significant
+            min_count (int): Inputs needed before drift is flagged
+
+        Returns:
+            dict: Feature name -> live stats, PSI, KS, out-of-range share and drifted flag
+        """
+        with self.lock:
+            psi, ks, std = self.psi(), self.ks(), self.std
+            result = {}
+            for j, name in enumerate(self.profile.feature_names):
+                result[name] = {
+                    'count': self.count,
+                    'mean': float(self.mean[j]),
+                    'std': float(std[j]),
+                    'min': float(self.min[j]),
+                    'max': float(self.max[j]),
+                    'training_range': (float(self.profile.lower[j]), float(self.profile.upper[j])),
+                    'out_of_range_rate': float(self.out_of_range_count[j] / max(self.count, 1)),
+                    'psi': float(psi[j]),
+                    'ks': float(ks[j]),
+                    'drifted': bool(self.count >= min_count and psi[j] > psi_threshold)
+                }
+        return result
+
+if __name__ == "__main__":
+    names = ['melt_temp', 'mold_temp']
+    rng = np.random.default_rng(0)
+    profile = TrainingProfile.from_data(rng.uniform([200, 30], [260, 80], size=(500, 2)), names)
+    monitor = DriftMonitor(profile)
+    monitor.update_batch(rng.uniform([240, 30], [280, 80], size=(200, 2)))
+    for name, stats in monitor.report().items():
+        print(f"{name}: PSI {stats['psi']:.3f}, KS {stats['ks']:.3f}, "
+              f"out of range {stats['out_of_range_rate']:.0%}, drifted={stats['drifted']}")
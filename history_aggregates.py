@@ -0,0 +1,186 @@
+import threading
+import numpy as np
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Preserves peaks that plain averaging
+    would flatten.
+
+    Returns:
+        tuple: (x, y) arrays with at most threshold points
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = lttb_indices(x, y, threshold)
+    return x[keep], y[keep]
+
+def lttb_indices(x, y, threshold):
+    """Indices of the points LTTB keeps, for decimating several series alike"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    bucket_size = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+    return keep
+
+class RunningStats:
+    """Count, mean, variance, min and max updated in O(1) per value (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def std(self):
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+class TrendSeries:
+    """
+    Bounded trend series with the same point density over the whole history
+
+    Points fall into consecutive buckets of `stride` points, and each bucket
+    keeps its lowest and highest point, so spikes survive. When every bucket
+    is full, neighbouring buckets are merged in pairs and the stride doubles.
+    Merging lows and highs is exact, so every bucket covers the same number
+    of points whatever its age, rather than old points being decimated again
+    on each compaction. Appends are O(1) amortized and memory never exceeds
+    capacity points.
+    """
+
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        # Two points per bucket, and an even bucket count so buckets merge in pairs
+        self.buckets = max(2, capacity // 4 * 2)
+        self.low = np.empty((self.buckets, 2))
+        self.high = np.empty((self.buckets, 2))
+        self.stride = 1
+        self.closed = 0
+        self.open_count = 0
+
+    def append(self, x, y):
+        if self.open_count == 0:
+            if self.closed == self.buckets:
+                self._merge()
+            self.low[self.closed] = self.high[self.closed] = (x, y)
+        else:
+            if y < self.low[self.closed, 1]:
+                self.low[self.closed] = (x, y)
+            if y > self.high[self.closed, 1]:
+                self.high[self.closed] = (x, y)
+        self.open_count += 1
+        if self.open_count == self.stride:
+            self.closed += 1
+            self.open_count = 0
+
+    def _merge(self):
+        """Merge neighbouring buckets in pairs, keeping the lower low and the higher high"""
+        half = self.buckets // 2
+        pairs = np.arange(half)
+        low = self.low.reshape(half, 2, 2)
+        high = self.high.reshape(half, 2, 2)
+        self.low[:half] = low[pairs, (low[:, 1, 1] < low[:, 0, 1]).astype(int)]
+        self.high[:half] = high[pairs, (high[:, 1, 1] > high[:, 0, 1]).astype(int)]
+        self.closed = half
+        self.stride *= 2
+
+    def _series(self):
+        """Stored points in x order: each bucket's low and high, once when they are the same point"""
+        n = self.closed + (1 if self.open_count else 0)
+        low, high = self.low[:n], self.high[:n]
+        first = np.where((low[:, 0] <= high[:, 0])[:, None], low, high)
+        second = np.where((low[:, 0] <= high[:, 0])[:, None], high, low)
+        points = np.stack([first, second], axis=1).reshape(-1, 2)
+        distinct = np.ones(len(points), dtype=bool)
+        distinct[1::2] = first[:, 0] != second[:, 0]
+        points = points[distinct]
+        return points[:, 0], points[:, 1]
+
+    @property
+    def size(self):
+        return len(self._series()[0])
+
+    def points(self, max_points=2000):
+        """Series for plotting, LTTB-decimated to at most max_points"""
+        x, y = self._series()
+        return lttb(x, y, max_points)
+
+class HistoryAggregates:
+    """
+    Incrementally maintained summary of the analysis history
+
+    sync() reads only the rows added since the last call, so the History
+    page renders from these aggregates in time independent of history length.
+    """
+
+    METRICS = ['quality_score', 'warpage_percent', 'sinkage_percent']
+
+    def __init__(self, quality_target=95, trend_capacity=8192):
+        self.quality_target = quality_target
+        self.stats = {metric: RunningStats() for metric in self.METRICS}
+        self.pass_count = 0
+        self.trend = TrendSeries(trend_capacity)
+        self.last_id = 0
+        self.lock = threading.Lock()
+
+    def update(self, record_id, quality_score, warpage, sinkage):
+        """Add one analysis in O(1)"""
+        for metric, value in zip(self.METRICS, (quality_score, warpage, sinkage)):
+            self.stats[metric].update(value)
+        if quality_score >= self.quality_target:
+            self.pass_count += 1
+        self.trend.append(record_id, quality_score)
+        self.last_id = max(self.last_id, record_id)
+
+    def sync(self, store):
+        """Fold in every record written to the store since the last sync"""
+        with self.lock:
+            for row in store.rows_after(self.last_id, ['quality_score', 'warpage_percent', 'sinkage_percent']):
+                self.update(*row)
+        return self
+
+    @property
+    def count(self):
+        return self.stats['quality_score'].count
+
+    @property
+    def pass_rate(self):
+        return self.pass_count / self.count if self.count else 0.0
+
+    def summary(self):
+        """Counts and per-metric mean/min/max for display"""
+        result = {'count': self.count, 'pass_count': self.pass_count, 'pass_rate': self.pass_rate}
+        for metric, stats in self.stats.items():
+            result[metric] = {'mean': stats.mean, 'std': stats.std, 'min': stats.min, 'max': stats.max}
+        return result
@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import threading
+from quality_predictor import PROCESS_FEATURES, GEOMETRY_FEATURES
+
+PREDICTION_FIELDS = ['warpage_percent', 'sinkage_percent']
+
+class HistoryStore:
+    """
+    Append-only analysis history backed by SQLite in WAL mode
+
+    One row per analysis with every parameter in its own column, so the
+    History page can page through records and filter by time without
+    loading the whole history into memory. Shared by all sessions.
+    """
+
+    def __init__(self, path="data/history.db", batch_size=50):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Streamlit reruns scripts on different threads; access goes through self.lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_table()
+
+    @property
+    def columns(self):
+        """Stored columns, excluding the autoincrement id"""
+        return ['timestamp', 'machine_id'] + PROCESS_FEATURES + GEOMETRY_FEATURES + PREDICTION_FIELDS + ['quality_score']
+
+    def create_table(self):
+        """Create the history table and its indexes if they don't exist"""
+        numeric = ", ".join(f"{name} REAL" for name in PROCESS_FEATURES + GEOMETRY_FEATURES + PREDICTION_FIELDS)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS history ("
+                f"id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+                f"machine_id TEXT NOT NULL DEFAULT 'default', {numeric}, quality_score REAL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_history_machine ON history (machine_id, timestamp)")
+
+    def to_row(self, record):
+        """Flatten an analysis record into column order"""
+        return (
+            [record['timestamp'], record.get('machine_id', 'default')]
+            + [record['process_params'][name] for name in PROCESS_FEATURES]
+            + [record['geometry_params'][name] for name in GEOMETRY_FEATURES]
+            + [record['predictions'][name] for name in PREDICTION_FIELDS]
+            + [record['quality_score']]
+        )
+
+    def to_record(self, row):
+        """Rebuild the nested analysis record used by the app from a row"""
+        values = dict(zip(['id'] + self.columns, row))
+        return {
+            'id': values['id'],
+            'timestamp': values['timestamp'],
+            'machine_id': values['machine_id'],
+            'process_params': {name: values[name] for name in PROCESS_FEATURES},
+            'geometry_params': {name: values[name] for name in GEOMETRY_FEATURES},
+            'predictions': {name: values[name] for name in PREDICTION_FIELDS},
+            'quality_score': values['quality_score']
+        }
+
+    def append(self, record):
+        """Queue one record; it is written with the next batch"""
+        row = self.to_row(record)
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size:
+                self._write_pending()
+
+    def append_many(self, records):
+        """Write many records in a single transaction"""
+        rows = [self.to_row(record) for record in records]
+        with self.lock:
+            self.pending.extend(rows)
+            self._write_pending()
+
+    def flush(self):
+        """Write all queued records"""
+        with self.lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        """Insert queued rows in one transaction; caller holds self.lock"""
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        placeholders = ", ".join("?" for _ in self.columns)
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO history ({', '.join(self.columns)}) VALUES ({placeholders})", rows
+            )
+
+    def _where(self, start, end, machine_id):
+        """Build the WHERE clause shared by count and query"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        if machine_id is not None:
+            clauses.append("machine_id = ?")
+            params.append(machine_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, start=None, end=None, machine_id=None):
+        """Number of records in a time range"""
+        self.flush()
+        where, params = self._where(start, end, machine_id)
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+
+    def query(self, start=None, end=None, limit=50, offset=0, machine_id=None, newest_first=True):
+        """
+        Fetch one page of records
+
+        Args:
+            start (str): Inclusive lower timestamp bound, e.g. "2026-02-01 00:00:00"
+            end (str): Inclusive upper timestamp bound
+            limit (int): Page size
+            offset (int): Number of records to skip
+            machine_id (str): Optional machine filter
+            newest_first (bool): Sort order
+
+        Returns:
+            list: Analysis records in the app's nested dict format
+        """
+        self.flush()
+        where, params = self._where(start, end, machine_id)
+        order = "DESC" if newest_first else "ASC"
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT id, {', '.join(self.columns)} FROM history{where} "
+                f"ORDER BY timestamp {order}, id {order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [self.to_record(row) for row in rows]
+
+    def rows_after(self, last_id, columns, chunk_size=5000):
+        """
+        Yield (id, *columns) tuples for records with id > last_id, oldest first
+
+        Rows are read in chunks so catching up on a long history never holds
+        more than chunk_size rows at once.
+        """
+        self.flush()
+        selected = ", ".join(["id"] + [name for name in columns if name in self.columns])
+        while True:
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT {selected} FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+
+    def iter_records(self, start=None, end=None, machine_id=None, chunk_size=5000):
+        """
+        Yield every matching record in insertion order, chunk_size rows at a time
+
+        Used by the bulk report writers; memory stays bounded by one chunk
+        however long the history is.
+        """
+        self.flush()
+        where, params = self._where(start, end, machine_id)
+        where = where + (" AND" if where else " WHERE") + " id > ?"
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT id, {', '.join(self.columns)} FROM history{where} ORDER BY id LIMIT ?",
+                    params + [last_id, chunk_size]
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self.to_record(row)
+            last_id = rows[-1][0]
+
+    def machine_ids(self):
+        """Distinct machines that have recorded analyses"""
+        self.flush()
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT machine_id FROM history")]
+
+    def column_arrays(self, columns, start=None, end=None, machine_id=None):
+        """
+        Read whole columns as numpy arrays in time order, for vectorized analysis
+
+        Returns:
+            dict: Column name -> array; timestamp and machine_id come back as strings
+        """
+        import numpy as np
+        self.flush()
+        where, params = self._where(start, end, machine_id)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(columns)} FROM history{where} ORDER BY timestamp, id", params
+            ).fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        return {
+            name: np.array(column, dtype=str if name in ('timestamp', 'machine_id') else float)
+            for name, column in zip(columns, values)
+        }
+
+    def latest(self, machine_id=None):
+        """Most recent record, or None when the history is empty"""
+        records = self.query(limit=1, machine_id=machine_id)
+        return records[0] if records else None
+
+    def close(self):
+        """Flush pending records and close the database"""
+        self.flush()
+        with self.lock:
+            self.connection.close()
+
+if __name__ == "__main__":
+    store = HistoryStore()
+    print(f"History store ready: {store.count()} records in {store.path}")
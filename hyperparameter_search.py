@@ -0,0 +1,210 @@
+import time
+import math
+import warnings
+import numpy as np
+from itertools import product
+from joblib import Parallel, delayed
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+from quality_predictor import MoldingQualityPredictor, DEFAULT_MODEL_PARAMS
+
+DEFAULT_GRID = {
+    'hidden_layer_sizes': [(16,), (32,), (32, 16), (64, 32), (128, 64)],
+    'alpha': [1e-4, 1e-3, 1e-2],
+    'learning_rate_init': [1e-3, 3e-3, 1e-2]
+}
+
+def _fit_and_score(params, max_iter, X_train, y_train, X_val, y_val):
+    """Train one configuration on one fold and return its validation RMSE"""
+    settings = dict(DEFAULT_MODEL_PARAMS)
+    settings.update(params)
+    settings['max_iter'] = max_iter
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model = MoldingQualityPredictor.build_model(settings)
+        model.fit(X_train, y_train)
+
+    error = model.predict(X_val) - y_val
+    return float(np.sqrt(np.mean(error ** 2))), model.n_iter_
+
+class HyperparameterSearch:
+    """
+    Cross-validated successive-halving search over network settings
+
+    Scaled folds are computed once and shared by every configuration and
+    both targets. Each rung trains the surviving configurations with a
+    larger iteration budget and keeps the best 1/eta of them per target.
+    """
+
+    TARGETS = ['warpage', 'sinkage']
+
+    def __init__(self, param_grid=None, n_folds=3, eta=3, min_iter=50, max_iter=500, n_jobs=-1, seed=42):
+        self.param_grid = param_grid or DEFAULT_GRID
+        self.n_folds = n_folds
+        self.eta = eta
+        self.min_iter = min_iter
+        self.max_iter = max_iter
+        self.n_jobs = n_jobs
+        self.seed = seed
+        self.folds = None
+        self.results = None
+        self.latency_cache = {}
+
+    def configurations(self):
+        """Expand the parameter grid into a list of settings dicts"""
+        keys = list(self.param_grid)
+        return [dict(zip(keys, values)) for values in product(*(self.param_grid[k] for k in keys))]
+
+    def prepare_folds(self, X):
+        """Split and scale the data once; every configuration reuses these folds"""
+        self.folds = []
+        splitter = KFold(n_splits=self.n_folds, shuffle=True, random_state=self.seed)
+        for train_idx, val_idx in splitter.split(X):
+            scaler = StandardScaler().fit(X[train_idx])
+            self.folds.append((train_idx, val_idx, scaler.transform(X[train_idx]), scaler.transform(X[val_idx])))
+        return self.folds
+
+    def budgets(self):
+        """Iteration budget per rung: max_iter divided by powers of eta, down to min_iter"""
+        budgets = [self.max_iter]
+        while budgets[0] // self.eta >= self.min_iter:
+            budgets.insert(0, budgets[0] // self.eta)
+        return budgets
+
+    def measure_latency(self, params, X, y, repeats=200, batch_size=1000):
+        """
+        Time single-row and batch inference for a configuration's architecture
+
+        Latency depends only on layer sizes, so results are cached per architecture.
+        """
+        key = tuple(params.get('hidden_layer_sizes', DEFAULT_MODEL_PARAMS['hidden_layer_sizes']))
+        if key in self.latency_cache:
+            return self.latency_cache[key]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            model = MoldingQualityPredictor.build_model(dict(params, max_iter=20))
+            model.fit(X, y)
+
+        row = X[:1]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.predict(row)
+        single = (time.perf_counter() - start) / repeats
+
+        batch = np.resize(X, (batch_size, X.shape[1]))
+        start = time.perf_counter()
+        for _ in range(10):
+            model.predict(batch)
+        batched = (time.perf_counter() - start) / 10
+
+        self.latency_cache[key] = (single * 1e6, batched / batch_size * 1e6)
+        return self.latency_cache[key]
+
+    def search(self, X, targets):
+        """
+        Run the search for every target
+
+        Args:
+            X (array): Raw feature matrix
+            targets (dict): Target name -> target array, e.g. {'warpage': y_w, 'sinkage': y_s}
+
+        Returns:
+            dict: Target name -> list of result dicts sorted by CV RMSE
+        """
+        X = np.asarray(X, dtype=float)
+        if self.folds is None:
+            self.prepare_folds(X)
+
+        configs = self.configurations()
+        alive = {target: list(range(len(configs))) for target in targets}
+        scores = {target: {} for target in targets}
+        iterations = {target: {} for target in targets}
+        rungs = {target: {} for target in targets}
+
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for rung, budget in enumerate(self.budgets()):
+                # One task per (target, configuration, fold); all targets run together
+                tasks = [
+                    (target, c, fold)
+                    for target in targets for c in alive[target] for fold in self.folds
+                ]
+                outputs = parallel(
+                    delayed(_fit_and_score)(
+                        configs[c], budget, X_tr, targets[target][tr], X_va, targets[target][va]
+                    )
+                    for target, c, (tr, va, X_tr, X_va) in tasks
+                )
+
+                fold_scores = {}
+                for (target, c, _), (rmse, n_iter) in zip(tasks, outputs):
+                    fold_scores.setdefault((target, c), []).append((rmse, n_iter))
+                for (target, c), values in fold_scores.items():
+                    scores[target][c] = float(np.mean([v[0] for v in values]))
+                    iterations[target][c] = int(np.max([v[1] for v in values]))
+                    rungs[target][c] = rung
+
+                # Keep the best 1/eta per target for the next, larger budget
+                for target in targets:
+                    ranked = sorted(alive[target], key=lambda c: scores[target][c])
+                    alive[target] = ranked[:max(1, math.ceil(len(ranked) / self.eta))]
+
+        final_rung = len(self.budgets()) - 1
+        self.results = {}
+        for target in targets:
+            results = []
+            for c, rmse in scores[target].items():
+                result = {
+                    'params': configs[c],
+                    'cv_rmse': rmse,
+                    'rung': rungs[target][c],
+                    'iterations': iterations[target][c],
+                    'completed': rungs[target][c] == final_rung
+                }
+                single, per_row = self.measure_latency(configs[c], self.folds[0][2], targets[target][self.folds[0][0]])
+                result['single_row_latency_us'] = single
+                result['batch_latency_us_per_row'] = per_row
+                results.append(result)
+            self.results[target] = sorted(results, key=lambda r: (not r['completed'], r['cv_rmse']))
+        return self.results
+
+    def rank_by_latency(self, target):
+        """All evaluated configurations ordered from fastest to slowest batch inference"""
+        return sorted(self.results[target], key=lambda r: (r['batch_latency_us_per_row'], r['cv_rmse']))
+
+    def select(self, target, tolerance=0.05):
+        """
+        Pick the fastest fully trained configuration whose CV RMSE is within tolerance of the best
+
+        Args:
+            target (str): Target name
+            tolerance (float): Allowed relative RMSE increase over the most accurate configuration
+        """
+        best = self.results[target][0]['cv_rmse']
+        candidates = [
+            r for r in self.rank_by_latency(target)
+            if r['completed'] and r['cv_rmse'] <= best * (1 + tolerance)
+        ]
+        return candidates[0]
+
+if __name__ == "__main__":
+    predictor = MoldingQualityPredictor()
+    X, y_warpage, y_sinkage = predictor.generate_training_data(samples=500)
+
+    search = HyperparameterSearch()
+    results = search.search(X, {'warpage': y_warpage, 'sinkage': y_sinkage})
+
+    selected = {}
+    for target in HyperparameterSearch.TARGETS:
+        print(f"\n{target.title()} - top configurations by accuracy:")
+        for r in results[target][:5]:
+            print(f"  {r['params']}  RMSE {r['cv_rmse']:.3f}  {r['batch_latency_us_per_row']:.2f} µs/row")
+        selected[target] = search.select(target)
+        print(f"  Selected (fastest within 5% of best): {selected[target]['params']}")
+
+    predictor.train_models(
+        warpage_params=selected['warpage']['params'],
+        sinkage_params=selected['sinkage']['params']
+    )
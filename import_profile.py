@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import subprocess
+
+# Packages that dominate start-up time when imported
+HEAVY_MODULES = ['sklearn', 'scipy', 'pandas', 'plotly', 'streamlit', 'pyarrow', 'joblib']
+
+# Code run by each entry point; {model_path} is filled in per run
+ENTRY_POINTS = {
+    'scoring_worker': (
+        "from quality_predictor import MoldingQualityPredictor\n"
+        "MoldingQualityPredictor(model_path={model_path!r}).load_models(inference_only=True)"
+    ),
+    'predictor_full': (
+        "from quality_predictor import MoldingQualityPredictor\n"
+        "MoldingQualityPredictor(model_path={model_path!r}).load_models()"
+    ),
+    'optimization_engine': "import optimization_engine",
+    'history_store': "import history_store",
+    'report_generator': "import report_generator",
+    'compact_model': "import compact_model",
+    'app_first_render': (
+        "from streamlit.testing.v1 import AppTest\n"
+        "AppTest.from_file('app.py', default_timeout=300).run()"
+    )
+}
+
+# Appended to each entry point so the child reports its own wall time and loaded packages
+_REPORT = (
+    "\nimport json as _json\n"
+    "print(_json.dumps({{'seconds': _time.perf_counter() - _start, "
+    "'heavy_modules': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+def parse_importtime(stderr, top=10):
+    """
+    Summarize `python -X importtime` output
+
+    Returns:
+        tuple: (total import seconds, list of (module, cumulative seconds) for
+                the slowest top-level imports)
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            top_level.append((name.strip(), int(cumulative) / 1e6))
+    total = sum(seconds for _, seconds in top_level)
+    return total, sorted(top_level, key=lambda item: item[1], reverse=True)[:top]
+
+def profile(entry_point, model_path="models/", cwd=None):
+    """
+    Run one entry point in a fresh interpreter and time its start-up
+
+    Args:
+        entry_point (str): Key of ENTRY_POINTS
+        model_path (str): Model directory for entry points that load models
+        cwd (str): Working directory; defaults to this file's directory
+
+    Returns:
+        dict: Wall-clock seconds, total import seconds, the slowest top-level
+              imports and which heavy packages ended up loaded
+    """
+    code = (
+        "import sys, time as _time\n_start = _time.perf_counter()\n"
+        + ENTRY_POINTS[entry_point].format(model_path=model_path)
+        + _REPORT.format(heavy=HEAVY_MODULES)
+    )
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Entry point {entry_point} failed: {result.stderr.strip().splitlines()[-1]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['import_seconds'], report['slowest_imports'] = parse_importtime(result.stderr)
+    return report
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(ENTRY_POINTS)
+    for name in names:
+        report = profile(name)
+        print(f"\n{name}: {report['seconds']:.3f} s total, {report['import_seconds']:.3f} s importing")
+        print(f"  heavy packages loaded: {', '.join(report['heavy_modules']) or 'none'}")
+        for module, seconds in report['slowest_imports'][:5]:
+            print(f"  {module:<40} {seconds:.3f} s")
@@ -0,0 +1,95 @@
+import hashlib
+import numpy as np
+
+# Hidden-layer activations supported by the numpy forward pass, named as in MLPRegressor
+ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': lambda x: np.tanh(x, out=x),
+    'logistic': lambda x: np.divide(1, 1 + np.exp(-x, out=x), out=x),
+    'identity': lambda x: x
+}
+
+class FeatureScaler:
+    """StandardScaler.transform() from saved mean and scale arrays"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=float)
+        self.scale_ = np.asarray(scale, dtype=float)
+        self.var_ = self.scale_ ** 2
+        self.n_features_in_ = len(self.mean_)
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the scaler expects {self.n_features_in_}")
+        return (X - self.mean_) / self.scale_
+
+class DenseNetwork:
+    """MLPRegressor.predict() from saved weights, using only numpy"""
+
+    def __init__(self, coefs, intercepts, activation='relu'):
+        self.coefs_ = [np.asarray(c, dtype=float) for c in coefs]
+        self.intercepts_ = [np.asarray(b, dtype=float) for b in intercepts]
+        self.activation = activation
+
+    def predict(self, X):
+        hidden = ACTIVATIONS[self.activation]
+        activations = np.asarray(X, dtype=float)
+        for coef, intercept in zip(self.coefs_[:-1], self.intercepts_[:-1]):
+            activations = hidden(activations @ coef + intercept)
+        output = activations @ self.coefs_[-1] + self.intercepts_[-1]
+        return output.ravel() if output.shape[1] == 1 else output
+
+def model_fingerprint(scaler, models):
+    """
+    Short hash of the scaler and network weights
+
+    Identical for a model loaded from the pickles or from the .npz file,
+    so it can key caches of predictions made with that model version.
+    """
+    digest = hashlib.sha1()
+    arrays = [scaler.mean_, scaler.scale_]
+    for model in models:
+        arrays += list(model.coefs_) + list(model.intercepts_)
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    return digest.hexdigest()[:12]
+
+def save_inference_weights(filename, scaler, models):
+    """
+    Write the scaler and each network's weights to one .npz file
+
+    Args:
+        filename (str): Output path
+        scaler (StandardScaler): Fitted scaler
+        models (dict): Name -> fitted MLPRegressor
+    """
+    arrays = {'scaler_mean': scaler.mean_, 'scaler_scale': scaler.scale_}
+    for name, model in models.items():
+        arrays[f"{name}_activation"] = np.array(model.activation)
+        arrays[f"{name}_layers"] = np.array(len(model.coefs_))
+        for i, (coef, intercept) in enumerate(zip(model.coefs_, model.intercepts_)):
+            arrays[f"{name}_coef_{i}"] = coef
+            arrays[f"{name}_intercept_{i}"] = intercept
+    with open(filename, 'wb') as f:
+        np.savez(f, **arrays)
+    return filename
+
+def load_inference_weights(filename, names):
+    """
+    Read weights written by save_inference_weights()
+
+    Returns:
+        tuple: (FeatureScaler, dict of name -> DenseNetwork)
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        scaler = FeatureScaler(data['scaler_mean'], data['scaler_scale'])
+        models = {}
+        for name in names:
+            layers = int(data[f"{name}_layers"])
+            models[name] = DenseNetwork(
+                [data[f"{name}_coef_{i}"] for i in range(layers)],
+                [data[f"{name}_intercept_{i}"] for i in range(layers)],
+                str(data[f"{name}_activation"])
+            )
+    return scaler, models
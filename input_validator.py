@@ -0,0 +1,141 @@
+import numpy as np
+from quality_predictor import FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+from config_loader import load_config, parameter_spec, parameter_bounds
+
+class InputValidator:
+    """
+    Checks process and geometry inputs against the config.json limits
+
+    The config is compiled once into bound arrays in FEATURE_NAMES order,
+    so a whole batch is checked with a handful of vectorized comparisons.
+    Results are per-row, per-field masks, letting callers reject or clip
+    the bad rows and keep the rest of the batch.
+    """
+
+    def __init__(self, config=None):
+        config = config or load_config()
+        self.lower, self.upper = parameter_bounds(config)
+        self.defaults = np.array([parameter_spec(config, name)['default'] for name in FEATURE_NAMES], dtype=float)
+
+    @staticmethod
+    def to_matrix(records):
+        """
+        Build a feature matrix from analysis records
+
+        Args:
+            records (list): Dicts with 'process_params' and 'geometry_params',
+                            or flat dicts keyed by feature name
+
+        Returns:
+            array: Shape (n, 11); missing or non-numeric values are NaN
+        """
+        X = np.full((len(records), len(FEATURE_NAMES)), np.nan)
+        for i, record in enumerate(records):
+            if 'process_params' in record:
+                record = {**record['process_params'], **record.get('geometry_params', {})}
+            for j, name in enumerate(FEATURE_NAMES):
+                try:
+                    X[i, j] = float(record[name])
+                except (KeyError, TypeError, ValueError):
+                    pass
+        return X
+
+    def check(self, X):
+        """
+        Find every violation in a batch
+
+        Args:
+            X (array-like): Raw feature matrix, columns in FEATURE_NAMES order
+
+        Returns:
+            dict: Boolean masks of shape (n, 11) for 'missing' (NaN), 'non_finite',
+                  'below' and 'above' the config limits, their union 'violations',
+                  and the per-row 'valid' mask
+        """
+        X = np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        missing = np.isnan(X)
+        non_finite = np.isinf(X)
+        # NaN compares False, so missing values are not also counted as out of range
+        below = X < self.lower
+        above = X > self.upper
+        violations = missing | non_finite | below | above
+        return {
+            'missing': missing,
+            'non_finite': non_finite,
+            'below': below,
+            'above': above,
+            'violations': violations,
+            'valid': ~violations.any(axis=1)
+        }
+
+    def validate(self, X, mode='reject'):
+        """
+        Check a batch and repair or drop the bad rows
+
+        Args:
+            X (array-like): Raw feature matrix
+            mode (str): 'reject' keeps only valid rows; 'clip' clips out-of-range
+                        values to the limits and fills missing values with the
+                        config defaults, keeping every row
+
+        Returns:
+            dict: The check() masks plus 'X' (the cleaned matrix) and 'rows'
+                  (indices of the input rows present in 'X')
+        """
+        if mode not in ('reject', 'clip'):
+            raise ValueError(f"Unknown validation mode '{mode}', expected 'reject' or 'clip'")
+        X = np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        result = self.check(X)
+
+        if mode == 'reject':
+            result['rows'] = np.flatnonzero(result['valid'])
+            result['X'] = X[result['rows']]
+        else:
+            fill = result['missing'] | result['non_finite']
+            cleaned = np.where(fill, self.defaults, X)
+            result['X'] = np.clip(cleaned, self.lower, self.upper)
+            result['rows'] = np.arange(len(X))
+        return result
+
+    def describe(self, result, row):
+        """Readable messages for the violations in one row of a check() result"""
+        messages = []
+        for j, name in enumerate(FEATURE_NAMES):
+            if result['missing'][row, j]:
+                messages.append(f"{name} is missing")
+            elif result['non_finite'][row, j]:
+                messages.append(f"{name} is not finite")
+            elif result['below'][row, j]:
+                messages.append(f"{name} is below the minimum of {self.lower[j]:g}")
+            elif result['above'][row, j]:
+                messages.append(f"{name} is above the maximum of {self.upper[j]:g}")
+        return messages
+
+    def validate_params(self, process_params, geometry_params):
+        """
+        Validate a single analysis
+
+        Raises:
+            ValueError: Listing every missing or out-of-range parameter
+        """
+        missing = [name for name in PROCESS_FEATURES if name not in process_params]
+        missing += [name for name in GEOMETRY_FEATURES if name not in geometry_params]
+        if missing:
+            raise ValueError(f"Missing input parameters: {', '.join(missing)}")
+
+        X = self.to_matrix([{'process_params': process_params, 'geometry_params': geometry_params}])
+        result = self.check(X)
+        if not result['valid'][0]:
+            raise ValueError("Invalid input parameters: " + "; ".join(self.describe(result, 0)))
+        return True
+
+if __name__ == "__main__":
+    validator = InputValidator()
+    rng = np.random.default_rng(0)
+    margin = 0.02 * (validator.upper - validator.lower)
+    X = rng.uniform(validator.lower - margin, validator.upper + margin, size=(100000, len(FEATURE_NAMES)))
+    X[::1000, 0] = np.nan
+    result = validator.validate(X, mode='reject')
+    print(f"{len(result['rows'])} of {len(X)} rows valid; "
+          f"{result['missing'].sum()} missing, {result['below'].sum()} below, {result['above'].sum()} above")
+    print("First rejected row:", "; ".join(validator.describe(result, int(np.flatnonzero(~result['valid'])[0]))))
@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import bisect
+import functools
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency bucket upper bounds in seconds, from tens of microseconds (one
+# forward pass) up to a minute (training); the last bucket is +Inf
+LATENCY_BUCKETS = (
+    25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3,
+    50e-3, 100e-3, 250e-3, 500e-3, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+METRIC_PREFIX = "molding"
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two additions"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value, weight=1):
+        self.counts[bisect.bisect_left(self.buckets, value)] += weight
+        self.sum += value * weight
+        self.count += weight
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+class MetricsRegistry:
+    """
+    Process-wide timers and counters
+
+    Recording is off by default. Set MOLDING_METRICS=1 or call enable() to
+    turn it on. While off, instrumented methods run unwrapped and timed()
+    blocks only pay for a flag check.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.server = None
+
+    def observe(self, name, seconds, weight=1):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds, weight)
+
+    def increment(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def to_dict(self):
+        """Snapshot of every metric, for JSON export"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'timers': {
+                    name: {
+                        'count': h.count,
+                        'sum_seconds': h.sum,
+                        'mean_seconds': h.sum / h.count if h.count else 0.0,
+                        'p50_seconds': h.quantile(0.5),
+                        'p99_seconds': h.quantile(0.99),
+                        'buckets': {str(bound): count for bound, count in zip(h.buckets + ('+Inf',), h.counts)}
+                    }
+                    for name, h in sorted(self.histograms.items())
+                },
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def prometheus_text(self):
+        """Every metric in the Prometheus text exposition format"""
+        with self.lock:
+            lines = []
+            for name, h in sorted(self.histograms.items()):
+                metric = f"{METRIC_PREFIX}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum {h.sum:.9g}")
+                lines.append(f"{metric}_count {h.count}")
+            for name, value in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, filename):
+        """Write a JSON snapshot, replacing the file atomically"""
+        temporary = f"{filename}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temporary, filename)
+        return filename
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        """
+        Serve /metrics (Prometheus text) and /metrics.json from a background thread
+
+        Binds to localhost by default. Returns the running server; calling
+        again returns the same one.
+        """
+        if self.server is not None:
+            return self.server
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.prometheus_text(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.to_dict()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server
+
+    def stop_serving(self):
+        """Shut down the endpoint started by serve()"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+METRICS = MetricsRegistry(enabled=os.environ.get("MOLDING_METRICS", "").lower() in ("1", "true", "yes"))
+
+# Every @instrumented method, so enable() and disable() can swap its wrapper in and out
+_INSTRUMENTED = []
+
+def enable():
+    METRICS.enabled = True
+    for method in _INSTRUMENTED:
+        method.install()
+
+def disable():
+    METRICS.enabled = False
+    for method in _INSTRUMENTED:
+        method.install()
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        METRICS.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timed(name):
+    """Context manager timing a block into the named histogram while metrics are enabled"""
+    return _Timer(name) if METRICS.enabled else _NULL_TIMER
+
+class instrumented:
+    """
+    Method decorator timing calls into the named histogram
+
+    The class attribute is set to the timing wrapper only while metrics are
+    enabled and to the plain function otherwise, so disabled metrics add
+    no call overhead. For methods that take about a microsecond, pass
+    sample_every to time one call in N; each sample is weighted by N, so
+    counts and sums stay unbiased.
+    """
+
+    def __init__(self, name, sample_every=1):
+        self.name = name
+        self.sample_every = sample_every
+
+    def __call__(self, function):
+        self.function = function
+        return self
+
+    def __set_name__(self, owner, attribute):
+        self.owner = owner
+        self.attribute = attribute
+        self.wrapper = self.wrap(self.function)
+        _INSTRUMENTED.append(self)
+        self.install()
+
+    def wrap(self, function):
+        name, every = self.name, self.sample_every
+        calls = itertools.count()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if every > 1 and next(calls) % every:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter() - start, every)
+        return wrapper
+
+    def install(self):
+        setattr(self.owner, self.attribute, self.wrapper if METRICS.enabled else self.function)
+
+if __name__ == "__main__":
+    # Import by name so the demo shares the registry the other modules record into
+    from instrumentation import METRICS, enable
+    from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+
+    enable()
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models():
+        predictor.train_models()
+    inputs, _, _ = predictor.generate_training_data(samples=1000, seed=3)
+    for row in inputs:
+        values = dict(zip(FEATURE_NAMES, row))
+        predictor.predict({k: values[k] for k in PROCESS_FEATURES}, {k: values[k] for k in GEOMETRY_FEATURES})
+    print(METRICS.prometheus_text())
@@ -0,0 +1,266 @@
+import os
+import sys
+import time
+import types
+import weakref
+import threading
+from collections import deque
+import numpy as np
+from config_loader import memory_budgets
+
+MB = 2 ** 20
+
+# Never followed when sizing: code, modules and synchronization primitives
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+           type(threading.Lock()), type(threading.RLock()), threading.Event, threading.Thread)
+
+def rss_bytes():
+    """Resident set size of this process, from /proc on Linux"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Peak rather than current RSS, in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate bytes held by an object and everything it references
+
+    numpy arrays count their buffer once, however many views point at it.
+    Objects already in `seen` (ids) are skipped, so sizing several objects
+    with one shared set counts what they share only once. Memory held
+    outside Python objects, e.g. by an SQLite connection, is not visible.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _OPAQUE):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            # getsizeof includes the buffer only when the array owns it; views count their base instead
+            total += sys.getsizeof(obj)
+            if obj.base is not None:
+                stack.append(obj.base)
+            elif obj.dtype == object:
+                stack.extend(obj.ravel().tolist())
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        if hasattr(obj, '__dict__') and not isinstance(obj, dict):
+            stack.append(obj.__dict__)
+        for slot in getattr(type(obj), '__slots__', ()):
+            if hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+    return total
+
+def evict_analysis_cache(cache, fraction):
+    """Trim an AnalysisCache by evicting that fraction of its entries, least recently used first"""
+    return cache.evict(int(np.ceil(len(cache.entries) * fraction)))
+
+def spill_history(store, fraction):
+    """Trim a HistoryStore by writing its queued records to disk"""
+    freed = len(store.pending)
+    store.flush()
+    return freed
+
+class MemoryAccountant:
+    """
+    Bytes held by the app's models, caches and history, per session and process-wide
+
+    Components are registered by name, either process-wide (shared by all
+    sessions) or under a session id, with an optional trim function
+    trim(component, fraction) that frees about that fraction of the
+    component and returns how many items it freed.
+    Components are held by weak reference, so a session's entries go away
+    with the session. Shared components are sized first and their objects
+    are not counted again inside a session.
+
+    enforce() applies the budgets from config.json: a session over
+    session_mb has its trimmable components trimmed, largest first, until
+    it fits; when the process RSS or the accounted total exceeds
+    process_mb, trimmable components anywhere are trimmed by the excess.
+    """
+
+    MAX_PASSES = 3
+
+    def __init__(self, budgets=None):
+        self.budgets = budgets or memory_budgets()
+        self.components = {}
+        self.lock = threading.Lock()
+        self.last_enforced = 0.0
+        self.evictions = 0
+
+    def register(self, name, component, session=None, trim=None):
+        """Account for a component; session=None means shared by every session"""
+        with self.lock:
+            self.components[(session, name)] = (weakref.ref(component), trim)
+
+    def _live(self):
+        """(session, name, component, trim) for every component still alive; drops dead ones"""
+        live = []
+        with self.lock:
+            for key, (reference, trim) in list(self.components.items()):
+                component = reference()
+                if component is None:
+                    del self.components[key]
+                else:
+                    live.append((key[0], key[1], component, trim))
+        return live
+
+    def _sizes(self, live):
+        """
+        Bytes per (session, name), and the ids of the shared objects
+
+        Shared components are sized first, so sessions do not count them again.
+        """
+        shared_seen = set()
+        sizes = {}
+        for session, name, component, _ in live:
+            if session is None:
+                sizes[(session, name)] = deep_sizeof(component, shared_seen)
+        for session, name, component, _ in live:
+            if session is not None:
+                sizes[(session, name)] = deep_sizeof(component, set(shared_seen))
+        return sizes, shared_seen
+
+    def measure(self):
+        """
+        Size every registered component
+
+        Returns:
+            dict: 'process' (shared component -> bytes), 'sessions' (session id ->
+                  component -> bytes), 'total_bytes', 'rss_bytes' and 'budgets'
+        """
+        sizes, _ = self._sizes(self._live())
+        sessions = {}
+        for (session, name), size in sizes.items():
+            if session is not None:
+                sessions.setdefault(session, {})[name] = size
+        return {
+            'process': {name: size for (session, name), size in sizes.items() if session is None},
+            'sessions': sessions,
+            'total_bytes': sum(sizes.values()),
+            'rss_bytes': rss_bytes(),
+            'budgets': dict(self.budgets)
+        }
+
+    def _trim(self, live, sizes, excess):
+        """One pass: trim components, largest first, by the fraction of each estimated to free excess bytes"""
+        actions = []
+        for session, name, component, trim in sorted(live, key=lambda c: -sizes[(c[0], c[1])]):
+            size = sizes[(session, name)]
+            if excess <= 0:
+                break
+            if trim is None or size == 0:
+                continue
+            fraction = min(1.0, excess / size)
+            freed = trim(component, fraction)
+            if freed:
+                self.evictions += freed
+                actions.append((session, name, freed))
+                excess -= size * fraction
+                sizes[(session, name)] = size * (1 - fraction)
+        return actions
+
+    def enforce(self, min_interval=0.0):
+        """
+        Trim components until every budget holds
+
+        Sizes are measured once and each trim frees an estimated share of its
+        component, so a check costs one pass over the registered objects.
+
+        Args:
+            min_interval (float): Skip the check if the last one ran less than
+                                  this many seconds ago, for calling on every rerun
+
+        Returns:
+            list: (session, component, items freed) per trim, or None if skipped
+        """
+        now = time.monotonic()
+        if now - self.last_enforced < min_interval:
+            return None
+        self.last_enforced = now
+
+        live = self._live()
+        sizes, shared_seen = self._sizes(live)
+        actions = []
+
+        def settle(components, excess_of):
+            # Entries differ in size, so an estimated trim can fall short; re-measure and go again
+            for _ in range(self.MAX_PASSES):
+                trimmed = self._trim(components, sizes, excess_of())
+                if not trimmed:
+                    return
+                actions.extend(trimmed)
+                for session, name, component, _ in components:
+                    seen = shared_seen if session is None else set(shared_seen)
+                    sizes[(session, name)] = deep_sizeof(component, seen)
+
+        for session in {session for session, _ in sizes if session is not None}:
+            session_live = [c for c in live if c[0] == session]
+            settle(session_live, lambda: sum(sizes[(c[0], c[1])] for c in session_live)
+                   - self.budgets['session_mb'] * MB)
+
+        # RSS also covers memory nothing here accounts for; trimming what is accounted is all that can be done
+        settle(live, lambda: max(rss_bytes(), sum(sizes.values())) - self.budgets['process_mb'] * MB)
+        return actions
+
+if __name__ == "__main__":
+    import tempfile
+    from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+    from optimization_engine import OptimizationEngine
+    from analysis_cache import AnalysisCache
+    from history_store import HistoryStore
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models(inference_only=True):
+        predictor.train_models()
+    optimizer = OptimizationEngine()
+    store = HistoryStore(os.path.join(tempfile.mkdtemp(), "history.db"), batch_size=10 ** 6)
+    accountant = MemoryAccountant({'process_mb': 4096, 'session_mb': 1})
+    accountant.register('predictor', predictor)
+    accountant.register('history_store', store, trim=spill_history)
+
+    # Two sessions, each with thousands of cached predictions, and a history write buffer
+    X, _, _ = predictor.generate_training_data(samples=3000, seed=3)
+    caches = {}
+    for session in ['session-a', 'session-b']:
+        cache = caches[session] = AnalysisCache(predictor, optimizer, max_entries=10 ** 6)
+        accountant.register('analysis_cache', cache, session=session, trim=evict_analysis_cache)
+        for row in X:
+            values = dict(zip(FEATURE_NAMES, row.tolist()))
+            process = {name: values[name] for name in PROCESS_FEATURES}
+            geometry = {name: values[name] for name in GEOMETRY_FEATURES}
+            result = cache.predict(process, geometry)
+            store.append({'timestamp': '2026-01-01 00:00:00', 'process_params': process, 'geometry_params': geometry,
+                          'predictions': result['predictions'], 'quality_score': result['quality_score']})
+
+    def show(label):
+        report = accountant.measure()
+        parts = [f"{name} {size / MB:.2f} MB" for name, size in report['process'].items()]
+        parts += [f"{session}/{name} {size / MB:.2f} MB"
+                  for session, sizes in report['sessions'].items() for name, size in sizes.items()]
+        print(f"{label}: accounted {report['total_bytes'] / MB:.1f} MB, RSS {report['rss_bytes'] / MB:.0f} MB")
+        print("  " + ", ".join(parts))
+
+    show("Before")
+    start = time.perf_counter()
+    actions = accountant.enforce()
+    print(f"enforce() took {(time.perf_counter() - start) * 1e3:.0f} ms, {len(actions)} trim steps, "
+          f"{accountant.evictions} items freed")
+    show("After (session budget 1 MB)")
+    accountant.budgets['process_mb'] = 0
+    accountant.enforce()
+    show("After (process budget exceeded)")
+    print(f"History rows on disk: {store.count()}")
@@ -1,172 +1,581 @@
-import numpy as np
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from sklearn.neural_network import MLPRegressor
-import joblib
-import os
-
-class MoldingQualityPredictor:
-    """
-    Predicts warpage and sinkage for injection molding products
-    based on process parameters and part geometry
-    """
-    
-    def __init__(self):
-        self.warpage_model = None
-        self.sinkage_model = None
-        self.scaler = StandardScaler()
-        self.model_path = "models/"
-        self.create_model_dir()
-        
-    def create_model_dir(self):
-        """Create models directory if it doesn't exist"""
-        if not os.path.exists(self.model_path):
-            os.makedirs(self.model_path)
-    
-    def generate_training_data(self, samples=500):
-        """
-        Generate synthetic training data based on injection molding parameters
-        In real scenario, this would be actual measurement data
-        """
-        np.random.seed(42)
-        
-        # Process Parameters (from the research paper)
-        melt_temp = np.random.uniform(200, 260, samples)  # 200-260°C
-        mold_temp = np.random.uniform(30, 80, samples)    # 30-80°C
-        part_temp = np.random.uniform(30, 90, samples)    # 30-90°C
-        injection_pressure = np.random.uniform(30, 120, samples)  # 30-120 MPa
-        holding_pressure = np.random.uniform(20, 80, samples)     # 20-80 MPa
-        holding_time = np.random.uniform(5, 30, samples)         # 5-30 seconds
-        cooling_time = np.random.uniform(10, 60, samples)        # 10-60 seconds
-        
-        # Part Geometry Parameters
-        wall_thickness = np.random.uniform(1.5, 4.0, samples)  # 1.5-4.0 mm
-        part_volume = np.random.uniform(20, 200, samples)      # 20-200 cm³
-        aspect_ratio = np.random.uniform(0.5, 3.0, samples)    # Length/Width ratio
-        time_to_fill = np.random.uniform(2, 20, samples)       # 2-20 seconds
-        
-        # Create feature matrix
-        X = np.column_stack([
-            melt_temp, mold_temp, part_temp, injection_pressure, holding_pressure,
-            holding_time, cooling_time, wall_thickness, part_volume, aspect_ratio, time_to_fill
-        ])
-        
-        # Generate target variables (warpage % and sinkage %)
-        # Based on formula from research: these are influenced by process parameters
-        warpage = (
-            0.15 * (melt_temp - 230) ** 2 / 1000 +
-            0.08 * (mold_temp - 50) ** 2 / 100 +
-            0.08 * (part_temp - 60) ** 2 / 100 +
-            0.05 * (cooling_time - 30) / 20 +
-            0.12 * wall_thickness +
-            0.08 * aspect_ratio +
-            0.05 * (time_to_fill - 8) / 5 +
-            np.random.normal(0, 0.5, samples)
-        )
-        warpage = np.clip(warpage, 0.5, 15)
-        
-        sinkage = (
-            0.20 * (holding_pressure - 50) ** 2 / 1000 +
-            0.18 * (holding_time - 15) / 10 +
-            0.15 * wall_thickness ** 2 / 5 +
-            0.12 * (mold_temp - 50) / 30 +
-            0.08 * (part_temp - 60) / 30 +
-            0.06 * (time_to_fill - 8) / 5 +
-            np.random.normal(0, 0.4, samples)
-        )
-        sinkage = np.clip(sinkage, 0.3, 12)
-        
-        return X, warpage, sinkage
-    
-    def train_models(self):
-        """Train neural network models for warpage and sinkage prediction"""
-        print("Generating training data...")
-        X, y_warpage, y_sinkage = self.generate_training_data(samples=500)
-        
-        print("Scaling features...")
-        X_scaled = self.scaler.fit_transform(X)
-        
-        print("Training Warpage Prediction Model...")
-        self.warpage_model = MLPRegressor(
-            hidden_layer_sizes=(64, 32),
-            activation='relu',
-            max_iter=500,
-            random_state=42,
-            early_stopping=True,
-            validation_fraction=0.1
-        )
-        self.warpage_model.fit(X_scaled, y_warpage)
-        
-        print("Training Sinkage Prediction Model...")
-        self.sinkage_model = MLPRegressor(
-            hidden_layer_sizes=(64, 32),
-            activation='relu',
-            max_iter=500,
-            random_state=42,
-            early_stopping=True,
-            validation_fraction=0.1
-        )
-        self.sinkage_model.fit(X_scaled, y_sinkage)
-        
-        # Save models
-        self.save_models()
-        print("Models trained and saved!")
-    
-    def save_models(self):
-        """Save trained models to disk"""
-        joblib.dump(self.warpage_model, f"{self.model_path}warpage_model.pkl")
-        joblib.dump(self.sinkage_model, f"{self.model_path}sinkage_model.pkl")
-        joblib.dump(self.scaler, f"{self.model_path}scaler.pkl")
-    
-    def load_models(self):
-        """Load pre-trained models"""
-        try:
-            self.warpage_model = joblib.load(f"{self.model_path}warpage_model.pkl")
-            self.sinkage_model = joblib.load(f"{self.model_path}sinkage_model.pkl")
-            self.scaler = joblib.load(f"{self.model_path}scaler.pkl")
-            return True
-        except:
-            return False
-    
-    def predict(self, process_params, geometry_params):
-        """
-        Predict warpage and sinkage
-        
-        Args:
-            process_params (dict): Melt temp, mold temp, part temp, pressures, times
-            geometry_params (dict): Wall thickness, volume, aspect ratio, time to fill
-            
-        Returns:
-            dict: Predicted warpage and sinkage percentages
-        """
-        # Create feature vector
-        features = np.array([[
-            process_params['melt_temp'],
-            process_params['mold_temp'],
-            process_params['part_temp'],
-            process_params['injection_pressure'],
-            process_params['holding_pressure'],
-            process_params['holding_time'],
-            process_params['cooling_time'],
-            geometry_params['wall_thickness'],
-            geometry_params['part_volume'],
-            geometry_params['aspect_ratio'],
-            geometry_params['time_to_fill']
-        ]])
-        
-        # Scale features
-        features_scaled = self.scaler.transform(features)
-        
-        # Predict
-        warpage = self.warpage_model.predict(features_scaled)[0]
-        sinkage = self.sinkage_model.predict(features_scaled)[0]
-        
-        return {
-            'warpage_percent': max(0, warpage),
-            'sinkage_percent': max(0, sinkage)
-        }
-
-if __name__ == "__main__":
-    predictor = MoldingQualityPredictor()
-    predictor.train_models()
-    print("Quality predictor ready!")
+import numpy as np
+import joblib
+import copy
+import time
+import os
+from drift_monitor import TrainingProfile, DriftMonitor
+from instrumentation import METRICS, timed, instrumented
+from inference_model import ACTIVATIONS, save_inference_weights, load_inference_weights, model_fingerprint
+
+# scikit-learn (and the pandas/scipy it pulls in) is imported only when
+# training or loading the pickled estimators; inference-only loading uses
+# the numpy forward pass in inference_model.py
+
+# Column order of the feature matrix used by the scaler and both models
+PROCESS_FEATURES = [
+    'melt_temp', 'mold_temp', 'part_temp', 'injection_pressure',
+    'holding_pressure', 'holding_time', 'cooling_time'
+]
+GEOMETRY_FEATURES = ['wall_thickness', 'part_volume', 'aspect_ratio', 'time_to_fill']
+FEATURE_NAMES = PROCESS_FEATURES + GEOMETRY_FEATURES
+
+# Network settings used for both targets unless tuned values are passed in
+DEFAULT_MODEL_PARAMS = {
+    'hidden_layer_sizes': (64, 32),
+    'activation': 'relu',
+    'max_iter': 500,
+    'random_state': 42,
+    'early_stopping': True,
+    'validation_fraction': 0.1
+}
+
+class MoldingQualityPredictor:
+    """
+    Predicts warpage and sinkage for injection molding products
+    based on process parameters and part geometry
+    """
+    
+    def __init__(self, model_path="models/"):
+        self.warpage_model = None
+        self.sinkage_model = None
+        self.scaler = None
+        self.training_profile = None
+        self.model_version = None
+        self.model_path = model_path
+        self.load_error = None
+        self.ready = False
+        self.readiness = {}
+        self.create_model_dir()
+        
+    def create_model_dir(self):
+        """Create models directory if it doesn't exist"""
+        if not os.path.exists(self.model_path):
+            os.makedirs(self.model_path)
+    
+    def generate_training_data(self, samples=500, seed=42):
+        """
+        Generate synthetic training data based on injection molding parameters
+        In real scenario, this would be actual measurement data
+        """
+        np.random.seed(seed)
+        
+        # Process Parameters (from the research paper)
+        melt_temp = np.random.uniform(200, 260, samples)  # 200-260°C
+        mold_temp = np.random.uniform(30, 80, samples)    # 30-80°C
+        part_temp = np.random.uniform(30, 90, samples)    # 30-90°C
+        injection_pressure = np.random.uniform(30, 120, samples)  # 30-120 MPa
+        holding_pressure = np.random.uniform(20, 80, samples)     # 20-80 MPa
+        holding_time = np.random.uniform(5, 30, samples)         # 5-30 seconds
+        cooling_time = np.random.uniform(10, 60, samples)        # 10-60 seconds
+        
+        # Part Geometry Parameters
+        wall_thickness = np.random.uniform(1.5, 4.0, samples)  # 1.5-4.0 mm
+        part_volume = np.random.uniform(20, 200, samples)      # 20-200 cm³
+        aspect_ratio = np.random.uniform(0.5, 3.0, samples)    # Length/Width ratio
+        time_to_fill = np.random.uniform(2, 20, samples)       # 2-20 seconds
+        
+        # Create feature matrix
+        X = np.column_stack([
+            melt_temp, mold_temp, part_temp, injection_pressure, holding_pressure,
+            holding_time, cooling_time, wall_thickness, part_volume, aspect_ratio, time_to_fill
+        ])
+        
+        warpage, sinkage = MoldingQualityPredictor.simulate_shots(X)
+        return X, warpage, sinkage
+    
+    @staticmethod
+    def simulate_shots(X, seed=None, noise=True):
+        """
+        Synthetic warpage and sinkage for given settings, standing in for trial shots
+        
+        Args:
+            X (array-like): Raw feature matrix of shape (n, 11), columns in FEATURE_NAMES order
+            seed (int): Reseeds the measurement noise; None continues the current stream
+            noise (bool): Add measurement noise; without it the values are the true process response
+            
+        Returns:
+            tuple: (warpage, sinkage) arrays
+        """
+        if seed is not None:
+            np.random.seed(seed)
+        X = np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        samples = len(X)
+        (melt_temp, mold_temp, part_temp, injection_pressure, holding_pressure, holding_time,
+         cooling_time, wall_thickness, part_volume, aspect_ratio, time_to_fill) = X.T
+        
+        # Generate target variables (warpage % and sinkage %)
+        # Based on formula from research: these are influenced by process parameters
+        warpage = (
+            0.15 * (melt_temp - 230) ** 2 / 1000 +
+            0.08 * (mold_temp - 50) ** 2 / 100 +
+            0.08 * (part_temp - 60) ** 2 / 100 +
+            0.05 * (cooling_time - 30) / 20 +
+            0.12 * wall_thickness +
+            0.08 * aspect_ratio +
+            0.05 * (time_to_fill - 8) / 5 +
+            (np.random.normal(0, 0.5, samples) if noise else 0)
+        )
+        warpage = np.clip(warpage, 0.5, 15)
+        
+        sinkage = (
+            0.20 * (holding_pressure - 50) ** 2 / 1000 +
+            0.18 * (holding_time - 15) / 10 +
+            0.15 * wall_thickness ** 2 / 5 +
+            0.12 * (mold_temp - 50) / 30 +
+            0.08 * (part_temp - 60) / 30 +
+            0.06 * (time_to_fill - 8) / 5 +
+            (np.random.normal(0, 0.4, samples) if noise else 0)
+        )
+        sinkage = np.clip(sinkage, 0.3, 12)
+        
+        return warpage, sinkage
+    
+    @staticmethod
+    def build_model(params=None):
+        """Create an MLPRegressor from DEFAULT_MODEL_PARAMS overridden by params"""
+        from sklearn.neural_network import MLPRegressor
+        settings = dict(DEFAULT_MODEL_PARAMS)
+        settings.update(params or {})
+        return MLPRegressor(**settings)
+    
+    @instrumented('train_models')
+    def train_models(self, warpage_params=None, sinkage_params=None, X=None, y_warpage=None, y_sinkage=None,
+                     coreset_size=None, coreset_method='kmeans'):
+        """
+        Train neural network models for warpage and sinkage prediction
+        
+        Args:
+            warpage_params (dict): Optional MLPRegressor settings for the warpage model
+            sinkage_params (dict): Optional MLPRegressor settings for the sinkage model
+            X (array): Raw feature matrix; defaults to generate_training_data()
+            y_warpage (array): Warpage targets
+            y_sinkage (array): Sinkage targets
+            coreset_size (int): When set and smaller than the data, fit on a weighted
+                                coreset of this many rows (see coreset.py), so
+                                training time stays bounded as the data grows
+            coreset_method (str): 'kmeans' or 'leverage'
+        """
+        if X is None:
+            print("Generating training data...")
+            X, y_warpage, y_sinkage = self.generate_training_data(samples=500)
+        
+        print("Scaling features...")
+        from sklearn.preprocessing import StandardScaler
+        self.scaler = StandardScaler()
+        self.scaler.fit(X)
+        self.training_profile = TrainingProfile.from_data(X, FEATURE_NAMES)
+        
+        from coreset import build_coreset, fit_weighted
+        weights = None
+        if coreset_size and len(X) > coreset_size:
+            print(f"Reducing {len(X)} rows to a {coreset_size}-row coreset...")
+            X, y_warpage, y_sinkage, weights = build_coreset(X, y_warpage, y_sinkage, size=coreset_size,
+                                                             method=coreset_method)
+        X_scaled = self.scaler.transform(X)
+        
+        print("Training Warpage Prediction Model...")
+        self.warpage_model = self.build_model(warpage_params)
+        fit_weighted(self.warpage_model, X_scaled, y_warpage, weights)
+        
+        print("Training Sinkage Prediction Model...")
+        self.sinkage_model = self.build_model(sinkage_params)
+        fit_weighted(self.sinkage_model, X_scaled, y_sinkage, weights)
+        
+        # Save models
+        self.save_models()
+        self.warm_up()
+        print("Models trained and saved!")
+    
+    @staticmethod
+    def warm_start_copy(model):
+        """
+        Copy a trained model so that fit() continues from its current weights
+        
+        Early-stopping state from the previous fit refers to the old validation
+        split, so it is reset and the new data gets a fresh patience window.
+        """
+        model = copy.deepcopy(model)
+        model.set_params(warm_start=True, early_stopping=True)
+        model.validation_scores_ = []
+        model.best_validation_score_ = -np.inf
+        model._no_improvement_count = 0
+        return model
+    
+    def retrain_models(self, X=None, y_warpage=None, y_sinkage=None, compare_cold=False, holdout_fraction=0.2):
+        """
+        Retrain both models starting from the saved weights and scaler
+        
+        The saved scaler is kept so the saved weights still apply to the
+        scaled inputs. With compare_cold, a cold-start model is trained on the
+        same rows and the one with the lower holdout RMSE is kept per target,
+        so accuracy is never worse than a cold retrain. The holdout only
+        serves that comparison: the kept model is then refit on all rows
+        before it is saved. The comparison doubles the training time, so it
+        is off by default.
+        
+        Args:
+            X (array): Updated raw feature matrix; defaults to generate_training_data()
+            y_warpage (array): Warpage targets
+            y_sinkage (array): Sinkage targets
+            compare_cold (bool): Also train from scratch, keep the more accurate model and report the savings
+            holdout_fraction (float): Share of rows held out to compare accuracy with compare_cold
+            
+        Returns:
+            dict: Per-target iterations, seconds and holdout RMSE for warm and cold runs, and the refit iterations
+        """
+        if not self.load_models():
+            raise RuntimeError(f"No saved models to warm start from in {self.model_path}")
+        
+        if X is None:
+            X, y_warpage, y_sinkage = self.generate_training_data(samples=500)
+        
+        # Fixed holdout split for comparing warm and cold accuracy
+        rng = np.random.default_rng(0)
+        order = rng.permutation(len(X))
+        n_holdout = int(len(X) * holdout_fraction) if compare_cold else 0
+        holdout, train = order[:n_holdout], order[n_holdout:]
+        X_scaled = self.scaler.transform(X)
+        self.training_profile = TrainingProfile.from_data(X, FEATURE_NAMES)
+        
+        report = {}
+        for name, y in [('warpage', np.asarray(y_warpage)), ('sinkage', np.asarray(y_sinkage))]:
+            previous = getattr(self, f"{name}_model")
+            
+            print(f"Warm-starting {name.title()} Prediction Model...")
+            warm = self.warm_start_copy(previous)
+            start = time.perf_counter()
+            warm.fit(X_scaled[train], y[train])
+            result = {'warm_iterations': warm.n_iter_, 'warm_seconds': time.perf_counter() - start, 'selected': 'warm'}
+            chosen = warm
+            
+            if compare_cold:
+                print(f"Cold-training {name.title()} Prediction Model for comparison...")
+                cold = self.build_model(previous.get_params())
+                cold.set_params(warm_start=False)
+                start = time.perf_counter()
+                cold.fit(X_scaled[train], y[train])
+                result['cold_iterations'] = cold.n_iter_
+                result['cold_seconds'] = time.perf_counter() - start
+                result['iterations_saved'] = result['cold_iterations'] - result['warm_iterations']
+                result['seconds_saved'] = result['cold_seconds'] - result['warm_seconds']
+                
+                result['warm_rmse'] = float(np.sqrt(np.mean((warm.predict(X_scaled[holdout]) - y[holdout]) ** 2)))
+                result['cold_rmse'] = float(np.sqrt(np.mean((cold.predict(X_scaled[holdout]) - y[holdout]) ** 2)))
+                if result['cold_rmse'] < result['warm_rmse']:
+                    chosen = cold
+                    result['selected'] = 'cold'
+                
+                # Continue from the kept weights on the held-out rows too
+                chosen = self.warm_start_copy(chosen)
+                chosen.fit(X_scaled, y)
+                result['refit_iterations'] = chosen.n_iter_
+            
+            chosen.set_params(warm_start=False)
+            setattr(self, f"{name}_model", chosen)
+            report[name] = result
+        
+        self.save_models()
+        self.warm_up()
+        print("Models retrained and saved!")
+        return report
+    
+    def save_models(self):
+        """Save trained models to disk, with reference predictions for the readiness check"""
+        self.model_version = model_fingerprint(self.scaler, [self.warpage_model, self.sinkage_model])
+        joblib.dump(self.warpage_model, f"{self.model_path}warpage_model.pkl")
+        joblib.dump(self.sinkage_model, f"{self.model_path}sinkage_model.pkl")
+        joblib.dump(self.scaler, f"{self.model_path}scaler.pkl")
+        joblib.dump(self.training_profile, f"{self.model_path}training_profile.pkl")
+        save_inference_weights(
+            f"{self.model_path}inference_weights.npz", self.scaler,
+            {'warpage': self.warpage_model, 'sinkage': self.sinkage_model}
+        )
+        
+        inputs, _, _ = self.generate_training_data(samples=32, seed=2024)
+        reference = self.predict_batch(inputs)
+        reference['inputs'] = inputs
+        joblib.dump(reference, f"{self.model_path}reference_predictions.pkl")
+    
+    @instrumented('load_models')
+    def load_models(self, warm_up=True, inference_only=False):
+        """
+        Load pre-trained models
+        
+        With warm_up, the models only count as loaded once the readiness
+        check passes. On failure the reason is kept in self.load_error.
+        
+        With inference_only, the scaler and networks are read from
+        inference_weights.npz and evaluated with numpy, so scikit-learn,
+        scipy and pandas are never imported. Such a predictor can predict
+        but not retrain. Falls back to the pickles when the file is missing.
+        """
+        self.ready = False
+        weights_file = f"{self.model_path}inference_weights.npz"
+        try:
+            if inference_only and os.path.exists(weights_file):
+                self.scaler, models = load_inference_weights(weights_file, ['warpage', 'sinkage'])
+                self.warpage_model, self.sinkage_model = models['warpage'], models['sinkage']
+            else:
+                self.warpage_model = joblib.load(f"{self.model_path}warpage_model.pkl")
+                self.sinkage_model = joblib.load(f"{self.model_path}sinkage_model.pkl")
+                self.scaler = joblib.load(f"{self.model_path}scaler.pkl")
+            profile_file = f"{self.model_path}training_profile.pkl"
+            if os.path.exists(profile_file):
+                self.training_profile = joblib.load(profile_file)
+            else:
+                # Models saved before profiles existed: approximate from the scaler
+                self.training_profile = TrainingProfile.from_scaler(self.scaler, FEATURE_NAMES)
+            self.model_version = model_fingerprint(self.scaler, [self.warpage_model, self.sinkage_model])
+        except Exception as e:
+            self.load_error = f"{type(e).__name__}: {e}"
+            METRICS.increment('load_failures')
+            return False
+        
+        self.load_error = None
+        if warm_up:
+            return self.warm_up()
+        return True
+    
+    def warm_up(self, repeats=20):
+        """
+        Run a synthetic batch through both models and check it against the
+        reference predictions saved with them
+        
+        The first call pays for lazy imports, allocations and BLAS thread
+        start-up, so it is timed separately from the steady-state latency.
+        
+        Returns:
+            bool: True when the models are ready to serve
+        """
+        reference_file = f"{self.model_path}reference_predictions.pkl"
+        reference = joblib.load(reference_file) if os.path.exists(reference_file) else None
+        if reference is not None:
+            inputs = reference['inputs']
+        else:
+            inputs, _, _ = self.generate_training_data(samples=32, seed=2024)
+        
+        self.ready = False
+        self.load_error = None
+        self.readiness = {'reference_checked': reference is not None}
+        try:
+            row = dict(zip(FEATURE_NAMES, inputs[0]))
+            start = time.perf_counter()
+            self.predict(row, row)
+            self.readiness['cold_latency_ms'] = (time.perf_counter() - start) * 1000
+            
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                self.predict(row, row)
+                timings.append(time.perf_counter() - start)
+            self.readiness['warm_latency_ms'] = float(np.median(timings)) * 1000
+            
+            outputs = self.predict_batch(inputs)
+        except Exception as e:
+            self.load_error = f"Warm-up failed: {type(e).__name__}: {e}"
+            self.readiness['error'] = self.load_error
+            return False
+        
+        if not all(np.all(np.isfinite(outputs[k])) for k in ('warpage_percent', 'sinkage_percent')):
+            self.load_error = "Warm-up failed: non-finite predictions"
+        elif reference is not None:
+            error = max(
+                float(np.max(np.abs(outputs[k] - reference[k])))
+                for k in ('warpage_percent', 'sinkage_percent')
+            )
+            self.readiness['max_reference_error'] = error
+            if error > 1e-6:
+                self.load_error = f"Warm-up failed: predictions differ from reference by {error:.3g}"
+        
+        if self.load_error:
+            self.readiness['error'] = self.load_error
+            return False
+        
+        self.ready = True
+        self.readiness['ready'] = True
+        return True
+    
+    @instrumented('predict')
+    def predict(self, process_params, geometry_params):
+        """
+        Predict warpage and sinkage
+        
+        Args:
+            process_params (dict): Melt temp, mold temp, part temp, pressures, times
+            geometry_params (dict): Wall thickness, volume, aspect ratio, time to fill
+            
+        Raises:
+            ValueError: If any parameter is missing
+            
+        Returns:
+            dict: Predicted warpage and sinkage percentages, plus 'extrapolated'
+                  and the 'out_of_range' features when inputs lie outside the
+                  range the models were trained on
+        """
+        # Create feature vector
+        with timed('predict_features'):
+            try:
+                features = np.array([
+                    [process_params[name] for name in PROCESS_FEATURES]
+                    + [geometry_params[name] for name in GEOMETRY_FEATURES]
+                ], dtype=float)
+            except KeyError:
+                missing = [name for name in PROCESS_FEATURES if name not in process_params]
+                missing += [name for name in GEOMETRY_FEATURES if name not in geometry_params]
+                raise ValueError(f"Missing input parameters: {', '.join(missing)}") from None
+        
+        # Scale features
+        with timed('predict_scaling'):
+            features_scaled = self.scaler.transform(features)
+        
+        # Predict
+        with timed('predict_warpage_forward'):
+            warpage = self.warpage_model.predict(features_scaled)[0]
+        with timed('predict_sinkage_forward'):
+            sinkage = self.sinkage_model.predict(features_scaled)[0]
+        
+        out_of_range = self.training_profile.extrapolated_features(features) if self.training_profile else []
+        METRICS.increment('predictions')
+        if out_of_range:
+            METRICS.increment('extrapolated_predictions')
+        
+        return {
+            'warpage_percent': max(0, warpage),
+            'sinkage_percent': max(0, sinkage),
+            'extrapolated': bool(out_of_range),
+            'out_of_range': out_of_range
+        }
+    
+    def drift_monitor(self):
+        """New streaming drift monitor against this model's training profile"""
+        return DriftMonitor(self.training_profile)
+    
+    def bind_geometry(self, geometry_params):
+        """Predictor for one part geometry; see GeometryBoundPredictor"""
+        return GeometryBoundPredictor(self, geometry_params)
+    
+    @instrumented('predict_batch')
+    def predict_batch(self, features):
+        """
+        Predict warpage and sinkage for many shots at once
+        
+        Args:
+            features (array-like): Raw feature matrix of shape (n, 11), columns in FEATURE_NAMES order
+            
+        Returns:
+            dict: Arrays of predicted warpage and sinkage percentages
+        """
+        features = np.asarray(features, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        features_scaled = self.scaler.transform(features)
+        METRICS.increment('batch_rows', len(features))
+        
+        return {
+            'warpage_percent': np.maximum(0, self.warpage_model.predict(features_scaled)),
+            'sinkage_percent': np.maximum(0, self.sinkage_model.predict(features_scaled))
+        }
+
+class GeometryBoundPredictor:
+    """
+    Warpage and sinkage for a fixed part geometry
+    
+    Operators and optimizers vary only the seven process parameters of a
+    part. The scaled geometry columns' contribution to each network's
+    first-layer pre-activations, plus the first-layer bias, is computed
+    once here, so each evaluation multiplies only the process columns.
+    Results equal MoldingQualityPredictor.predict() up to floating-point
+    rounding (the first-layer sum is added in a different order).
+    
+    Works with both the scikit-learn and the numpy inference models. Bind
+    again after the models are retrained; model_version records which
+    models this handle was built from.
+    """
+    
+    process_features = PROCESS_FEATURES
+    
+    def __init__(self, predictor, geometry_params):
+        missing = [name for name in GEOMETRY_FEATURES if name not in geometry_params]
+        if missing:
+            raise ValueError(f"Missing input parameters: {', '.join(missing)}")
+        self.geometry_params = {name: geometry_params[name] for name in GEOMETRY_FEATURES}
+        self.model_version = predictor.model_version
+        self.training_profile = predictor.training_profile
+        
+        n = len(PROCESS_FEATURES)
+        mean = np.asarray(predictor.scaler.mean_, dtype=float)
+        scale = np.asarray(predictor.scaler.scale_, dtype=float)
+        self.process_mean, self.process_scale = mean[:n], scale[:n]
+        self.geometry = np.array([self.geometry_params[name] for name in GEOMETRY_FEATURES], dtype=float)
+        geometry_scaled = (self.geometry - mean[n:]) / scale[n:]
+        
+        # Per model: process rows of the first layer, the fixed geometry part
+        # of its pre-activation, the remaining layers and the hidden activation
+        self.networks = {}
+        for name, model in [('warpage', predictor.warpage_model), ('sinkage', predictor.sinkage_model)]:
+            first = np.asarray(model.coefs_[0], dtype=float)
+            self.networks[name] = (
+                first[:n],
+                geometry_scaled @ first[n:] + model.intercepts_[0],
+                list(zip(model.coefs_[1:], model.intercepts_[1:])),
+                ACTIVATIONS[model.activation]
+            )
+    
+    def _forward(self, name, process_scaled):
+        first, geometry_part, layers, hidden = self.networks[name]
+        activations = process_scaled @ first
+        activations += geometry_part
+        for coef, intercept in layers:
+            activations = hidden(activations)
+            activations = activations @ coef
+            activations += intercept
+        return activations.ravel()
+    
+    @instrumented('bound_predict_batch')
+    def predict_batch(self, process):
+        """
+        Predict for many process settings of this geometry
+        
+        Args:
+            process (array-like): Shape (n, 7), columns in PROCESS_FEATURES order
+            
+        Returns:
+            dict: Arrays of predicted warpage and sinkage percentages
+        """
+        process = np.asarray(process, dtype=float).reshape(-1, len(PROCESS_FEATURES))
+        process_scaled = (process - self.process_mean) / self.process_scale
+        METRICS.increment('batch_rows', len(process))
+        return {
+            'warpage_percent': np.maximum(0, self._forward('warpage', process_scaled)),
+            'sinkage_percent': np.maximum(0, self._forward('sinkage', process_scaled))
+        }
+    
+    def predict(self, process_params):
+        """
+        Predict for one process setting; same result dict as MoldingQualityPredictor.predict()
+        
+        Raises:
+            ValueError: If any process parameter is missing
+        """
+        try:
+            process = np.array([[process_params[name] for name in PROCESS_FEATURES]], dtype=float)
+        except KeyError:
+            missing = [name for name in PROCESS_FEATURES if name not in process_params]
+            raise ValueError(f"Missing input parameters: {', '.join(missing)}") from None
+        predictions = self.predict_batch(process)
+        
+        features = np.concatenate([process[0], self.geometry])
+        out_of_range = self.training_profile.extrapolated_features(features) if self.training_profile else []
+        METRICS.increment('predictions')
+        if out_of_range:
+            METRICS.increment('extrapolated_predictions')
+        
+        return {
+            'warpage_percent': predictions['warpage_percent'][0],
+            'sinkage_percent': predictions['sinkage_percent'][0],
+            'extrapolated': bool(out_of_range),
+            'out_of_range': out_of_range
+        }
+
+if __name__ == "__main__":
+    predictor = MoldingQualityPredictor()
+    predictor.train_models()
+    print("Quality predictor ready!")
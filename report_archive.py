@@ -0,0 +1,275 @@
+import io
+import os
+import gzip
+import json
+import time
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from report_generator import QualityReport, STATUS
+
+MANIFEST_FILE = "manifest.json"
+SEGMENT_TEMPLATE = "segment-{:06d}.jsonl.gz"
+
+class ReportArchive:
+    """
+    Rotating archive of reports and scored results as gzip JSON Lines
+
+    Each record is stored as the flat QualityReport.flatten() row, with
+    numbers kept as numbers rather than formatted text. Records are
+    queued by append() and written by a background thread, so the
+    caller only pays for the queue put. Each write adds one complete gzip
+    member to the current segment, and a new segment starts once the
+    current one reaches max_segment_bytes or is max_segment_seconds old.
+
+    manifest.json lists every segment with its committed size, record
+    count, timestamp range and count per status. read() uses the
+    manifest to skip segments outside the date range or without the
+    status asked for, without opening them, and reads only committed
+    bytes, so it is safe alongside the writer. Only one ReportArchive
+    may write to a directory at a time.
+    """
+
+    def __init__(self, directory="data/archive", max_segment_bytes=8 * 2 ** 20, max_segment_seconds=86400,
+                 queue_size=64, batch_size=1000, quality_target=95, compresslevel=6):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.batch_size = batch_size
+        self.quality_target = quality_target
+        self.compresslevel = compresslevel
+        self.queue = queue.Queue(queue_size)
+        self.errors = deque(maxlen=100)
+        self.lock = threading.Lock()
+        self.writer = None
+        self.written = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self.segments = self._read_manifest()
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['segments']
+
+    def _write_manifest(self):
+        """Replace manifest.json atomically; readers see the old or the new one, never half"""
+        temporary = f"{self.manifest_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'segments': self.segments}, f, separators=(',', ':'))
+        os.replace(temporary, self.manifest_path)
+
+    def append(self, record):
+        """Queue one analysis record (the app's nested format); blocks only while the queue is full"""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Queue a scored batch, e.g. as a ShotIngestionService record hook"""
+        if not records:
+            return
+        with self.lock:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self._run, name="report-archive", daemon=True)
+                self.writer.start()
+        self.queue.put(list(records))
+
+    def flush(self):
+        """Wait until everything queued so far is written and listed in the manifest"""
+        self.queue.join()
+
+    def close(self):
+        """Write what is queued, stop the writer and seal the current segment"""
+        with self.lock:
+            writer = self.writer
+            self.writer = None
+        if writer is not None:
+            self.queue.put(None)
+            writer.join()
+        if self.segments and not self.segments[-1]['sealed']:
+            self.segments[-1]['sealed'] = True
+            self._write_manifest()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = self.queue.get()
+            taken = 1
+            if batch is None:
+                batch, stopping = [], True
+            # Fold whatever else is already queued into the same gzip member
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    more = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if more is None:
+                    stopping = True
+                else:
+                    batch.extend(more)
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception as e:
+                self.errors.append(f"archive write: {e}")
+            for _ in range(taken):
+                self.queue.task_done()
+
+    def _current_segment(self):
+        """The segment to append to, starting a new one when the current is full or too old"""
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or segment['sealed'] or segment['bytes'] >= self.max_segment_bytes or \
+                time.time() - segment['opened'] >= self.max_segment_seconds:
+            if segment is not None:
+                segment['sealed'] = True
+            segment = {
+                'file': SEGMENT_TEMPLATE.format(len(self.segments)),
+                'opened': time.time(),
+                'bytes': 0,
+                'records': 0,
+                'start': None,
+                'end': None,
+                'status': {},
+                'sealed': False
+            }
+            self.segments.append(segment)
+        return segment
+
+    def _write(self, records):
+        """Append records as one gzip member, then publish the new size in the manifest"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        for record in records:
+            row = QualityReport.flatten(record, self.quality_target)
+            row['timestamp'] = row['timestamp'] or now
+            rows.append(row)
+        payload = "".join(json.dumps(row, separators=(',', ':')) + "\n" for row in rows).encode('utf-8')
+        member = gzip.compress(payload, compresslevel=self.compresslevel)
+
+        segment = self._current_segment()
+        path = os.path.join(self.directory, segment['file'])
+        with open(path, 'ab') as f:
+            # A previous write may have failed part way; drop anything past the committed size
+            f.truncate(segment['bytes'])
+            f.write(member)
+
+        timestamps = [row['timestamp'] for row in rows]
+        segment['start'] = min(timestamps + ([segment['start']] if segment['start'] else []))
+        segment['end'] = max(timestamps + ([segment['end']] if segment['end'] else []))
+        for row in rows:
+            segment['status'][row['status']] = segment['status'].get(row['status'], 0) + 1
+        segment['bytes'] += len(member)
+        segment['records'] += len(rows)
+        self._write_manifest()
+        self.written += len(rows)
+
+    def _matching_segments(self, start, end, status):
+        """Manifest entries that can hold rows in the range with the status"""
+        segments = self._read_manifest()
+        return [
+            segment for segment in segments
+            if segment['records']
+            and (start is None or segment['end'] >= start)
+            and (end is None or segment['start'] <= end)
+            and (status is None or segment['status'].get(status))
+        ]
+
+    def _read_segment(self, segment, start, end, status, machine_id):
+        """Rows of one segment that pass the filters, up to its committed size"""
+        with open(os.path.join(self.directory, segment['file']), 'rb') as f:
+            data = f.read(segment['bytes'])
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as lines:
+            for line in lines:
+                row = json.loads(line)
+                if (start is not None and row['timestamp'] < start) or \
+                        (end is not None and row['timestamp'] > end) or \
+                        (status is not None and row['status'] != status) or \
+                        (machine_id is not None and row['machine_id'] != machine_id):
+                    continue
+                yield row
+
+    def read(self, start=None, end=None, status=None, machine_id=None):
+        """
+        Archived rows, oldest segment first
+
+        Args:
+            start (str): Inclusive lower timestamp bound, e.g. "2026-02-01 00:00:00"
+            end (str): Inclusive upper timestamp bound
+            status (str): 'PASS' or 'NEEDS IMPROVEMENT'
+            machine_id (str): Optional machine filter
+
+        Yields:
+            dict: Flat rows as written by QualityReport.flatten()
+        """
+        for segment in self._matching_segments(start, end, status):
+            yield from self._read_segment(segment, start, end, status, machine_id)
+
+    def count(self, start=None, end=None, status=None):
+        """Rows in a range; segments wholly inside it are counted from the manifest alone"""
+        total = 0
+        for segment in self._matching_segments(start, end, status):
+            if (start is None or segment['start'] >= start) and (end is None or segment['end'] <= end):
+                total += segment['status'].get(status, 0) if status else segment['records']
+            else:
+                total += sum(1 for _ in self._read_segment(segment, start, end, status, None))
+        return total
+
+    def stats(self):
+        """Segments, records and bytes on disk"""
+        segments = self._read_manifest()
+        return {
+            'segments': len(segments),
+            'records': sum(segment['records'] for segment in segments),
+            'bytes': sum(segment['bytes'] for segment in segments),
+            'queued_batches': self.queue.qsize(),
+            'errors': list(self.errors)
+        }
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    import numpy as np
+    from quality_predictor import PROCESS_FEATURES, GEOMETRY_FEATURES
+
+    directory = tempfile.mkdtemp()
+    archive = ReportArchive(directory, max_segment_bytes=256 * 1024)
+    rng = np.random.default_rng(0)
+
+    # A week of scored batches, one per hour
+    shots = 0
+    start = time.perf_counter()
+    blocked = 0.0
+    for hour in range(7 * 24):
+        batch = []
+        for minute in range(60):
+            quality = float(rng.uniform(80, 100))
+            batch.append({
+                'timestamp': f"2026-03-{1 + hour // 24:02d} {hour % 24:02d}:{minute:02d}:00",
+                'machine_id': f"M{minute % 4}",
+                'process_params': {name: float(rng.uniform(10, 200)) for name in PROCESS_FEATURES},
+                'geometry_params': {name: float(rng.uniform(1, 50)) for name in GEOMETRY_FEATURES},
+                'predictions': {'warpage_percent': float(rng.uniform(0, 6)), 'sinkage_percent': float(rng.uniform(0, 3))},
+                'quality_score': quality
+            })
+        put = time.perf_counter()
+        archive.append_many(batch)
+        blocked += time.perf_counter() - put
+        shots += len(batch)
+    archive.flush()
+    elapsed = time.perf_counter() - start
+    stats = archive.stats()
+    print(f"Archived {stats['records']} rows in {stats['segments']} segments, {stats['bytes'] / 1024:.0f} KB "
+          f"({stats['bytes'] / stats['records']:.0f} bytes/row) in {elapsed:.2f} s; "
+          f"callers spent {blocked * 1e3:.0f} ms queueing")
+
+    query = dict(start="2026-03-03 00:00:00", end="2026-03-03 23:59:59", status=STATUS[False])
+    start = time.perf_counter()
+    rows = list(archive.read(**query))
+    print(f"{len(rows)} rows needing improvement on 2026-03-03, read from "
+          f"{len(archive._matching_segments(**query))} of {stats['segments']} segments "
+          f"in {(time.perf_counter() - start) * 1e3:.0f} ms")
+    archive.close()
+    shutil.rmtree(directory)
@@ -1,75 +1,307 @@
-import numpy as np
-import json
-from datetime import datetime
-import os
-
-class QualityReport:
-    """Generate comprehensive quality reports"""
-    
-    @staticmethod
-    def generate_report(analysis_data, filename=None):
-        """Generate a JSON report from analysis data"""
-        
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'process_parameters': analysis_data['process_params'],
-            'geometry_parameters': analysis_data['geometry_params'],
-            'predictions': {
-                'warpage_percent': round(analysis_data['predictions']['warpage_percent'], 2),
-                'sinkage_percent': round(analysis_data['predictions']['sinkage_percent'], 2)
-            },
-            'quality_score': round(analysis_data['quality_score'], 1),
-            'status': 'PASS' if analysis_data['quality_score'] >= 95 else 'NEEDS IMPROVEMENT'
-        }
-        
-        if filename:
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2)
-        
-        return report
-    
-    @staticmethod
-    def generate_text_report(analysis_data):
-        """Generate a human-readable text report"""
-        
-        report = f"""
-╔══════════════════════════════════════════════════════════════╗
-║     INJECTION MOLDING QUALITY ANALYSIS REPORT                ║
-╚══════════════════════════════════════════════════════════════╝
-
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-────────────────────────────────────────────────────────────────
-PROCESS PARAMETERS
-────────────────────────────────────────────────────────────────
-Melt Temperature:        {analysis_data['process_params']['melt_temp']:.1f}°C
-Mold Temperature:        {analysis_data['process_params']['mold_temp']:.1f}°C
-Part Temperature:        {analysis_data['process_params']['part_temp']:.1f}°C
-Injection Pressure:      {analysis_data['process_params']['injection_pressure']:.1f} MPa
-Holding Pressure:        {analysis_data['process_params']['holding_pressure']:.1f} MPa
-Holding Time:            {analysis_data['process_params']['holding_time']:.1f} seconds
-Cooling Time:            {analysis_data['process_params']['cooling_time']:.1f} seconds
-
-────────────────────────────────────────────────────────────────
-PART GEOMETRY
-────────────────────────────────────────────────────────────────
-Time to Fill:            {analysis_data['geometry_params']['time_to_fill']:.1f} seconds
-Wall Thickness:          {analysis_data['geometry_params']['wall_thickness']:.1f} mm
-Part Volume:             {analysis_data['geometry_params']['part_volume']:.1f} cm³
-Aspect Ratio:            {analysis_data['geometry_params']['aspect_ratio']:.2f}
-
-────────────────────────────────────────────────────────────────
-QUALITY PREDICTIONS
-────────────────────────────────────────────────────────────────
-Warpage:                 {analysis_data['predictions']['warpage_percent']:.2f}% (Target: < 5%)
-Sinkage:                 {analysis_data['predictions']['sinkage_percent']:.2f}% (Target: < 2%)
-Overall Quality Score:   {analysis_data['quality_score']:.1f}% (Target: ≥ 95%)
-
-Status: {'✅ EXCELLENT - MEETS QUALITY STANDARDS' if analysis_data['quality_score'] >= 95 else '⚠️  NEEDS IMPROVEMENT - REQUIRES OPTIMIZATION'}
-
-════════════════════════════════════════════════════════════════
-"""
-        return report
-
-if __name__ == "__main__":
-    print("Report Generator Ready!")
+import numpy as np
+import csv
+import json
+from datetime import datetime
+import os
+from quality_predictor import PROCESS_FEATURES, GEOMETRY_FEATURES
+
+# Report layouts are parsed once at import; rendering only fills in the fields
+TEXT_REPORT_TEMPLATE = """
+╔══════════════════════════════════════════════════════════════╗
+║     INJECTION MOLDING QUALITY ANALYSIS REPORT                ║
+╚══════════════════════════════════════════════════════════════╝
+
+Generated: {generated}
+
+────────────────────────────────────────────────────────────────
+PROCESS PARAMETERS
+────────────────────────────────────────────────────────────────
+Melt Temperature:        {melt_temp:.1f}°C
+Mold Temperature:        {mold_temp:.1f}°C
+Part Temperature:        {part_temp:.1f}°C
+Injection Pressure:      {injection_pressure:.1f} MPa
+Holding Pressure:        {holding_pressure:.1f} MPa
+Holding Time:            {holding_time:.1f} seconds
+Cooling Time:            {cooling_time:.1f} seconds
+
+────────────────────────────────────────────────────────────────
+PART GEOMETRY
+────────────────────────────────────────────────────────────────
+Time to Fill:            {time_to_fill:.1f} seconds
+Wall Thickness:          {wall_thickness:.1f} mm
+Part Volume:             {part_volume:.1f} cm³
+Aspect Ratio:            {aspect_ratio:.2f}
+
+────────────────────────────────────────────────────────────────
+QUALITY PREDICTIONS
+────────────────────────────────────────────────────────────────
+Warpage:                 {warpage_percent:.2f}% (Target: < 5%)
+Sinkage:                 {sinkage_percent:.2f}% (Target: < 2%)
+Overall Quality Score:   {quality_score:.1f}% (Target: ≥ 95%)
+
+Status: {status}
+
+════════════════════════════════════════════════════════════════
+"""
+
+SUMMARY_HEADER = f"{'Timestamp':<19}  {'Machine':<10}  {'Warpage':>8}  {'Sinkage':>8}  {'Quality':>8}  Status\n"
+SUMMARY_LINE_TEMPLATE = (
+    "{timestamp:<19}  {machine_id:<10}  {warpage_percent:>7.2f}%  {sinkage_percent:>7.2f}%  "
+    "{quality_score:>7.1f}%  {status}\n"
+)
+SHIFT_HEADER = (
+    f"{'Shift Start':<19}  {'Shots':>7}  {'Pass Rate':>9}  {'Quality Mean':>12}  {'Std':>5}  "
+    f"{'Min':>6}  {'Max':>6}  {'Warpage':>8}  {'Sinkage':>8}\n"
+)
+SHIFT_LINE_TEMPLATE = (
+    "{shift_start:<19}  {count:>7}  {pass_rate:>8.1%}  {quality_mean:>11.1f}%  {quality_std:>5.2f}  "
+    "{quality_min:>6.1f}  {quality_max:>6.1f}  {warpage_mean:>7.2f}%  {sinkage_mean:>7.2f}%\n"
+)
+
+TEXT_STATUS = {
+    True: '✅ EXCELLENT - MEETS QUALITY STANDARDS',
+    False: '⚠️  NEEDS IMPROVEMENT - REQUIRES OPTIMIZATION'
+}
+STATUS = {True: 'PASS', False: 'NEEDS IMPROVEMENT'}
+
+# Column order of flatten() rows
+FLAT_COLUMNS = (['timestamp', 'machine_id'] + PROCESS_FEATURES + GEOMETRY_FEATURES
+                + ['warpage_percent', 'sinkage_percent', 'quality_score', 'status'])
+
+class QualityReport:
+    """Generate comprehensive quality reports"""
+    
+    @staticmethod
+    def generate_report(analysis_data, filename=None, archive=None):
+        """
+        Generate a JSON report from analysis data
+        
+        Args:
+            analysis_data (dict): Analysis record
+            filename (str): Optional path for a pretty-printed JSON copy
+            archive (ReportArchive): Optional archive to queue the analysis to,
+                                     compressed and with full numeric precision
+        """
+        
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'process_parameters': analysis_data['process_params'],
+            'geometry_parameters': analysis_data['geometry_params'],
+            'predictions': {
+                'warpage_percent': round(analysis_data['predictions']['warpage_percent'], 2),
+                'sinkage_percent': round(analysis_data['predictions']['sinkage_percent'], 2)
+            },
+            'quality_score': round(analysis_data['quality_score'], 1),
+            'status': STATUS[analysis_data['quality_score'] >= 95]
+        }
+        
+        if filename:
+            with open(filename, 'w') as f:
+                json.dump(report, f, indent=2)
+        
+        if archive is not None:
+            archive.append(analysis_data)
+        
+        return report
+    
+    @staticmethod
+    def generate_text_report(analysis_data):
+        """Generate a human-readable text report"""
+        
+        fields = QualityReport.flatten(analysis_data)
+        fields['generated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        fields['status'] = TEXT_STATUS[analysis_data['quality_score'] >= 95]
+        return TEXT_REPORT_TEMPLATE.format_map(fields)
+
+    @staticmethod
+    def flatten(analysis_data, quality_target=95):
+        """One flat row per analysis, the layout used by the bulk writers"""
+        return {
+            'timestamp': analysis_data.get('timestamp'),
+            'machine_id': analysis_data.get('machine_id', 'default'),
+            **analysis_data['process_params'],
+            **analysis_data['geometry_params'],
+            'warpage_percent': float(analysis_data['predictions']['warpage_percent']),
+            'sinkage_percent': float(analysis_data['predictions']['sinkage_percent']),
+            'quality_score': float(analysis_data['quality_score']),
+            'status': STATUS[analysis_data['quality_score'] >= quality_target]
+        }
+    
+    @staticmethod
+    def stream_jsonl(records, filename, quality_target=95):
+        """
+        Write analyses as JSON Lines, one compact object per line
+        
+        Records are consumed one at a time, so memory use does not grow
+        with the number of analyses.
+        
+        Args:
+            records (iterable): Analysis records, e.g. HistoryStore.iter_records()
+            filename (str): Output path
+            
+        Returns:
+            int: Number of records written
+        """
+        count = 0
+        with open(filename, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(QualityReport.flatten(record, quality_target), separators=(',', ':')))
+                f.write('\n')
+                count += 1
+        return count
+    
+    @staticmethod
+    def stream_csv(records, output, quality_target=95):
+        """
+        Write analyses as CSV with numeric columns, one row per analysis
+        
+        Records are consumed one at a time, so memory use does not grow
+        with the number of analyses.
+        
+        Args:
+            records (iterable): Analysis records, e.g. HistoryStore.iter_records()
+            output (str or file): Output path, or an open text file such as io.StringIO
+            
+        Returns:
+            int: Number of records written
+        """
+        if isinstance(output, str):
+            with open(output, 'w', encoding='utf-8', newline='') as f:
+                return QualityReport.stream_csv(records, f, quality_target)
+        writer = csv.DictWriter(output, fieldnames=FLAT_COLUMNS)
+        writer.writeheader()
+        count = 0
+        for record in records:
+            writer.writerow(QualityReport.flatten(record, quality_target))
+            count += 1
+        return count
+    
+    @staticmethod
+    def stream_parquet(records, filename, batch_size=10000, quality_target=95):
+        """
+        Write analyses to Parquet, one row group per batch_size records
+        
+        Requires pyarrow. Only one batch is held in memory at a time.
+        
+        Returns:
+            int: Number of records written
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet reports need pyarrow: pip install pyarrow")
+        
+        writer = None
+        count = 0
+        batch = []
+        try:
+            for record in records:
+                batch.append(QualityReport.flatten(record, quality_target))
+                if len(batch) == batch_size:
+                    writer = QualityReport._write_parquet_batch(pa, pq, writer, batch, filename)
+                    count += len(batch)
+                    batch = []
+            if batch or writer is None:
+                writer = QualityReport._write_parquet_batch(pa, pq, writer, batch, filename)
+                count += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+    
+    @staticmethod
+    def _write_parquet_batch(pa, pq, writer, batch, filename):
+        """Append one batch, opening the writer with the first batch's schema"""
+        table = pa.Table.from_pylist(batch, schema=writer.schema if writer else None)
+        if writer is None:
+            writer = pq.ParquetWriter(filename, table.schema)
+        writer.write_table(table)
+        return writer
+    
+    @staticmethod
+    def stream_text_summary(records, filename, quality_target=95):
+        """
+        Write a one-line-per-shot text summary
+        
+        Returns:
+            int: Number of records written
+        """
+        count = 0
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(SUMMARY_HEADER)
+            for record in records:
+                f.write(SUMMARY_LINE_TEMPLATE.format_map(QualityReport.flatten(record, quality_target)))
+                count += 1
+        return count
+    
+    @staticmethod
+    def shift_summary(timestamps, quality_scores, warpage, sinkage,
+                      shift_hours=8, first_shift_hour=6, quality_target=95):
+        """
+        Per-shift statistics for a scored batch in one vectorized pass
+        
+        Args:
+            timestamps (array-like): Shot timestamps, 'YYYY-MM-DD HH:MM:SS' strings or datetime64
+            quality_scores (array-like): Quality score per shot
+            warpage (array-like): Predicted warpage % per shot
+            sinkage (array-like): Predicted sinkage % per shot
+            shift_hours (int): Shift length
+            first_shift_hour (int): Hour of day the first shift starts
+            quality_target (float): Passing quality score
+            
+        Returns:
+            dict: Arrays with one entry per shift, oldest first
+        """
+        times = np.asarray(timestamps, dtype='datetime64[s]')
+        quality = np.asarray(quality_scores, dtype=float)
+        warpage = np.asarray(warpage, dtype=float)
+        sinkage = np.asarray(sinkage, dtype=float)
+        
+        shift_seconds = shift_hours * 3600
+        offset = np.timedelta64(first_shift_hour, 'h')
+        if len(times) == 0:
+            # reduceat needs at least one slice, so an empty range gets empty per-shift arrays directly
+            empty = np.empty(0)
+            return {
+                'shift_start': np.empty(0, dtype='datetime64[s]'),
+                'count': np.empty(0, dtype=int),
+                **{name: empty.copy() for name in ['pass_rate', 'quality_mean', 'quality_std', 'quality_min',
+                                                   'quality_max', 'warpage_mean', 'sinkage_mean']}
+            }
+        shift_number = (times - offset).astype('int64') // shift_seconds
+        shifts, index = np.unique(shift_number, return_inverse=True)
+        
+        count = np.bincount(index, minlength=len(shifts))
+        quality_mean = np.bincount(index, quality) / count
+        squared = np.bincount(index, (quality - quality_mean[index]) ** 2)
+        quality_std = np.sqrt(squared / np.maximum(count - 1, 1))
+        
+        # Shots grouped by shift so min/max reduce over contiguous slices
+        order = np.argsort(index, kind='stable')
+        starts = np.r_[0, np.cumsum(count)[:-1]]
+        
+        return {
+            'shift_start': (shifts * shift_seconds).astype('datetime64[s]') + offset,
+            'count': count,
+            'pass_rate': np.bincount(index, quality >= quality_target) / count,
+            'quality_mean': quality_mean,
+            'quality_std': quality_std,
+            'quality_min': np.minimum.reduceat(quality[order], starts),
+            'quality_max': np.maximum.reduceat(quality[order], starts),
+            'warpage_mean': np.bincount(index, warpage) / count,
+            'sinkage_mean': np.bincount(index, sinkage) / count
+        }
+    
+    @staticmethod
+    def generate_shift_report(summary):
+        """Render shift_summary() output as a text table"""
+        lines = [SHIFT_HEADER]
+        for i in range(len(summary['count'])):
+            fields = {name: values[i] for name, values in summary.items()}
+            fields['shift_start'] = str(fields['shift_start']).replace('T', ' ')
+            lines.append(SHIFT_LINE_TEMPLATE.format_map(fields))
+        return ''.join(lines)
+
+if __name__ == "__main__":
+    print("Report Generator Ready!")
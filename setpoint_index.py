@@ -0,0 +1,222 @@
+import os
+import itertools
+import threading
+import numpy as np
+from quality_predictor import FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+from config_loader import parameter_bounds
+
+INDEX_FILE = "setpoint_index.npz"
+
+class SetpointIndex:
+    """
+    Nearest-neighbour lookup from part geometry to optimized process setpoints
+
+    Each entry is a geometry with the best process setpoints found for it
+    and their predicted quality. Geometries are normalized by the config.json
+    ranges so every feature counts alike, and held in a KD-tree. Parts added
+    after the last rebuild sit in a small buffer that is scanned directly;
+    the tree is rebuilt once the buffer reaches rebuild_every entries.
+    """
+
+    def __init__(self, model_version=None, rebuild_every=64):
+        self.model_version = model_version
+        self.rebuild_every = rebuild_every
+        lower, upper = parameter_bounds()
+        geometry_columns = [FEATURE_NAMES.index(name) for name in GEOMETRY_FEATURES]
+        self.offset = lower[geometry_columns]
+        self.span = upper[geometry_columns] - lower[geometry_columns]
+        self.geometry = np.empty((0, len(GEOMETRY_FEATURES)))
+        self.setpoints = np.empty((0, len(PROCESS_FEATURES)))
+        self.quality = np.empty(0)
+        self.tree = None
+        self.tree_size = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.quality)
+
+    def normalize(self, geometry):
+        return (np.asarray(geometry, dtype=float).reshape(-1, len(GEOMETRY_FEATURES)) - self.offset) / self.span
+
+    def rebuild(self):
+        """Put every entry in the KD-tree and empty the buffer"""
+        from scipy.spatial import cKDTree
+        with self.lock:
+            self.tree = cKDTree(self.normalize(self.geometry)) if len(self) else None
+            self.tree_size = len(self)
+
+    def _nearest(self, point, k):
+        """(distances, entry indices) of the k nearest entries; call with the lock held"""
+        distances, indices = np.empty(0), np.empty(0, dtype=int)
+        if self.tree is not None:
+            distances, indices = self.tree.query(point, k=min(k, self.tree_size))
+            distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        if len(self) > self.tree_size:
+            buffered = np.sqrt(((self.normalize(self.geometry[self.tree_size:]) - point) ** 2).sum(axis=1))
+            distances = np.concatenate([distances, buffered])
+            indices = np.concatenate([indices, np.arange(self.tree_size, len(self))])
+        order = np.argsort(distances, kind='stable')[:k]
+        return distances[order], indices[order]
+
+    def query(self, geometry_params, k=3):
+        """
+        Recipes of the k most similar parts
+
+        Args:
+            geometry_params (dict): Geometry of the new part
+            k (int): Number of recipes
+
+        Returns:
+            list: Dicts with 'process_params', 'geometry_params', 'quality_score'
+                  and the normalized 'distance', nearest first
+        """
+        point = self.normalize([geometry_params[name] for name in GEOMETRY_FEATURES])[0]
+        with self.lock:
+            distances, indices = self._nearest(point, k)
+            return [
+                {
+                    'process_params': dict(zip(PROCESS_FEATURES, self.setpoints[i].tolist())),
+                    'geometry_params': dict(zip(GEOMETRY_FEATURES, self.geometry[i].tolist())),
+                    'quality_score': float(self.quality[i]),
+                    'distance': float(distance)
+                }
+                for distance, i in zip(distances, indices)
+            ]
+
+    def add(self, geometry_params, process_params, quality_score):
+        """
+        Record the setpoints found for a part
+
+        A geometry already in the index keeps whichever setpoints score higher.
+
+        Returns:
+            bool: True when the index changed
+        """
+        geometry = np.array([geometry_params[name] for name in GEOMETRY_FEATURES], dtype=float)
+        setpoints = np.array([process_params[name] for name in PROCESS_FEATURES], dtype=float)
+        with self.lock:
+            distances, indices = self._nearest(self.normalize(geometry)[0], 1)
+            if len(distances) and distances[0] == 0:
+                if quality_score <= self.quality[indices[0]]:
+                    return False
+                self.setpoints[indices[0]] = setpoints
+                self.quality[indices[0]] = quality_score
+                self.dirty = True
+                return True
+            self.geometry = np.vstack([self.geometry, geometry])
+            self.setpoints = np.vstack([self.setpoints, setpoints])
+            self.quality = np.append(self.quality, quality_score)
+            self.dirty = True
+            rebuild = len(self) - self.tree_size >= self.rebuild_every
+        if rebuild:
+            self.rebuild()
+        return True
+
+    @staticmethod
+    def geometry_grid(points_per_axis=4):
+        """Geometries on an even grid over the config.json geometry ranges"""
+        lower, upper = parameter_bounds()
+        axes = [np.linspace(lower[FEATURE_NAMES.index(name)], upper[FEATURE_NAMES.index(name)], points_per_axis)
+                for name in GEOMETRY_FEATURES]
+        return [dict(zip(GEOMETRY_FEATURES, values)) for values in itertools.product(*axes)]
+
+    @classmethod
+    def build(cls, predictor, optimizer, geometries, samples=1024, seed=0):
+        """
+        Optimize every geometry with OptimizationEngine.search_setpoints() and index the results
+
+        Args:
+            predictor (MoldingQualityPredictor): Loaded predictor
+            optimizer (OptimizationEngine): Supplies the search and quality score
+            geometries (list): Geometry dicts, e.g. geometry_grid() or past parts
+            samples (int): Candidates per search round
+
+        Returns:
+            SetpointIndex: Index over the searched geometries
+        """
+        index = cls(model_version=predictor.model_version)
+        for geometry_params in geometries:
+            best = optimizer.search_setpoints(predictor.bind_geometry(geometry_params), samples=samples, seed=seed)
+            index.add(geometry_params, best['process_params'], best['quality_score'])
+        index.rebuild()
+        index.dirty = True
+        return index
+
+    @classmethod
+    def build_and_save(cls, predictor, geometries=None, samples=1024):
+        """
+        Build the index for a predictor's models and save it next to them
+
+        Meant for offline use: after training (CheckpointedTrainer.install())
+        or from this module's command line, so the app only ever loads it.
+
+        Args:
+            predictor (MoldingQualityPredictor): Trained, ready predictor
+            geometries (list): Geometry dicts; defaults to geometry_grid()
+
+        Returns:
+            SetpointIndex: The saved index
+        """
+        from optimization_engine import OptimizationEngine
+        index = cls.build(predictor, OptimizationEngine(), geometries or cls.geometry_grid(), samples=samples)
+        index.save(f"{predictor.model_path}{INDEX_FILE}")
+        return index
+
+    @classmethod
+    def load_current(cls, predictor):
+        """The saved index for the predictor's current models, or None when there is none"""
+        filename = f"{predictor.model_path}{INDEX_FILE}"
+        if not os.path.exists(filename):
+            return None
+        index = cls.load(filename)
+        return index if index.model_version == predictor.model_version else None
+
+    def save(self, filename):
+        """Write the index to an .npz file, replacing it atomically"""
+        temporary = f"{filename}.tmp"
+        with self.lock:
+            with open(temporary, 'wb') as f:
+                np.savez(f, geometry=self.geometry, setpoints=self.setpoints, quality=self.quality,
+                         model_version=np.array(self.model_version or ""))
+            os.replace(temporary, filename)
+            self.dirty = False
+        return filename
+
+    @classmethod
+    def load(cls, filename):
+        """Read an index written by save()"""
+        with np.load(filename, allow_pickle=False) as data:
+            index = cls(model_version=str(data['model_version']) or None)
+            index.geometry = data['geometry']
+            index.setpoints = data['setpoints']
+            index.quality = data['quality']
+        index.rebuild()
+        return index
+
+if __name__ == "__main__":
+    import time
+    from quality_predictor import MoldingQualityPredictor
+    from history_store import HistoryStore
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models(inference_only=True):
+        predictor.train_models()
+
+    # Offline build: an even geometry grid plus every part in the history
+    geometries = SetpointIndex.geometry_grid()
+    if os.path.exists("data/history.db"):
+        past = HistoryStore().column_arrays(GEOMETRY_FEATURES)
+        past = np.unique(np.column_stack([past[name] for name in GEOMETRY_FEATURES]), axis=0)
+        geometries += [dict(zip(GEOMETRY_FEATURES, row)) for row in past]
+
+    start = time.perf_counter()
+    index = SetpointIndex.build_and_save(predictor, geometries)
+    print(f"Indexed {len(index)} geometries in {time.perf_counter() - start:.1f} s")
+
+    part = {'wall_thickness': 2.2, 'part_volume': 95, 'aspect_ratio': 1.8, 'time_to_fill': 6}
+    start = time.perf_counter()
+    recipes = index.query(part, k=3)
+    print(f"Query: {(time.perf_counter() - start) * 1e6:.0f} µs")
+    for recipe in recipes:
+        print(f"  {recipe['quality_score']:.1f}% at distance {recipe['distance']:.3f}: {recipe['process_params']}")
@@ -0,0 +1,469 @@
+import os
+import json
+import time
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+import numpy as np
+from quality_predictor import FEATURE_NAMES, PROCESS_FEATURES, GEOMETRY_FEATURES
+from input_validator import InputValidator
+from instrumentation import METRICS, timed
+
+STAGES = ['read', 'score', 'store']
+
+class FileSource:
+    """
+    Shot records, one JSON object per line, from a file or named pipe
+
+    With follow=True the file is tailed: at the end of the file the source
+    waits for more lines, as a machine logger appends them. A line written
+    in two pieces is held back until its newline arrives. The file is
+    opened on first read, since opening a named pipe blocks until a writer
+    connects.
+    """
+
+    def __init__(self, path, follow=True, poll_interval=0.05):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.file = None
+        self.partial = ""
+        self.finished = False
+
+    def read_lines(self, max_lines, timeout):
+        """Up to max_lines complete lines; returns early after timeout seconds without new data"""
+        if self.file is None:
+            self.file = open(self.path, 'r', encoding='utf-8')
+        lines = []
+        deadline = time.monotonic() + timeout
+        while len(lines) < max_lines:
+            line = self.file.readline()
+            if line.endswith("\n"):
+                lines.append(self.partial + line)
+                self.partial = ""
+                continue
+            self.partial += line
+            if not self.follow:
+                if self.partial:
+                    lines.append(self.partial)
+                    self.partial = ""
+                self.finished = True
+                break
+            if lines or time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+        return lines
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+class SocketSource:
+    """
+    Shot records, one JSON object per line, from any number of machine connections
+
+    Listens on a TCP (host, port) or a Unix socket path and multiplexes every
+    connection with a selector on the reader thread. While the pipeline is
+    full the reader stops calling recv(), so the kernel buffers fill and TCP
+    flow control slows the machines down instead of dropping shots.
+    """
+
+    def __init__(self, address, backlog=128):
+        import socket
+        import selectors
+
+        self.unix_path = address if isinstance(address, str) else None
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(address)
+        self.server.listen(backlog)
+        self.server.setblocking(False)
+        self.address = self.server.getsockname()
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        self.buffers = {}
+        self.lines = deque()
+        self.finished = False
+
+    @property
+    def connections(self):
+        return len(self.buffers)
+
+    def _receive(self, connection):
+        data = connection.recv(65536)
+        if not data:
+            # Connection closed; a last line without a newline still counts
+            if self.buffers[connection]:
+                self.lines.append(self.buffers[connection])
+            self.selector.unregister(connection)
+            del self.buffers[connection]
+            connection.close()
+            return
+        *complete, self.buffers[connection] = (self.buffers[connection] + data).split(b"\n")
+        self.lines.extend(complete)
+
+    def read_lines(self, max_lines, timeout):
+        """Up to max_lines complete lines; returns early after timeout seconds without new data"""
+        import selectors
+
+        deadline = time.monotonic() + timeout
+        while len(self.lines) < max_lines:
+            # Once some lines are waiting, only drain what is already readable
+            wait = 0 if self.lines else max(0.0, deadline - time.monotonic())
+            events = self.selector.select(timeout=wait)
+            if not events:
+                break
+            for key, _ in events:
+                if key.data is None:
+                    connection, _ = self.server.accept()
+                    connection.setblocking(False)
+                    self.selector.register(connection, selectors.EVENT_READ, True)
+                    self.buffers[connection] = b""
+                else:
+                    self._receive(key.fileobj)
+        count = min(max_lines, len(self.lines))
+        return [self.lines.popleft().decode('utf-8', errors='replace') for _ in range(count)]
+
+    def close(self):
+        for connection in list(self.buffers):
+            self.selector.unregister(connection)
+            connection.close()
+        self.buffers = {}
+        self.selector.close()
+        self.server.close()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+class StageStats:
+    """Rows, batches, busy time and time blocked on a full downstream queue for one stage"""
+
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def to_dict(self, elapsed):
+        return {
+            'rows': self.rows,
+            'batches': self.batches,
+            'busy_seconds': self.busy_seconds,
+            'blocked_seconds': self.blocked_seconds,
+            'rows_per_second': self.rows / elapsed if elapsed > 0 else 0.0,
+            'capacity_rows_per_second': self.rows / self.busy_seconds if self.busy_seconds > 0 else 0.0
+        }
+
+class ShotIngestionService:
+    """
+    Scores shots from machines as they are produced
+
+    Three stages run on their own threads, joined by bounded queues of
+    batches: read (lines from a FileSource or SocketSource), score (parse,
+    validate with InputValidator, predict_batch and quality scores for the
+    whole batch) and store (HistoryStore.append_many and SPCEngine.update,
+    which fires the alarm hooks), after which record_hooks are called
+    with each stored batch. When a queue is full the stage in front
+    of it blocks, so a slow database slows reading rather than buffering
+    shots without limit.
+
+    Records are flat JSON objects keyed by feature name, with optional
+    'machine_id' and 'timestamp', or the app's nested analysis format.
+    Malformed or invalid records are counted and skipped; with
+    validation_mode='clip' out-of-range values are clipped instead.
+    """
+
+    def __init__(self, predictor, optimizer, history_store, spc_engine=None, drift_monitor=None,
+                 validator=None, batch_size=256, queue_size=8, batch_timeout=0.2, validation_mode='reject'):
+        self.predictor = predictor
+        self.optimizer = optimizer
+        self.history_store = history_store
+        self.spc_engine = spc_engine
+        self.drift_monitor = drift_monitor
+        self.validator = validator or InputValidator()
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.validation_mode = validation_mode
+        self.queues = {'score': queue.Queue(queue_size), 'store': queue.Queue(queue_size)}
+        self.stats = {name: StageStats() for name in STAGES}
+        self.rejected = 0
+        self.alarms = 0
+        self.errors = deque(maxlen=100)
+        self.record_hooks = []
+        self.stopping = threading.Event()
+        self.threads = []
+        self.started = None
+        self.finished = None
+
+    def score_batch(self, lines):
+        """
+        Parse, validate and score a batch of record lines
+
+        Returns:
+            list: Analysis records for the accepted shots, in the app's format
+        """
+        parsed = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                parsed.append(record)
+            else:
+                self.rejected += 1
+                self.errors.append(f"Unreadable record: {line[:80]}")
+        if not parsed:
+            return []
+
+        result = self.validator.validate(InputValidator.to_matrix(parsed), mode=self.validation_mode)
+        if self.validation_mode == 'reject':
+            for row in np.flatnonzero(~result['valid']):
+                self.errors.append("; ".join(self.validator.describe(result, row)))
+        self.rejected += len(parsed) - len(result['rows'])
+        X = result['X']
+        if len(X) == 0:
+            return []
+
+        predictions = self.predictor.predict_batch(X)
+        scores = self.optimizer.calculate_quality_scores(
+            predictions['warpage_percent'], predictions['sinkage_percent']
+        )['overall_quality']
+        if self.drift_monitor is not None:
+            self.drift_monitor.update_batch(X)
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        n_process = len(PROCESS_FEATURES)
+        records = []
+        for i, row in enumerate(result['rows']):
+            source = parsed[row]
+            values = X[i].tolist()
+            records.append({
+                'timestamp': str(source.get('timestamp') or now),
+                'machine_id': str(source.get('machine_id') or 'default'),
+                'process_params': dict(zip(PROCESS_FEATURES, values[:n_process])),
+                'geometry_params': dict(zip(GEOMETRY_FEATURES, values[n_process:])),
+                'predictions': {
+                    'warpage_percent': float(predictions['warpage_percent'][i]),
+                    'sinkage_percent': float(predictions['sinkage_percent'][i])
+                },
+                'quality_score': float(scores[i])
+            })
+        return records
+
+    def store_batch(self, records):
+        """Write a batch to the history in one transaction and run it through SPC"""
+        self.history_store.append_many(records)
+        if self.spc_engine is not None:
+            for record in records:
+                self.alarms += len(self.spc_engine.update(record))
+        for hook in self.record_hooks:
+            hook(records)
+
+    def _put(self, stage, name, item):
+        """Hand a batch downstream, blocking while the queue is full"""
+        start = time.perf_counter()
+        self.queues[name].put(item)
+        self.stats[stage].blocked_seconds += time.perf_counter() - start
+
+    def _record(self, stage, rows, seconds):
+        stats = self.stats[stage]
+        stats.busy_seconds += seconds
+        stats.rows += rows
+        stats.batches += 1
+        METRICS.increment(f"ingest_{stage}_rows", rows)
+
+    def _run_stage(self, stage, work, rows):
+        """Time one batch of a stage; a failing batch is logged and skipped, not fatal"""
+        start = time.perf_counter()
+        try:
+            with timed(f"ingest_{stage}"):
+                result = work()
+        except Exception as e:
+            self.errors.append(f"{stage} stage: {e}")
+            result = None
+        self._record(stage, rows, time.perf_counter() - start)
+        return result
+
+    def _read(self, source):
+        try:
+            while not self.stopping.is_set() and not source.finished:
+                # Time spent waiting for machines to send is idle, not busy
+                lines = source.read_lines(self.batch_size, self.batch_timeout)
+                if lines:
+                    self._record('read', len(lines), 0.0)
+                    self._put('read', 'score', lines)
+        finally:
+            source.close()
+            self.queues['score'].put(None)
+
+    def _score(self):
+        while True:
+            lines = self.queues['score'].get()
+            if lines is None:
+                self.queues['store'].put(None)
+                return
+            records = self._run_stage('score', lambda: self.score_batch(lines), len(lines))
+            if records:
+                self._put('score', 'store', records)
+
+    def _store(self):
+        while True:
+            records = self.queues['store'].get()
+            if records is None:
+                self.history_store.flush()
+                self.finished = time.perf_counter()
+                return
+            self._run_stage('store', lambda: self.store_batch(records), len(records))
+
+    def start(self, source):
+        """
+        Start the pipeline on a source
+
+        Raises:
+            RuntimeError: When the predictor has not passed its warm-up check
+        """
+        if not self.predictor.ready:
+            raise RuntimeError("Predictor is not ready; load or train the models before ingesting shots")
+        self.started = time.perf_counter()
+        self.finished = None
+        self.threads = [
+            threading.Thread(target=self._read, args=(source,), name="ingest-read", daemon=True),
+            threading.Thread(target=self._score, name="ingest-score", daemon=True),
+            threading.Thread(target=self._store, name="ingest-store", daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def join(self, timeout=None):
+        """Wait for the pipeline to drain; True once every stage has finished"""
+        for thread in self.threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in self.threads)
+
+    def stop(self, timeout=None):
+        """Stop reading, let the batches already queued finish, and wait"""
+        self.stopping.set()
+        return self.join(timeout)
+
+    def run(self, source):
+        """Ingest a finite source (e.g. FileSource with follow=False) to the end"""
+        self.start(source)
+        self.join()
+        return self.report()
+
+    def report(self):
+        """
+        Returns:
+            dict: 'elapsed_seconds', 'rejected', 'alarms', per-stage 'stages'
+                  (rows, batches, busy and blocked seconds, rows per second and
+                  rows per busy second) and current 'queue_depth' in batches
+        """
+        if self.started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            'elapsed_seconds': elapsed,
+            'rejected': self.rejected,
+            'alarms': self.alarms,
+            'stages': {name: stats.to_dict(elapsed) for name, stats in self.stats.items()},
+            'queue_depth': {name: q.qsize() for name, q in self.queues.items()}
+        }
+
+def synthetic_shots(n, machines=120, seed=0, invalid_every=0):
+    """
+    JSON lines of simulated shots from many machines, for demos and tests
+
+    Every invalid_every-th line is made invalid (out of range or unreadable).
+    """
+    validator = InputValidator()
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(validator.lower, validator.upper, size=(n, len(FEATURE_NAMES)))
+    lines = []
+    for i, row in enumerate(X):
+        record = {'machine_id': f"M-{i % machines:03d}", **dict(zip(FEATURE_NAMES, row.round(3).tolist()))}
+        if invalid_every and i % invalid_every == invalid_every - 1:
+            if (i // invalid_every) % 2:
+                lines.append("{not json")
+                continue
+            record['melt_temp'] = float(validator.upper[0]) + 50
+        lines.append(json.dumps(record))
+    return lines
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    from quality_predictor import MoldingQualityPredictor
+    from optimization_engine import OptimizationEngine
+    from history_store import HistoryStore
+    from spc_engine import SPCEngine
+    from report_archive import ReportArchive
+
+    parser = argparse.ArgumentParser(description="Score a live stream of shot records")
+    parser.add_argument("--file", help="File or named pipe of JSON lines to tail")
+    parser.add_argument("--socket", help="host:port or Unix socket path to listen on")
+    parser.add_argument("--history", default="data/history.db", help="History database")
+    parser.add_argument("--archive", default="data/archive", help="Compressed archive of scored batches")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models(inference_only=True):
+        predictor.train_models()
+    spc = SPCEngine()
+    spc.alarm_hooks.append(lambda alarm: print(f"ALARM {alarm['machine_id']} {alarm['metric']}: {alarm['value']:.2f}"))
+
+    if args.file or args.socket:
+        if args.file:
+            source = FileSource(args.file, follow=True)
+        else:
+            host, _, port = args.socket.rpartition(":")
+            source = SocketSource((host, int(port)) if port.isdigit() else args.socket)
+        service = ShotIngestionService(predictor, OptimizationEngine(), HistoryStore(args.history),
+                                       spc_engine=spc, batch_size=args.batch_size)
+        archive = ReportArchive(args.archive)
+        service.record_hooks.append(archive.append_many)
+        service.start(source)
+        try:
+            while True:
+                time.sleep(5)
+                report = service.report()
+                print(f"stored {report['stages']['store']['rows']} shots, rejected {report['rejected']}, "
+                      f"queues {report['queue_depth']}")
+        except KeyboardInterrupt:
+            service.stop()
+            archive.close()
+    else:
+        # Demo: 100,000 shots from 120 machines, as fast as the pipeline takes them
+        directory = tempfile.mkdtemp()
+        shots_file = os.path.join(directory, "shots.jsonl")
+        with open(shots_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(synthetic_shots(100000, invalid_every=1000)) + "\n")
+        spc.alarm_hooks.clear()
+        service = ShotIngestionService(predictor, OptimizationEngine(),
+                                       HistoryStore(os.path.join(directory, "history.db")), spc_engine=spc)
+        archive = ReportArchive(os.path.join(directory, "archive"))
+        service.record_hooks.append(archive.append_many)
+        report = service.run(FileSource(shots_file, follow=False))
+        archive.close()
+        stored = report['stages']['store']['rows']
+        print(f"{stored} shots stored, {report['rejected']} rejected, {report['alarms']} SPC alarms "
+              f"in {report['elapsed_seconds']:.1f} s ({stored / report['elapsed_seconds']:,.0f} shots/s)")
+        for name, stage in report['stages'].items():
+            capacity = f", {stage['capacity_rows_per_second']:,.0f} per busy second" if stage['busy_seconds'] else ""
+            print(f"  {name:<6} {stage['rows_per_second']:>8,.0f} rows/s{capacity}, "
+                  f"blocked on a full queue {stage['blocked_seconds']:.2f} s")
+        archived = archive.stats()
+        print(f"Archived {archived['records']} scored shots in {archived['segments']} segment(s), "
+              f"{archived['bytes'] / archived['records']:.0f} bytes/shot")
+        print("120 machines at one shot every 2 s need 60 shots/s")
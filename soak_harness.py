@@ -0,0 +1,383 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import numpy as np
+from quality_predictor import MoldingQualityPredictor, FEATURE_NAMES
+from optimization_engine import OptimizationEngine
+from input_validator import InputValidator
+from benchmark_suite import machine_info, save_results
+from memory_accounting import rss_bytes
+
+RESULTS_DIR = "benchmarks/"
+TARGETS = ['predictor', 'batch', 'stream']
+
+def load_shot_log(path):
+    """
+    Feature matrix of a recorded shot log, oldest first
+
+    Args:
+        path (str): A history database (.db) or a JSON-lines file of shot records
+
+    Returns:
+        tuple: (X of shape (n, 11), timestamps as strings or None)
+    """
+    if path.endswith(".db"):
+        from history_store import HistoryStore
+        columns = HistoryStore(path).column_arrays(['timestamp'] + FEATURE_NAMES)
+        return np.column_stack([columns[name] for name in FEATURE_NAMES]), columns['timestamp']
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    timestamps = [record.get('timestamp') for record in records]
+    return InputValidator.to_matrix(records), (timestamps if all(timestamps) else None)
+
+def recorded_rate(timestamps):
+    """Shots per second at which a log with "%Y-%m-%d %H:%M:%S" timestamps was recorded"""
+    seconds = np.array(timestamps, dtype='datetime64[s]').astype(np.int64)
+    span = seconds.max() - seconds.min()
+    return (len(seconds) - 1) / span if span > 0 else None
+
+class LatencyReservoir:
+    """Uniform sample of at most `size` latencies, so exact-enough percentiles need fixed memory"""
+
+    def __init__(self, size=100000, seed=0):
+        self.values = np.empty(size)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, value):
+        if self.seen < len(self.values):
+            self.values[self.seen] = value
+        else:
+            slot = self.rng.integers(0, self.seen + 1)
+            if slot < len(self.values):
+                self.values[slot] = value
+        self.seen += 1
+
+    def sample(self):
+        return self.values[:min(self.seen, len(self.values))]
+
+def percentiles(values):
+    """p50, p95, p99 and max of latencies in seconds, as milliseconds"""
+    if len(values) == 0:
+        return {'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1e3
+    return {'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99), 'max_ms': float(np.max(values) * 1e3)}
+
+class PredictorTarget:
+    """MoldingQualityPredictor.predict() and the quality score, one shot per call"""
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.optimizer = OptimizationEngine()
+
+    def submit(self, worker, X):
+        for row in X:
+            values = dict(zip(FEATURE_NAMES, row))
+            predictions = self.predictor.predict(values, values)
+            self.optimizer.calculate_quality_score(predictions['warpage_percent'], predictions['sinkage_percent'])
+
+    def close(self):
+        pass
+
+class BatchTarget:
+    """predict_batch() and the vectorized quality scores, one call per batch"""
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.optimizer = OptimizationEngine()
+
+    def submit(self, worker, X):
+        predictions = self.predictor.predict_batch(X)
+        self.optimizer.calculate_quality_scores(predictions['warpage_percent'], predictions['sinkage_percent'])
+
+    def close(self):
+        pass
+
+class StreamTarget:
+    """
+    The shot ingestion service on a local TCP socket, end to end
+
+    Each worker is one machine connection. A submit sends the batch as JSON
+    lines and returns once the service has stored every shot of it, so the
+    latency covers parsing, validation, scoring, the history write and SPC.
+    """
+
+    def __init__(self, predictor, directory, timeout=30.0):
+        import socket
+        from shot_stream import ShotIngestionService, SocketSource
+        from history_store import HistoryStore
+        from spc_engine import SPCEngine
+
+        self.socket = socket
+        self.timeout = timeout
+        self.source = SocketSource(('127.0.0.1', 0))
+        self.service = ShotIngestionService(predictor, OptimizationEngine(),
+                                            HistoryStore(os.path.join(directory, "soak_history.db")),
+                                            spc_engine=SPCEngine(), batch_timeout=0.005)
+        self.service.record_hooks.append(self.stored)
+        self.waiting = {}
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.service.start(self.source)
+
+    def stored(self, records):
+        with self.lock:
+            for record in records:
+                waiter = self.waiting.get(record['machine_id'])
+                if waiter is not None:
+                    waiter[0] -= 1
+                    if waiter[0] == 0:
+                        waiter[1].set()
+
+    def submit(self, worker, X):
+        machine_id = f"soak-{worker:03d}"
+        if worker not in self.connections:
+            self.connections[worker] = self.socket.create_connection(self.source.address)
+        done = threading.Event()
+        with self.lock:
+            self.waiting[machine_id] = [len(X), done]
+        lines = [json.dumps({'machine_id': machine_id, **dict(zip(FEATURE_NAMES, row.tolist()))}) for row in X]
+        self.connections[worker].sendall(("\n".join(lines) + "\n").encode())
+        if not done.wait(self.timeout):
+            raise TimeoutError(f"{machine_id}: shots not stored within {self.timeout:g} s "
+                               f"({self.service.rejected} rejected so far)")
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        self.service.stop()
+
+class SoakHarness:
+    """
+    Replays a shot log against a target at a set rate and concurrency
+
+    Shots are scheduled open loop: with a rate, request i is due at
+    start + i * batch_size / rate whatever happened to earlier requests,
+    and its latency is measured from that due time. A target that falls
+    behind therefore shows growing latency instead of quietly lowering
+    the offered load. Without a rate, workers send as fast as they can.
+
+    Every `interval` seconds a window is closed with its throughput,
+    latency percentiles, errors and the process RSS. The summary adds
+    overall percentiles (from a fixed-size reservoir sample), memory growth
+    and its trend per hour, and a 'benchmarks' section in the
+    benchmark_suite format, so benchmark_suite.compare() works on runs.
+    """
+
+    def __init__(self, target, X, rate=None, concurrency=1, batch_size=1, duration=60.0, max_shots=None,
+                 interval=5.0):
+        self.target = target
+        self.X = np.asarray(X, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        self.rate = rate
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.duration = duration
+        self.max_requests = None if max_shots is None else -(-max_shots // batch_size)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_request = 0
+        self.reservoir = LatencyReservoir()
+        self.window = {'latencies': [], 'shots': 0, 'errors': 0}
+        self.windows = []
+        self.errors = []
+        self.shots = 0
+        self.failed = 0
+
+    def _take(self):
+        """Index of the next request, or None when the run is over"""
+        with self.lock:
+            i = self.next_request
+            if self.max_requests is not None and i >= self.max_requests:
+                return None
+            self.next_request += 1
+            return i
+
+    def _worker(self, worker):
+        n = len(self.X)
+        while True:
+            i = self._take()
+            if i is None:
+                return
+            due = self.start + i * self.batch_size / self.rate if self.rate else time.perf_counter()
+            if due >= self.deadline:
+                return
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            rows = np.arange(i * self.batch_size, (i + 1) * self.batch_size) % n
+            error = None
+            try:
+                self.target.submit(worker, self.X[rows])
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            latency = time.perf_counter() - due
+            with self.lock:
+                if error:
+                    self.window['errors'] += 1
+                    self.failed += 1
+                    if len(self.errors) < 100:
+                        self.errors.append(error)
+                else:
+                    self.window['latencies'].append(latency)
+                    self.window['shots'] += len(rows)
+                    self.shots += len(rows)
+                    self.reservoir.add(latency)
+
+    def _close_window(self, seconds):
+        with self.lock:
+            window, self.window = self.window, {'latencies': [], 'shots': 0, 'errors': 0}
+        self.windows.append({
+            'elapsed_s': time.perf_counter() - self.start,
+            'shots': window['shots'],
+            'shots_per_s': window['shots'] / seconds if seconds > 0 else 0.0,
+            'errors': window['errors'],
+            'rss_mb': rss_bytes() / 2 ** 20,
+            **percentiles(np.array(window['latencies']))
+        })
+
+    def run(self):
+        """
+        Run the soak and summarize it
+
+        Returns:
+            dict: 'machine', 'config', 'totals', 'latency', 'memory', 'windows',
+                  the first 'errors' and 'benchmarks'
+        """
+        rss_start = rss_bytes() / 2 ** 20
+        self.start = time.perf_counter()
+        self.deadline = self.start + self.duration
+        workers = [threading.Thread(target=self._worker, args=(w,), name=f"soak-{w}", daemon=True)
+                   for w in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+        window_start = self.start
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(max(0.0, min(0.1, window_start + self.interval - time.perf_counter())))
+            now = time.perf_counter()
+            if now - window_start >= self.interval:
+                self._close_window(now - window_start)
+                window_start = now
+        if self.window['shots'] or self.window['errors'] or not self.windows:
+            self._close_window(time.perf_counter() - window_start)
+        elapsed = time.perf_counter() - self.start
+        self.target.close()
+        return self.summary(elapsed, rss_start)
+
+    def summary(self, elapsed, rss_start):
+        latency = percentiles(self.reservoir.sample())
+        rss = np.array([window['rss_mb'] for window in self.windows])
+        times = np.array([window['elapsed_s'] for window in self.windows])
+        # The first window includes warm-up allocations; the trend is fitted on the rest, and only
+        # once there are enough windows for a slope that is not just allocator noise
+        slope = np.polyfit(times[1:], rss[1:], 1)[0] * 3600 if len(rss) > 5 else None
+        memory = {
+            'rss_start_mb': rss_start,
+            'rss_end_mb': float(rss[-1]) if len(rss) else rss_start,
+            'rss_peak_mb': float(rss.max()) if len(rss) else rss_start,
+            'rss_growth_mb': (float(rss[-1]) if len(rss) else rss_start) - rss_start,
+            'rss_trend_mb_per_hour': None if slope is None else float(slope)
+        }
+        throughput = self.shots / elapsed if elapsed > 0 else 0.0
+        return {
+            'machine': machine_info(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'config': {
+                'target': type(self.target).__name__, 'rate': self.rate, 'concurrency': self.concurrency,
+                'batch_size': self.batch_size, 'duration_s': self.duration, 'interval_s': self.interval,
+                'log_shots': len(self.X)
+            },
+            'totals': {
+                'elapsed_s': elapsed, 'shots': self.shots, 'requests': self.reservoir.seen + self.failed,
+                'errors': self.failed, 'shots_per_s': throughput
+            },
+            'latency': latency,
+            'memory': memory,
+            'windows': self.windows,
+            'errors': self.errors,
+            'benchmarks': {
+                'soak_shots_per_s': {'value': throughput, 'unit': 'shots/s', 'better': 'higher'},
+                **{f"soak_latency_{name}": {'value': value, 'unit': 'ms', 'better': 'lower'}
+                   for name, value in latency.items()},
+                'soak_rss_growth_mb': {'value': memory['rss_growth_mb'], 'unit': 'MB', 'better': 'lower'},
+                'soak_errors': {'value': self.failed, 'unit': 'requests', 'better': 'lower'}
+            }
+        }
+
+def make_target(name, predictor, directory):
+    """PredictorTarget, BatchTarget or StreamTarget by name"""
+    if name == 'predictor':
+        return PredictorTarget(predictor)
+    if name == 'batch':
+        return BatchTarget(predictor)
+    if name == 'stream':
+        return StreamTarget(predictor, directory)
+    raise ValueError(f"Unknown soak target '{name}', expected one of {', '.join(TARGETS)}")
+
+if __name__ == "__main__":
+    import io
+    import argparse
+    import contextlib
+    from benchmark_suite import load_results, compare
+
+    parser = argparse.ArgumentParser(description="Replay a shot log against the predictor, batch scorer or stream service")
+    parser.add_argument("--target", choices=TARGETS, default='predictor')
+    parser.add_argument("--log", help="Recorded shot log (.db history or JSON lines); default is synthetic")
+    parser.add_argument("--shots", type=int, default=10000, help="Synthetic log length")
+    parser.add_argument("--rate", default="max",
+                        help="Shots per second, 'realtime' (the log's own rate; 120 machines on a 2 s cycle "
+                             "for synthetic logs) or 'max'")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Multiplier on a 'realtime' rate")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds; 28800 is a full shift")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds per reporting window")
+    parser.add_argument("--output", default=None, help="Summary file (default benchmarks/soak_<target>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier summary to compare against")
+    args = parser.parse_args()
+
+    model_path = os.path.join(tempfile.mkdtemp(prefix="soak_models_"), "")
+    try:
+        predictor = MoldingQualityPredictor(model_path=model_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor.train_models()
+
+        timestamps = None
+        if args.log:
+            X, timestamps = load_shot_log(args.log)
+        else:
+            X, _, _ = predictor.generate_training_data(samples=args.shots, seed=7)
+        if args.rate == 'max':
+            rate = None
+        elif args.rate == 'realtime':
+            rate = (recorded_rate(timestamps) if timestamps is not None else 120 / 2.0) * args.speedup
+        else:
+            rate = float(args.rate)
+
+        harness = SoakHarness(make_target(args.target, predictor, model_path), X, rate=rate,
+                              concurrency=args.concurrency, batch_size=args.batch_size,
+                              duration=args.duration, interval=args.interval)
+        summary = harness.run()
+    finally:
+        shutil.rmtree(model_path, ignore_errors=True)
+
+    for window in summary['windows']:
+        print(f"{window['elapsed_s']:>7.0f} s  {window['shots_per_s']:>9,.0f} shots/s  p50 {window['p50_ms']:.2f} ms  "
+              f"p99 {window['p99_ms']:.2f} ms  errors {window['errors']}  RSS {window['rss_mb']:.0f} MB")
+    totals, latency, memory = summary['totals'], summary['latency'], summary['memory']
+    print(f"\n{totals['shots']:,} shots in {totals['elapsed_s']:.0f} s ({totals['shots_per_s']:,.0f} shots/s), "
+          f"{totals['errors']} errors; p50 {latency['p50_ms']:.2f} ms, p99 {latency['p99_ms']:.2f} ms; "
+          f"RSS {memory['rss_growth_mb']:+.1f} MB"
+          + (f" ({memory['rss_trend_mb_per_hour']:+.1f} MB/h)" if memory['rss_trend_mb_per_hour'] is not None else ""))
+    output = args.output or f"{RESULTS_DIR}soak_{args.target}.json"
+    save_results(summary, output)
+    print(f"Summary saved to {output}")
+    if args.baseline and os.path.exists(args.baseline):
+        baseline = load_results(args.baseline)
+        if baseline['config'] != summary['config'] or baseline['machine'] != summary['machine']:
+            print("⚠️  Baseline was run with a different configuration, machine or library versions")
+        for row in compare(summary, baseline):
+            flag = "❌ REGRESSION" if row['regression'] else "✅"
+            print(f"{row['metric']:<28} {row['change']:>+8.1%}  {flag}")
@@ -0,0 +1,293 @@
+import threading
+import numpy as np
+
+# Control chart constants for subgroup sizes 2-10: (d2, D3, D4)
+XBAR_R_CONSTANTS = {
+    2: (1.128, 0.0, 3.267), 3: (1.693, 0.0, 2.574), 4: (2.059, 0.0, 2.282),
+    5: (2.326, 0.0, 2.114), 6: (2.534, 0.0, 2.004), 7: (2.704, 0.076, 1.924),
+    8: (2.847, 0.136, 1.864), 9: (2.970, 0.184, 1.816), 10: (3.078, 0.223, 1.777)
+}
+
+class EWMAChart:
+    """Exponentially weighted moving average chart with time-varying limits"""
+
+    def __init__(self, target, sigma, lam=0.2, L=3.0):
+        self.target = target
+        self.sigma = sigma
+        self.lam = lam
+        self.L = L
+        self.z = target
+        self.t = 0
+
+    def limits(self, t):
+        """Control limit half-width after t observations"""
+        factor = self.lam / (2 - self.lam) * (1 - (1 - self.lam) ** (2 * np.asarray(t, dtype=float)))
+        return self.L * self.sigma * np.sqrt(factor)
+
+    def update(self, x):
+        """Add one observation; returns an alarm dict or None"""
+        self.t += 1
+        self.z = self.lam * x + (1 - self.lam) * self.z
+        width = float(self.limits(self.t))
+        if abs(self.z - self.target) > width:
+            return {'chart': 'EWMA', 'statistic': self.z, 'limit': self.target + np.sign(self.z - self.target) * width,
+                    'direction': 'high' if self.z > self.target else 'low'}
+        return None
+
+    def replay(self, values):
+        """
+        Vectorized EWMA over a series, continuing from the current state
+
+        Returns:
+            dict: statistic, upper, lower and alarm arrays
+        """
+        # scipy takes most of a second to import, so only history replays pay for it
+        from scipy.signal import lfilter
+        values = np.asarray(values, dtype=float)
+        z, _ = lfilter([self.lam], [1, -(1 - self.lam)], values, zi=[(1 - self.lam) * self.z])
+        t = self.t + np.arange(1, len(values) + 1)
+        width = self.limits(t)
+        if len(values):
+            self.z, self.t = float(z[-1]), int(t[-1])
+        return {'statistic': z, 'upper': self.target + width, 'lower': self.target - width,
+                'alarm': np.abs(z - self.target) > width}
+
+class CUSUMChart:
+    """Tabular CUSUM with reference value k and decision interval h, in sigma units"""
+
+    def __init__(self, target, sigma, k=0.5, h=5.0):
+        self.target = target
+        self.sigma = sigma
+        self.k = k
+        self.h = h
+        self.upper = 0.0
+        self.lower = 0.0
+
+    def update(self, x):
+        """Add one observation; returns an alarm dict or None"""
+        z = (x - self.target) / self.sigma
+        self.upper = max(0.0, self.upper + z - self.k)
+        self.lower = max(0.0, self.lower - z - self.k)
+        if self.upper > self.h:
+            return {'chart': 'CUSUM', 'statistic': self.upper, 'limit': self.h, 'direction': 'high'}
+        if self.lower > self.h:
+            return {'chart': 'CUSUM', 'statistic': self.lower, 'limit': self.h, 'direction': 'low'}
+        return None
+
+    @staticmethod
+    def _accumulate(steps, start):
+        """
+        Closed form of C_t = max(0, C_{t-1} + s_t) with C_0 = start:
+        C_t = S_t - min(-start, min_{j<=t} S_j), where S is the running sum of s
+        """
+        running = np.cumsum(steps)
+        return running - np.minimum(np.minimum.accumulate(running), -start)
+
+    def replay(self, values):
+        """
+        Vectorized CUSUM over a series, continuing from the current state
+
+        Returns:
+            dict: upper and lower statistics and the alarm array
+        """
+        z = (np.asarray(values, dtype=float) - self.target) / self.sigma
+        upper = self._accumulate(z - self.k, self.upper)
+        lower = self._accumulate(-z - self.k, self.lower)
+        if len(z):
+            self.upper, self.lower = float(upper[-1]), float(lower[-1])
+        return {'upper': upper, 'lower': lower, 'alarm': (upper > self.h) | (lower > self.h)}
+
+class XbarRChart:
+    """X-bar and R charts over consecutive subgroups of fixed size"""
+
+    def __init__(self, target, sigma, subgroup_size=5):
+        d2, D3, D4 = XBAR_R_CONSTANTS[subgroup_size]
+        self.target = target
+        self.n = subgroup_size
+        self.xbar_width = 3 * sigma / np.sqrt(subgroup_size)
+        self.r_center = d2 * sigma
+        self.r_lower, self.r_upper = D3 * self.r_center, D4 * self.r_center
+        self.buffer = np.empty(subgroup_size)
+        self.filled = 0
+
+    def update(self, x):
+        """Add one observation; checks the subgroup once it is complete"""
+        self.buffer[self.filled] = x
+        self.filled += 1
+        if self.filled < self.n:
+            return None
+        self.filled = 0
+        mean = self.buffer.mean()
+        spread = self.buffer.max() - self.buffer.min()
+        if abs(mean - self.target) > self.xbar_width:
+            return {'chart': 'X-bar', 'statistic': mean, 'limit': self.target + np.sign(mean - self.target) * self.xbar_width,
+                    'direction': 'high' if mean > self.target else 'low'}
+        if spread > self.r_upper or spread < self.r_lower:
+            return {'chart': 'R', 'statistic': spread, 'limit': self.r_upper if spread > self.r_upper else self.r_lower,
+                    'direction': 'high' if spread > self.r_upper else 'low'}
+        return None
+
+    def replay(self, values):
+        """
+        Vectorized X-bar/R over a series; a partial subgroup is kept for later updates
+
+        Returns:
+            dict: subgroup means, ranges, limits and alarm arrays (one entry per subgroup)
+        """
+        values = np.concatenate([self.buffer[:self.filled], np.asarray(values, dtype=float)])
+        complete = len(values) // self.n * self.n
+        groups = values[:complete].reshape(-1, self.n)
+        self.filled = len(values) - complete
+        self.buffer[:self.filled] = values[complete:]
+
+        means = groups.mean(axis=1)
+        ranges = groups.max(axis=1) - groups.min(axis=1)
+        xbar_alarm = np.abs(means - self.target) > self.xbar_width
+        r_alarm = (ranges > self.r_upper) | (ranges < self.r_lower)
+        return {'mean': means, 'range': ranges,
+                'xbar_upper': self.target + self.xbar_width, 'xbar_lower': self.target - self.xbar_width,
+                'r_upper': self.r_upper, 'r_lower': self.r_lower,
+                'alarm': xbar_alarm | r_alarm}
+
+class SPCMonitor:
+    """
+    EWMA, CUSUM and X-bar/R charts for one metric on one machine
+
+    Until a baseline is given, the first calibration_size values are used
+    as phase I data: the target is their mean and sigma comes from the
+    average moving range (MR-bar / 1.128).
+    """
+
+    def __init__(self, target=None, sigma=None, calibration_size=30, subgroup_size=5):
+        self.calibration_size = calibration_size
+        self.subgroup_size = subgroup_size
+        self.calibration = np.empty(calibration_size)
+        self.calibrated_count = 0
+        self.charts = None
+        if target is not None and sigma is not None:
+            self.set_baseline(target, sigma)
+
+    def set_baseline(self, target, sigma):
+        """Fix the in-control target and sigma and start the charts"""
+        sigma = max(float(sigma), 1e-9)
+        self.charts = {
+            'ewma': EWMAChart(target, sigma),
+            'cusum': CUSUMChart(target, sigma),
+            'xbar_r': XbarRChart(target, sigma, self.subgroup_size)
+        }
+
+    def calibrate(self, values):
+        """Set the baseline from phase I data"""
+        values = np.asarray(values, dtype=float)
+        sigma = np.mean(np.abs(np.diff(values))) / 1.128 if len(values) > 1 else 0.0
+        self.set_baseline(float(values.mean()), sigma)
+
+    def update(self, x):
+        """Add one observation in O(1); returns a list of alarms"""
+        if self.charts is None:
+            self.calibration[self.calibrated_count] = x
+            self.calibrated_count += 1
+            if self.calibrated_count == self.calibration_size:
+                self.calibrate(self.calibration)
+            return []
+        alarms = [chart.update(x) for chart in self.charts.values()]
+        return [alarm for alarm in alarms if alarm]
+
+    def replay(self, values):
+        """
+        Build every chart for a long series in one vectorized pass
+
+        Returns:
+            dict: Per-chart arrays from each chart's replay, plus 'offset' -
+                  the number of leading values consumed by calibration
+        """
+        values = np.asarray(values, dtype=float)
+        offset = 0
+        if self.charts is None:
+            offset = min(self.calibration_size - self.calibrated_count, len(values))
+            self.calibration[self.calibrated_count:self.calibrated_count + offset] = values[:offset]
+            self.calibrated_count += offset
+            if self.calibrated_count < self.calibration_size:
+                return {'offset': offset}
+            self.calibrate(self.calibration)
+        result = {name: chart.replay(values[offset:]) for name, chart in self.charts.items()}
+        result['offset'] = offset
+        return result
+
+class SPCEngine:
+    """
+    Statistical process control on predicted quality, per machine
+
+    Keeps one SPCMonitor per (machine, metric), each with fixed-size state.
+    Alarm hooks are called with every out-of-control alarm raised by update().
+    """
+
+    METRICS = ['quality_score', 'warpage_percent', 'sinkage_percent']
+
+    def __init__(self, baselines=None, calibration_size=30, subgroup_size=5):
+        self.baselines = baselines or {}
+        self.calibration_size = calibration_size
+        self.subgroup_size = subgroup_size
+        self.monitors = {}
+        self.alarm_hooks = []
+        self.lock = threading.Lock()
+
+    def monitor(self, machine_id, metric):
+        """Get or create the monitor for one machine and metric"""
+        key = (machine_id, metric)
+        if key not in self.monitors:
+            target, sigma = self.baselines.get(metric, (None, None))
+            self.monitors[key] = SPCMonitor(target, sigma, self.calibration_size, self.subgroup_size)
+        return self.monitors[key]
+
+    @staticmethod
+    def metric_values(record):
+        """Pull the monitored metrics out of an analysis record"""
+        return {
+            'quality_score': record['quality_score'],
+            'warpage_percent': record['predictions']['warpage_percent'],
+            'sinkage_percent': record['predictions']['sinkage_percent']
+        }
+
+    def update(self, record, machine_id=None):
+        """
+        Feed one analysis record through every chart for its machine
+
+        Returns:
+            list: Alarm dicts, each tagged with machine_id and metric
+        """
+        machine_id = machine_id or record.get('machine_id', 'default')
+        alarms = []
+        with self.lock:
+            for metric, value in self.metric_values(record).items():
+                for alarm in self.monitor(machine_id, metric).update(value):
+                    alarm.update({'machine_id': machine_id, 'metric': metric, 'value': value,
+                                  'timestamp': record.get('timestamp')})
+                    alarms.append(alarm)
+        for hook in self.alarm_hooks:
+            for alarm in alarms:
+                hook(alarm)
+        return alarms
+
+    def replay(self, machine_id, metric, values):
+        """Vectorized replay of a historical series for one machine and metric"""
+        with self.lock:
+            return self.monitor(machine_id, metric).replay(values)
+
+    def load_history(self, store):
+        """Bring every machine's chart state up to date with the stored history in one pass each"""
+        for machine_id in store.machine_ids():
+            series = store.column_arrays(self.METRICS, machine_id=machine_id)
+            for metric in self.METRICS:
+                self.replay(machine_id, metric, series[metric])
+        return self
+
+if __name__ == "__main__":
+    engine = SPCEngine(baselines={'quality_score': (90.0, 1.0)})
+    rng = np.random.default_rng(1)
+    series = np.r_[rng.normal(90, 1, 200), rng.normal(88, 1, 50)]
+    result = engine.replay('default', 'quality_score', series)
+    for chart in ['ewma', 'cusum']:
+        alarms = np.flatnonzero(result[chart]['alarm'])
+        print(f"{chart.upper()} first alarm at shot {alarms[0] if len(alarms) else 'none'} "
+              f"(shift introduced at shot 200)")
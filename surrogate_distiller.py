@@ -0,0 +1,144 @@
+import json
+import time
+import numpy as np
+from quality_predictor import FEATURE_NAMES
+from optimization_engine import OptimizationEngine
+from surrogate_model import PolynomialSurrogate
+from compact_model import CompactQualityModel
+from config_loader import load_config, parameter_bounds
+
+class SurrogateDistiller:
+    """
+    Distills the trained warpage and sinkage networks into a compact
+    sparse polynomial that controllers can evaluate without sklearn
+    """
+
+    OUTPUTS = ['warpage_percent', 'sinkage_percent']
+
+    def __init__(self, predictor, config=None):
+        self.predictor = predictor
+        self.optimizer = OptimizationEngine()
+        self.lower, self.upper = parameter_bounds(config or load_config())
+        self.center = (self.upper + self.lower) / 2
+        self.half_range = (self.upper - self.lower) / 2
+        self.model = None
+
+    def sample(self, samples, seed=0):
+        """Draw uniform samples over the config.json bounds and label them with the full models"""
+        rng = np.random.default_rng(seed)
+        X = rng.uniform(self.lower, self.upper, size=(samples, len(FEATURE_NAMES)))
+        return X, self.predictor.predict_batch(X)
+
+    def normalize(self, X):
+        """Map raw features onto [-1, 1] using the config bounds"""
+        return (X - self.center) / self.half_range
+
+    def distill(self, samples=40000, degree=3, max_terms=80, seed=0):
+        """
+        Fit a sparse polynomial per output
+
+        A full polynomial of the given degree is fitted first, then only the
+        max_terms monomials with the largest contribution (|coef| x column std)
+        are kept and refitted.
+
+        Returns:
+            dict: Exportable model description
+        """
+        X, targets = self.sample(samples, seed)
+        Z = self.normalize(X)
+
+        outputs = {}
+        for name in self.OUTPUTS:
+            full = PolynomialSurrogate(degree=degree).fit(Z, targets[name])
+            columns = full.design_matrix(Z)
+            importance = np.abs(full.coefficients) * columns.std(axis=0)
+
+            # Keep the intercept plus the most important monomials
+            ranked = np.argsort(importance[1:])[::-1][:max_terms] + 1
+            terms = [()] + sorted((full.terms[i] for i in ranked), key=lambda t: (len(t), t))
+            sparse = PolynomialSurrogate(degree=degree).fit(Z, targets[name], terms=terms)
+
+            outputs[name] = {
+                'intercept': float(sparse.coefficients[0]),
+                'terms': [[list(t), float(c)] for t, c in zip(sparse.terms[1:], sparse.coefficients[1:])]
+            }
+
+        self.model = {
+            'features': FEATURE_NAMES,
+            'center': self.center.tolist(),
+            'half_range': self.half_range.tolist(),
+            'outputs': outputs
+        }
+        return self.model
+
+    def export(self, filename):
+        """Write the distilled model to a compact JSON file"""
+        with open(filename, 'w') as f:
+            json.dump(self.model, f, separators=(',', ':'))
+        return filename
+
+    def evaluate(self, samples=5000, seed=1, timing_rows=200):
+        """
+        Report fidelity and evaluation speed against the full predict
+
+        Returns:
+            dict: Per-output RMSE/max error/R², PASS/FAIL agreement, model size and
+                  per-call latency of the compact evaluator versus predictor.predict
+        """
+        compact = CompactQualityModel(self.model)
+        X, targets = self.sample(samples, seed)
+        approx = [compact.predict_values(row) for row in X.tolist()]
+
+        report = {'samples': samples}
+        for name in self.OUTPUTS:
+            estimate = np.array([a[name] for a in approx])
+            error = estimate - targets[name]
+            report[name] = {
+                'rmse': float(np.sqrt(np.mean(error ** 2))),
+                'max_abs_error': float(np.max(np.abs(error))),
+                'r2': float(1 - np.sum(error ** 2) / np.sum((targets[name] - targets[name].mean()) ** 2))
+            }
+
+        full_pass = self.optimizer.calculate_quality_scores(
+            targets['warpage_percent'], targets['sinkage_percent']
+        )['meets_target']
+        compact_pass = np.array([
+            compact.quality_score(a['warpage_percent'], a['sinkage_percent']) >= self.optimizer.quality_target
+            for a in approx
+        ])
+        report['pass_fail_agreement'] = float(np.mean(full_pass == compact_pass))
+
+        n_coefficients = sum(len(o['terms']) + 1 for o in self.model['outputs'].values())
+        report['coefficients'] = n_coefficients
+        report['file_bytes'] = len(json.dumps(self.model, separators=(',', ':')))
+
+        # Single-shot latency, the way a controller or the UI calls it
+        rows = X[:timing_rows]
+        start = time.perf_counter()
+        for row in rows.tolist():
+            compact.predict_values(row)
+        report['compact_us_per_call'] = (time.perf_counter() - start) / len(rows) * 1e6
+
+        start = time.perf_counter()
+        for row in rows:
+            params = dict(zip(FEATURE_NAMES, row))
+            self.predictor.predict(params, params)
+        report['predict_us_per_call'] = (time.perf_counter() - start) / len(rows) * 1e6
+
+        return report
+
+if __name__ == "__main__":
+    from quality_predictor import MoldingQualityPredictor
+
+    predictor = MoldingQualityPredictor()
+    if not predictor.load_models():
+        predictor.train_models()
+    distiller = SurrogateDistiller(predictor)
+    distiller.distill()
+    distiller.export(f"{predictor.model_path}compact_model.json")
+    report = distiller.evaluate()
+    for name in SurrogateDistiller.OUTPUTS:
+        print(f"{name}: RMSE {report[name]['rmse']:.3f}, R² {report[name]['r2']:.3f}")
+    print(f"PASS/FAIL agreement: {report['pass_fail_agreement']:.1%}")
+    print(f"Model size: {report['coefficients']} coefficients, {report['file_bytes']} bytes")
+    print(f"Latency: {report['compact_us_per_call']:.1f} µs compact vs {report['predict_us_per_call']:.1f} µs predict")
@@ -0,0 +1,97 @@
+import numpy as np
+from itertools import combinations_with_replacement
+
+class PolynomialSurrogate:
+    """
+    Low-order polynomial approximation of the neural network predictions
+    Works on scaled features so the fit stays well conditioned
+    """
+
+    def __init__(self, degree=2, ridge=1e-6):
+        self.degree = degree
+        self.ridge = ridge
+        self.terms = None
+        self.coefficients = None
+        self.quadratic_form = None
+
+    def build_terms(self, n_features):
+        """List every monomial up to the configured degree as a tuple of feature indices"""
+        terms = [()]
+        for d in range(1, self.degree + 1):
+            terms.extend(combinations_with_replacement(range(n_features), d))
+        return terms
+
+    def design_matrix(self, X, terms=None):
+        """Expand a feature matrix into one column per polynomial term"""
+        X = np.asarray(X, dtype=float)
+        terms = self.terms if terms is None else terms
+        columns = np.ones((X.shape[0], len(terms)))
+
+        # Terms are grouped by degree, so each group is one fancy-indexed product
+        start = 0
+        while start < len(terms):
+            degree = len(terms[start])
+            end = start
+            while end < len(terms) and len(terms[end]) == degree:
+                end += 1
+            if degree > 0:
+                columns[:, start:end] = np.prod(X[:, np.array(terms[start:end])], axis=2)
+            start = end
+        return columns
+
+    def fit(self, X, y, terms=None):
+        """
+        Fit the surrogate with ridge-regularized least squares
+
+        Args:
+            X (array): Scaled feature matrix (n, features)
+            y (array): Targets, shape (n,) or (n, outputs)
+            terms (list): Optional subset of monomials, intercept () first; defaults to all up to degree
+        """
+        X = np.asarray(X, dtype=float)
+        self.terms = self.build_terms(X.shape[1]) if terms is None else list(terms)
+        A = self.design_matrix(X)
+
+        # Normal equations with a small ridge term, intercept left unpenalized
+        penalty = self.ridge * np.eye(A.shape[1])
+        penalty[0, 0] = 0
+        self.coefficients = np.linalg.solve(A.T @ A + penalty, A.T @ np.asarray(y, dtype=float))
+        self.quadratic_form = self.compile_quadratic(X.shape[1]) if self.degree <= 2 else None
+        return self
+
+    def compile_quadratic(self, n_features):
+        """
+        Rewrite degree <= 2 coefficients as intercept + X @ linear + x' Q x
+
+        Evaluating two small matrix products is several times cheaper than
+        expanding the design matrix for every batch.
+        """
+        coefficients = self.coefficients.reshape(len(self.terms), -1)
+        outputs = coefficients.shape[1]
+        intercept = np.zeros(outputs)
+        linear = np.zeros((n_features, outputs))
+        quadratic = np.zeros((n_features, n_features, outputs))
+        for term, coef in zip(self.terms, coefficients):
+            if len(term) == 0:
+                intercept += coef
+            elif len(term) == 1:
+                linear[term[0]] += coef
+            else:
+                quadratic[term[0], term[1]] += coef
+        return intercept, linear, quadratic
+
+    def predict(self, X):
+        """Evaluate the surrogate on a scaled feature matrix"""
+        if self.quadratic_form is None:
+            return self.design_matrix(X) @ self.coefficients
+
+        X = np.asarray(X, dtype=float)
+        intercept, linear, quadratic = self.quadratic_form
+        n_features, outputs = linear.shape
+        # (X @ Q_k) * X summed over features gives x' Q_k x for every output k
+        XQ = (X @ quadratic.reshape(n_features, -1)).reshape(len(X), n_features, outputs)
+        result = intercept + X @ linear + np.einsum('nfo,nf->no', XQ, X)
+        return result.reshape(len(X), *self.coefficients.shape[1:])
+
+if __name__ == "__main__":
+    print("Polynomial Surrogate Ready!")
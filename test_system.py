@@ -1,277 +1,1617 @@
-#!/usr/bin/env python3
-"""
-Test script for Injection Molding Quality Checker
-Tests all components and validates functionality
-"""
-
-import sys
-import os
-
-def test_imports():
-    """Test if all required modules can be imported"""
-    print("\n" + "="*60)
-    print("TEST 1: Checking Required Libraries")
-    print("="*60)
-    
-    required_modules = [
-        'streamlit',
-        'pandas',
-        'numpy',
-        'sklearn',
-        'matplotlib',
-        'plotly',
-        'tensorflow',
-        'joblib'
-    ]
-    
-    missing_modules = []
-    for module in required_modules:
-        try:
-            __import__(module)
-            print(f"✅ {module}")
-        except ImportError:
-            print(f"❌ {module}")
-            missing_modules.append(module)
-    
-    if missing_modules:
-        print(f"\n⚠️  Missing modules: {', '.join(missing_modules)}")
-        print("Install with: pip install -r requirements.txt")
-        return False
-    
-    print("\n✅ All required libraries are installed!")
-    return True
-
-def test_quality_predictor():
-    """Test the quality predictor module"""
-    print("\n" + "="*60)
-    print("TEST 2: Quality Predictor Module")
-    print("="*60)
-    
-    try:
-        from quality_predictor import MoldingQualityPredictor
-        print("✅ Successfully imported MoldingQualityPredictor")
-        
-        # Create predictor instance
-        predictor = MoldingQualityPredictor()
-        print("✅ Created predictor instance")
-        
-        # Train models
-        print("\n🧠 Training models (this may take 30-60 seconds)...")
-        predictor.train_models()
-        print("✅ Models trained successfully")
-        
-        # Test prediction
-        process_params = {
-            'melt_temp': 230,
-            'mold_temp': 50,
-            'injection_pressure': 75,
-            'holding_pressure': 65,
-            'holding_time': 15,
-            'cooling_time': 35
-        }
-        
-        geometry_params = {
-            'wall_thickness': 2.5,
-            'part_volume': 80,
-            'aspect_ratio': 1.5
-        }
-        
-        predictions = predictor.predict(process_params, geometry_params)
-        print("\n✅ Made predictions successfully")
-        print(f"   Warpage: {predictions['warpage_percent']:.2f}%")
-        print(f"   Sinkage: {predictions['sinkage_percent']:.2f}%")
-        
-        return True
-    
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
-
-def test_optimization_engine():
-    """Test the optimization engine module"""
-    print("\n" + "="*60)
-    print("TEST 3: Optimization Engine")
-    print("="*60)
-    
-    try:
-        from optimization_engine import OptimizationEngine
-        print("✅ Successfully imported OptimizationEngine")
-        
-        # Create engine instance
-        optimizer = OptimizationEngine()
-        print("✅ Created optimizer instance")
-        
-        # Test quality score calculation
-        quality_data = optimizer.calculate_quality_score(
-            warpage=6.9,
-            sinkage=0.99
-        )
-        print(f"\n✅ Calculated quality score: {quality_data['overall_quality']:.1f}%")
-        print(f"   Meets target (>95%): {quality_data['meets_target']}")
-        
-        # Test rating
-        rating, color = optimizer.get_quality_rating(quality_data['overall_quality'])
-        print(f"   Rating: {rating}")
-        
-        # Test suggestions
-        process_params = {
-            'melt_temp': 245,
-            'mold_temp': 40,
-            'injection_pressure': 60,
-            'holding_pressure': 55,
-            'holding_time': 8,
-            'cooling_time': 25
-        }
-        
-        geometry_params = {
-            'wall_thickness': 3.5,
-            'part_volume': 100,
-            'aspect_ratio': 2.0
-        }
-        
-        predictions = {'warpage_percent': 8.5, 'sinkage_percent': 4.2}
-        
-        suggestions = optimizer.generate_suggestions(
-            process_params, geometry_params, predictions
-        )
-        
-        print(f"\n✅ Generated {suggestions['suggestion_count']} optimization suggestions")
-        if suggestions['suggestion_count'] > 0:
-            print("   Suggestions:")
-            for i, sugg in enumerate(suggestions['suggestions'][:3], 1):
-                print(f"   {i}. {sugg['parameter']}: {sugg['issue']}")
-        
-        return True
-    
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
-
-def test_report_generator():
-    """Test the report generator module"""
-    print("\n" + "="*60)
-    print("TEST 4: Report Generator")
-    print("="*60)
-    
-    try:
-        from report_generator import QualityReport
-        print("✅ Successfully imported QualityReport")
-        
-        # Create test data
-        test_analysis = {
-            'process_params': {
-                'melt_temp': 230,
-                'mold_temp': 50,
-                'injection_pressure': 75,
-                'holding_pressure': 65,
-                'holding_time': 15,
-                'cooling_time': 35
-            },
-            'geometry_params': {
-                'wall_thickness': 2.5,
-                'part_volume': 80,
-                'aspect_ratio': 1.5
-            },
-            'predictions': {
-                'warpage_percent': 6.9,
-                'sinkage_percent': 0.99
-            },
-            'quality_score': 95.5
-        }
-        
-        # Generate text report
-        text_report = QualityReport.generate_text_report(test_analysis)
-        print("✅ Generated text report successfully")
-        print("\nSample Report Output:")
-        print(text_report[:300] + "...\n")
-        
-        # Generate JSON report
-        json_report = QualityReport.generate_report(test_analysis)
-        print("✅ Generated JSON report successfully")
-        print(f"   Quality Score: {json_report['quality_score']}%")
-        print(f"   Status: {json_report['status']}")
-        
-        return True
-    
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
-
-def test_configuration():
-    """Test configuration file"""
-    print("\n" + "="*60)
-    print("TEST 5: Configuration")
-    print("="*60)
-    
-    try:
-        import json
-        
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-        
-        print("✅ Successfully loaded config.json")
-        print(f"   App: {config['app_name']} v{config['version']}")
-        print(f"   Optimal Melt Temp: {config['process_parameters']['melt_temperature']['optimal_range']}")
-        print(f"   Quality Target Score: {config['quality_targets']['overall_quality_score']['target']}%")
-        
-        return True
-    
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
-
-def main():
-    """Run all tests"""
-    print("\n" + "█"*60)
-    print("█" + " "*58 + "█")
-    print("█" + "  INJECTION MOLDING QUALITY CHECKER - TEST SUITE".center(58) + "█")
-    print("█" + " "*58 + "█")
-    print("█"*60 + "\n")
-    
-    tests = [
-        ("Imports", test_imports),
-        ("Quality Predictor", test_quality_predictor),
-        ("Optimization Engine", test_optimization_engine),
-        ("Report Generator", test_report_generator),
-        ("Configuration", test_configuration)
-    ]
-    
-    results = []
-    
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"\n❌ Unexpected error in {test_name}: {str(e)}")
-            results.append((test_name, False))
-    
-    # Summary
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
-    
-    for test_name, result in results:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{test_name:.<40} {status}")
-    
-    print("\n" + "-"*60)
-    print(f"Total: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("\n🎉 All tests passed! Application is ready to use.")
-        print("\nTo start the application, run:")
-        print("  Windows: run.bat")
-        print("  Linux/Mac: ./run.sh")
-        print("  Or: streamlit run app.py")
-        return 0
-    else:
-        print(f"\n⚠️  {total - passed} test(s) failed. Please fix the issues above.")
-        print("Install dependencies with: pip install -r requirements.txt")
-        return 1
-
-if __name__ == "__main__":
-    sys.exit(main())
+#!/usr/bin/env python3
+"""
+Test script for Injection Molding Quality Checker
+Tests all components and validates functionality
+"""
+
+import sys
+import os
+
+def test_imports():
+    """Test if all required modules can be imported"""
+    print("\n" + "="*60)
+    print("TEST 1: Checking Required Libraries")
+    print("="*60)
+    
+    required_modules = [
+        'streamlit',
+        'pandas',
+        'numpy',
+        'sklearn',
+        'matplotlib',
+        'plotly',
+        'tensorflow',
+        'joblib'
+    ]
+    
+    missing_modules = []
+    for module in required_modules:
+        try:
+            __import__(module)
+            print(f"✅ {module}")
+        except ImportError:
+            print(f"❌ {module}")
+            missing_modules.append(module)
+    
+    if missing_modules:
+        print(f"\n⚠️  Missing modules: {', '.join(missing_modules)}")
+        print("Install with: pip install -r requirements.txt")
+        return False
+    
+    print("\n✅ All required libraries are installed!")
+    return True
+
+def test_quality_predictor():
+    """Test the quality predictor module"""
+    print("\n" + "="*60)
+    print("TEST 2: Quality Predictor Module")
+    print("="*60)
+    
+    try:
+        from quality_predictor import MoldingQualityPredictor
+        print("✅ Successfully imported MoldingQualityPredictor")
+        
+        # Create predictor instance
+        predictor = MoldingQualityPredictor()
+        print("✅ Created predictor instance")
+        
+        # Train models
+        print("\n🧠 Training models (this may take 30-60 seconds)...")
+        predictor.train_models()
+        print("✅ Models trained successfully")
+        
+        # Test prediction
+        process_params = {
+            'melt_temp': 230,
+            'mold_temp': 50,
+            'part_temp': 60,
+            'injection_pressure': 75,
+            'holding_pressure': 65,
+            'holding_time': 15,
+            'cooling_time': 35
+        }
+        
+        geometry_params = {
+            'wall_thickness': 2.5,
+            'part_volume': 80,
+            'aspect_ratio': 1.5,
+            'time_to_fill': 8
+        }
+        
+        predictions = predictor.predict(process_params, geometry_params)
+        print("\n✅ Made predictions successfully")
+        print(f"   Warpage: {predictions['warpage_percent']:.2f}%")
+        print(f"   Sinkage: {predictions['sinkage_percent']:.2f}%")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_optimization_engine():
+    """Test the optimization engine module"""
+    print("\n" + "="*60)
+    print("TEST 3: Optimization Engine")
+    print("="*60)
+    
+    try:
+        from optimization_engine import OptimizationEngine
+        print("✅ Successfully imported OptimizationEngine")
+        
+        # Create engine instance
+        optimizer = OptimizationEngine()
+        print("✅ Created optimizer instance")
+        
+        # Test quality score calculation
+        quality_data = optimizer.calculate_quality_score(
+            warpage=6.9,
+            sinkage=0.99
+        )
+        print(f"\n✅ Calculated quality score: {quality_data['overall_quality']:.1f}%")
+        print(f"   Meets target (>95%): {quality_data['meets_target']}")
+        
+        # Test rating
+        rating, color = optimizer.get_quality_rating(quality_data['overall_quality'])
+        print(f"   Rating: {rating}")
+        
+        # Test suggestions
+        process_params = {
+            'melt_temp': 245,
+            'mold_temp': 40,
+            'injection_pressure': 60,
+            'holding_pressure': 55,
+            'holding_time': 8,
+            'cooling_time': 25
+        }
+        
+        geometry_params = {
+            'wall_thickness': 3.5,
+            'part_volume': 100,
+            'aspect_ratio': 2.0
+        }
+        
+        predictions = {'warpage_percent': 8.5, 'sinkage_percent': 4.2}
+        
+        suggestions = optimizer.generate_suggestions(
+            process_params, geometry_params, predictions
+        )
+        
+        print(f"\n✅ Generated {suggestions['suggestion_count']} optimization suggestions")
+        if suggestions['suggestion_count'] > 0:
+            print("   Suggestions:")
+            for i, sugg in enumerate(suggestions['suggestions'][:3], 1):
+                print(f"   {i}. {sugg['parameter']}: {sugg['issue']}")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_report_generator():
+    """Test the report generator module"""
+    print("\n" + "="*60)
+    print("TEST 4: Report Generator")
+    print("="*60)
+    
+    try:
+        from report_generator import QualityReport
+        print("✅ Successfully imported QualityReport")
+        
+        # Create test data
+        test_analysis = {
+            'process_params': {
+                'melt_temp': 230,
+                'mold_temp': 50,
+                'part_temp': 60,
+                'injection_pressure': 75,
+                'holding_pressure': 65,
+                'holding_time': 15,
+                'cooling_time': 35
+            },
+            'geometry_params': {
+                'wall_thickness': 2.5,
+                'part_volume': 80,
+                'aspect_ratio': 1.5,
+                'time_to_fill': 8
+            },
+            'predictions': {
+                'warpage_percent': 6.9,
+                'sinkage_percent': 0.99
+            },
+            'quality_score': 95.5
+        }
+        
+        # Generate text report
+        text_report = QualityReport.generate_text_report(test_analysis)
+        print("✅ Generated text report successfully")
+        print("\nSample Report Output:")
+        print(text_report[:300] + "...\n")
+        
+        # Generate JSON report
+        json_report = QualityReport.generate_report(test_analysis)
+        print("✅ Generated JSON report successfully")
+        print(f"   Quality Score: {json_report['quality_score']}%")
+        print(f"   Status: {json_report['status']}")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_configuration():
+    """Test configuration file"""
+    print("\n" + "="*60)
+    print("TEST 5: Configuration")
+    print("="*60)
+    
+    try:
+        import json
+        
+        with open('config.json', 'r') as f:
+            config = json.load(f)
+        
+        print("✅ Successfully loaded config.json")
+        print(f"   App: {config['app_name']} v{config['version']}")
+        print(f"   Optimal Melt Temp: {config['process_parameters']['melt_temperature']['optimal_range']}")
+        print(f"   Quality Target Score: {config['quality_targets']['overall_quality_score']['target']}%")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_cascade_predictor():
+    """Test the surrogate-first cascade predictor"""
+    print("\n" + "="*60)
+    print("TEST 6: Cascade Predictor")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from cascade_predictor import CascadePredictor
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        predictor.train_models()
+        
+        cascade = CascadePredictor(predictor)
+        report = cascade.fit(samples=3000)
+        print(f"✅ Calibrated margin: {report['margin']:.2f} points")
+        
+        if report['validation_disagreements'] != 0:
+            print(f"❌ {report['validation_disagreements']} PASS/FAIL disagreements on validation")
+            return False
+        
+        X, _, _ = predictor.generate_training_data(samples=1000, seed=3)
+        result = cascade.predict_batch(X)
+        print(f"✅ Scored {len(X)} shots, {cascade.escalation_rate:.1%} escalated to the full models")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_surrogate_distiller():
+    """Test distillation into the dependency-free compact model"""
+    print("\n" + "="*60)
+    print("TEST 7: Surrogate Distiller")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from surrogate_distiller import SurrogateDistiller
+        from compact_model import CompactQualityModel
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        predictor.train_models()
+        
+        distiller = SurrogateDistiller(predictor)
+        distiller.distill(samples=10000)
+        filename = distiller.export(f"{predictor.model_path}compact_model.json")
+        print(f"✅ Exported compact model ({os.path.getsize(filename)} bytes)")
+        
+        compact = CompactQualityModel.load(filename)
+        process_params = {
+            'melt_temp': 230, 'mold_temp': 50, 'part_temp': 60, 'injection_pressure': 75,
+            'holding_pressure': 65, 'holding_time': 15, 'cooling_time': 35
+        }
+        geometry_params = {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8}
+        approx = compact.predict(process_params, geometry_params)
+        full = predictor.predict(process_params, geometry_params)
+        print(f"   Warpage: {approx['warpage_percent']:.2f}% compact vs {full['warpage_percent']:.2f}% full")
+        
+        report = distiller.evaluate(samples=2000)
+        print(f"✅ PASS/FAIL agreement: {report['pass_fail_agreement']:.1%}")
+        if report['warpage_percent']['r2'] < 0.8 or report['sinkage_percent']['r2'] < 0.8:
+            print("❌ Compact model fidelity too low")
+            return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_hyperparameter_search():
+    """Test the successive-halving hyperparameter search"""
+    print("\n" + "="*60)
+    print("TEST 8: Hyperparameter Search")
+    print("="*60)
+    
+    try:
+        from quality_predictor import MoldingQualityPredictor
+        from hyperparameter_search import HyperparameterSearch
+        
+        X, y_warpage, y_sinkage = MoldingQualityPredictor().generate_training_data(samples=300)
+        
+        search = HyperparameterSearch(
+            param_grid={'hidden_layer_sizes': [(16,), (32, 16)], 'alpha': [1e-4, 1e-2]},
+            n_folds=2, min_iter=20, max_iter=60, n_jobs=2
+        )
+        results = search.search(X, {'warpage': y_warpage, 'sinkage': y_sinkage})
+        print(f"✅ Evaluated {len(results['warpage'])} configurations per target")
+        
+        for target in HyperparameterSearch.TARGETS:
+            selected = search.select(target)
+            print(f"   {target}: {selected['params']} (RMSE {selected['cv_rmse']:.3f})")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_warm_start_retraining():
+    """Test warm-start retraining from the saved models"""
+    print("\n" + "="*60)
+    print("TEST 9: Warm-Start Retraining")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        predictor.train_models()
+        
+        X, y_warpage, y_sinkage = predictor.generate_training_data(samples=600, seed=5)
+        report = predictor.retrain_models(X, y_warpage, y_sinkage, compare_cold=True)
+        
+        for target, result in report.items():
+            print(f"✅ {target}: {result['warm_iterations']} warm vs {result['cold_iterations']} cold iterations, "
+                  f"kept {result['selected']} model, refit on all rows in {result['refit_iterations']} iterations")
+            if result[f"{result['selected']}_rmse"] > result['cold_rmse']:
+                print("❌ Retrained model is less accurate than a cold retrain")
+                return False
+        
+        # Default: warm start only, on every row
+        report = predictor.retrain_models(X, y_warpage, y_sinkage)
+        if any('cold_iterations' in result for result in report.values()):
+            print("❌ Cold comparison should be opt-in")
+            return False
+        print(f"✅ Warm-only retrain: " + ", ".join(f"{target} {result['warm_iterations']} iterations"
+                                                    for target, result in report.items()))
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_model_readiness():
+    """Test the load warm-up and readiness check"""
+    print("\n" + "="*60)
+    print("TEST 10: Model Readiness")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        predictor = MoldingQualityPredictor(model_path=model_path)
+        if predictor.load_models():
+            print("❌ Loading from an empty directory should fail")
+            return False
+        print(f"✅ Missing models reported: {predictor.load_error}")
+        
+        predictor.train_models()
+        
+        loaded = MoldingQualityPredictor(model_path=model_path)
+        if not loaded.load_models() or not loaded.ready:
+            print(f"❌ Readiness check failed: {loaded.load_error}")
+            return False
+        print(f"✅ Ready: cold {loaded.readiness['cold_latency_ms']:.2f} ms, "
+              f"warm {loaded.readiness['warm_latency_ms']:.2f} ms")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_history_store():
+    """Test the persistent SQLite history store"""
+    print("\n" + "="*60)
+    print("TEST 11: History Store")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from history_store import HistoryStore
+        
+        store = HistoryStore(os.path.join(tempfile.mkdtemp(), "history.db"), batch_size=10)
+        records = [{
+            'timestamp': f"2026-02-{day:02d} 08:00:00",
+            'process_params': {
+                'melt_temp': 230, 'mold_temp': 50, 'part_temp': 60, 'injection_pressure': 75,
+                'holding_pressure': 65, 'holding_time': 15, 'cooling_time': 35
+            },
+            'geometry_params': {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8},
+            'predictions': {'warpage_percent': 1.0 + day / 10, 'sinkage_percent': 0.5},
+            'quality_score': 90.0 + day / 10
+        } for day in range(1, 29)]
+        
+        store.append_many(records[:20])
+        for record in records[20:]:
+            store.append(record)
+        print(f"✅ Stored {store.count()} records")
+        
+        page = store.query(limit=5, offset=5)
+        in_range = store.count("2026-02-10 00:00:00", "2026-02-14 23:59:59")
+        print(f"✅ Page of {len(page)} records, {in_range} in a 5-day range")
+        if store.count() != 28 or in_range != 5 or page[0]['timestamp'] != "2026-02-23 08:00:00":
+            print("❌ Unexpected query results")
+            return False
+        store.close()
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_history_aggregates():
+    """Test incremental history aggregates and LTTB downsampling"""
+    print("\n" + "="*60)
+    print("TEST 12: History Aggregates")
+    print("="*60)
+    
+    try:
+        import numpy as np
+        from history_aggregates import HistoryAggregates, TrendSeries, lttb
+        
+        rng = np.random.default_rng(0)
+        scores = rng.uniform(80, 100, 20000)
+        aggregates = HistoryAggregates(trend_capacity=4096)
+        for i, score in enumerate(scores, 1):
+            aggregates.update(i, score, 2.0, 1.0)
+        
+        summary = aggregates.summary()
+        print(f"✅ {summary['count']} analyses, pass rate {summary['pass_rate']:.1%}, "
+              f"mean {summary['quality_score']['mean']:.2f}")
+        if abs(summary['quality_score']['mean'] - scores.mean()) > 1e-6 or \
+                abs(summary['pass_rate'] - np.mean(scores >= 95)) > 1e-12:
+            print("❌ Aggregates differ from a full recomputation")
+            return False
+        
+        x, y = aggregates.trend.points(max_points=1000)
+        print(f"✅ Trend kept {aggregates.trend.size} points, plotted {len(x)}")
+        if len(x) > 1000 or aggregates.trend.size > 4096:
+            print("❌ Trend series exceeds its bounds")
+            return False
+        
+        # After many compactions the oldest analyses are kept as densely as the newest, spikes included
+        trend = TrendSeries(capacity=256)
+        values = rng.uniform(80, 100, 20000)
+        values[100] = 0
+        for i, value in enumerate(values, 1):
+            trend.append(i, value)
+        x, y = trend.points(max_points=10 ** 6)
+        halves = np.histogram(x, bins=2, range=(1, 20000))[0]
+        if len(x) > 256 or halves.min() < 0.8 * halves.max() or y.min() != 0:
+            print(f"❌ Trend density is uneven ({halves[0]} old vs {halves[1]} new points) or the spike was lost")
+            return False
+        print(f"✅ Trend keeps {halves[0]} points for the older half and {halves[1]} for the newer, spike kept")
+        
+        _, kept = lttb(np.arange(5000), np.r_[np.zeros(2500), 50, np.zeros(2499)], 100)
+        if kept.max() != 50:
+            print("❌ LTTB dropped the peak")
+            return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_spc_engine():
+    """Test streaming and vectorized SPC charts"""
+    print("\n" + "="*60)
+    print("TEST 13: SPC Engine")
+    print("="*60)
+    
+    try:
+        import numpy as np
+        from spc_engine import SPCEngine, SPCMonitor
+        
+        rng = np.random.default_rng(1)
+        series = np.r_[rng.normal(90, 1, 300), rng.normal(88, 1, 100)]
+        
+        # Streaming and replay must agree shot for shot
+        streamed, replayed = SPCMonitor(), SPCMonitor()
+        result = replayed.replay(series)
+        ewma = []
+        for value in series:
+            charting = streamed.charts is not None
+            streamed.update(value)
+            if charting:
+                ewma.append(streamed.charts['ewma'].z)
+        if np.max(np.abs(np.array(ewma) - result['ewma']['statistic'])) > 1e-9:
+            print("❌ Streaming and replayed EWMA differ")
+            return False
+        print("✅ Streaming and vectorized replay agree")
+        
+        engine = SPCEngine(baselines={'quality_score': (90.0, 1.0), 'warpage_percent': (1.0, 0.2),
+                                      'sinkage_percent': (0.5, 0.1)})
+        first_alarm = None
+        for shot, value in enumerate(series):
+            record = {'quality_score': value, 'predictions': {'warpage_percent': 1.0, 'sinkage_percent': 0.5}}
+            alarms = engine.update(record, machine_id='press-1')
+            # The R chart can false-alarm in control; the mean-shift charts should not
+            if first_alarm is None and any(alarm['chart'] in ('EWMA', 'CUSUM') for alarm in alarms):
+                first_alarm = shot
+        print(f"✅ First EWMA/CUSUM alarm at shot {first_alarm} (shift at shot 300)")
+        if first_alarm is None or first_alarm < 300:
+            print("❌ Shift not detected, or false alarm before it")
+            return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_drift_monitor():
+    """Test extrapolation flags and streaming drift scores"""
+    print("\n" + "="*60)
+    print("TEST 14: Drift Monitor")
+    print("="*60)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        MoldingQualityPredictor(model_path=model_path).train_models()
+        predictor = MoldingQualityPredictor(model_path=model_path)
+        predictor.load_models()
+        
+        process = {'melt_temp': 230, 'mold_temp': 50, 'part_temp': 60, 'injection_pressure': 80,
+                   'holding_pressure': 50, 'holding_time': 15, 'cooling_time': 30}
+        geometry = {'wall_thickness': 2.5, 'part_volume': 100, 'aspect_ratio': 1.5, 'time_to_fill': 8}
+        if predictor.predict(process, geometry)['extrapolated']:
+            print("❌ In-range inputs flagged as extrapolated")
+            return False
+        result = predictor.predict(dict(process, melt_temp=280), geometry)
+        if result['out_of_range'] != ['melt_temp']:
+            print(f"❌ Expected melt_temp out of range, got {result['out_of_range']}")
+            return False
+        print("✅ Extrapolated inputs flagged in predict output")
+        
+        X, _, _ = predictor.generate_training_data(samples=2000, seed=5)
+        stable = predictor.drift_monitor()
+        for row in X[:200]:
+            stable.update(row)
+        stable.update_batch(X[200:])
+        if not np.allclose(stable.mean, X.mean(axis=0)) or not np.allclose(stable.std, X.std(axis=0, ddof=1)):
+            print("❌ Streaming statistics differ from the batch statistics")
+            return False
+        
+        shifted = predictor.drift_monitor()
+        shifted.update_batch(X + np.r_[40, np.zeros(10)])
+        stable_psi = stable.report()['melt_temp']['psi']
+        shifted_report = shifted.report()['melt_temp']
+        print(f"✅ Melt temp PSI {stable_psi:.3f} in distribution, {shifted_report['psi']:.3f} shifted")
+        if any(stats['drifted'] for stats in stable.report().values()) or not shifted_report['drifted']:
+            print("❌ Drift flags wrong")
+            return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_bulk_reports():
+    """Test streaming report writers and per-shift summaries"""
+    print("\n" + "="*60)
+    print("TEST 15: Bulk Reports")
+    print("="*60)
+    
+    try:
+        import json
+        import tempfile
+        import numpy as np
+        from history_store import HistoryStore
+        from report_generator import QualityReport, SHIFT_HEADER
+        
+        directory = tempfile.mkdtemp()
+        store = HistoryStore(os.path.join(directory, "history.db"))
+        store.append_many([{
+            'timestamp': f"2026-03-01 {hour:02d}:{minute:02d}:00",
+            'process_params': {
+                'melt_temp': 230, 'mold_temp': 50, 'part_temp': 60, 'injection_pressure': 75,
+                'holding_pressure': 65, 'holding_time': 15, 'cooling_time': 35
+            },
+            'geometry_params': {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8},
+            'predictions': {'warpage_percent': 1.0, 'sinkage_percent': 0.5},
+            'quality_score': 90.0 + hour / 2
+        } for hour in range(24) for minute in range(0, 60, 10)])
+        
+        filename = os.path.join(directory, "shots.jsonl")
+        written = QualityReport.stream_jsonl(store.iter_records(chunk_size=50), filename)
+        with open(filename, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        print(f"✅ Streamed {written} records to JSON Lines")
+        if written != 144 or len(rows) != 144 or rows[-1]['quality_score'] != 101.5:
+            print("❌ JSON Lines output incomplete")
+            return False
+        
+        # CSV export of a date range, in chunks smaller than the range, with numbers left numeric
+        import io
+        import csv
+        buffer = io.StringIO()
+        exported = QualityReport.stream_csv(
+            store.iter_records("2026-03-01 06:00:00", "2026-03-01 23:59:59", chunk_size=25), buffer
+        )
+        csv_rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+        if exported != 108 or len(csv_rows) != 108 or float(csv_rows[0]['quality_score']) != 93.0 or \
+                csv_rows[0]['warpage_percent'] != '1.0':
+            print("❌ CSV export incomplete or not numeric")
+            return False
+        print(f"✅ Exported {exported} records in range to CSV across several chunks")
+        
+        columns = store.column_arrays(['timestamp', 'quality_score', 'warpage_percent', 'sinkage_percent'])
+        shifts = QualityReport.shift_summary(
+            columns['timestamp'], columns['quality_score'],
+            columns['warpage_percent'], columns['sinkage_percent']
+        )
+        print(QualityReport.generate_shift_report(shifts))
+        # Shifts start at 06:00, so midnight-05:59 belongs to the previous day's night shift
+        if list(shifts['count']) != [36, 48, 48, 12] or not np.isclose(shifts['pass_rate'][1], 0.5):
+            print("❌ Unexpected shift grouping")
+            return False
+        print("✅ Shift summary computed")
+        
+        empty = store.column_arrays(['timestamp', 'quality_score', 'warpage_percent', 'sinkage_percent'],
+                                    "2000-01-01 00:00:00", "2000-01-01 23:59:59")
+        shifts = QualityReport.shift_summary(
+            empty['timestamp'], empty['quality_score'], empty['warpage_percent'], empty['sinkage_percent']
+        )
+        if any(len(values) for values in shifts.values()) or QualityReport.generate_shift_report(shifts) != SHIFT_HEADER:
+            print("❌ Empty range did not give an empty shift summary")
+            return False
+        print("✅ Empty date range gives an empty shift summary")
+        store.close()
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_input_validation():
+    """Test vectorized input validation against config.json"""
+    print("\n" + "="*60)
+    print("TEST 16: Input Validation")
+    print("="*60)
+    
+    try:
+        import numpy as np
+        from input_validator import InputValidator
+        from quality_predictor import MoldingQualityPredictor
+        
+        validator = InputValidator()
+        X = np.tile(validator.defaults, (5, 1))
+        X[1, 0] = 300          # melt_temp above 280
+        X[2, 7] = 0.1          # wall_thickness below 0.5
+        X[3, 10] = np.nan      # time_to_fill missing
+        
+        result = validator.validate(X, mode='reject')
+        if list(result['rows']) != [0, 4] or not result['above'][1, 0] or not result['missing'][3, 10]:
+            print("❌ Wrong violation masks")
+            return False
+        print(f"✅ Rejected rows {list(np.flatnonzero(~result['valid']))}: {validator.describe(result, 1)}")
+        
+        clipped = validator.validate(X, mode='clip')
+        if clipped['X'][1, 0] != 280 or clipped['X'][2, 7] != 0.5 or clipped['X'][3, 10] != validator.defaults[10]:
+            print("❌ Clipping did not repair the bad values")
+            return False
+        print("✅ Bad values clipped or filled with defaults")
+        
+        try:
+            MoldingQualityPredictor().predict({'melt_temp': 230}, {})
+            print("❌ Missing parameters were not reported")
+            return False
+        except ValueError as e:
+            print(f"✅ Clear error for missing parameters: {str(e)[:60]}...")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_benchmark_suite():
+    """Test the performance benchmark suite and baseline comparison"""
+    print("\n" + "="*60)
+    print("TEST 17: Benchmark Suite")
+    print("="*60)
+    
+    try:
+        import copy
+        import tempfile
+        from benchmark_suite import BenchmarkSuite, save_results, load_results, compare
+        
+        results = BenchmarkSuite(quick=True).run()
+        benchmarks = results['benchmarks']
+        print(f"✅ {len(benchmarks)} metrics: predict p50 {benchmarks['predict_latency_p50_ms']['value']:.3f} ms, "
+              f"train {benchmarks['train_models_s']['value']:.2f} s")
+        
+        filename = save_results(results, os.path.join(tempfile.mkdtemp(), "baseline.json"))
+        baseline = load_results(filename)
+        if any(row['regression'] for row in compare(results, baseline)):
+            print("❌ Identical runs reported as a regression")
+            return False
+        
+        slower = copy.deepcopy(results)
+        slower['benchmarks']['predict_latency_p50_ms']['value'] *= 1.5
+        slower['benchmarks']['predict_batch_100_rows_per_s']['value'] /= 1.5
+        flagged = sorted(row['metric'] for row in compare(slower, baseline, threshold=0.10) if row['regression'])
+        if flagged != ['predict_batch_100_rows_per_s', 'predict_latency_p50_ms']:
+            print(f"❌ Expected two regressions, got {flagged}")
+            return False
+        print(f"✅ Regressions flagged: {flagged}")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_instrumentation():
+    """Test opt-in timers, counters and metrics export"""
+    print("\n" + "="*60)
+    print("TEST 18: Instrumentation")
+    print("="*60)
+    
+    import instrumentation
+    from instrumentation import METRICS
+    try:
+        import json
+        import tempfile
+        import urllib.request
+        from quality_predictor import MoldingQualityPredictor
+        from optimization_engine import OptimizationEngine
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        MoldingQualityPredictor(model_path=model_path).train_models()
+        
+        METRICS.reset()
+        instrumentation.enable()
+        predictor = MoldingQualityPredictor(model_path=model_path)
+        predictor.load_models()
+        process = {'melt_temp': 230, 'mold_temp': 50, 'part_temp': 60, 'injection_pressure': 75,
+                   'holding_pressure': 65, 'holding_time': 15, 'cooling_time': 35}
+        geometry = {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8}
+        for _ in range(50):
+            predictions = predictor.predict(process, geometry)
+        optimizer = OptimizationEngine()
+        optimizer.generate_suggestions(process, geometry, predictions)
+        
+        snapshot = METRICS.to_dict()
+        expected = ['generate_suggestions', 'load_models', 'predict', 'predict_features', 'predict_scaling',
+                    'predict_sinkage_forward', 'predict_warpage_forward']
+        missing = [name for name in expected if name not in snapshot['timers']]
+        if missing or snapshot['counters'].get('predictions', 0) < 50:
+            print(f"❌ Missing metrics: {missing}")
+            return False
+        print(f"✅ {len(snapshot['timers'])} timers, predict p50 ≤ {snapshot['timers']['predict']['p50_seconds'] * 1000:.2f} ms")
+        
+        filename = METRICS.write_json(os.path.join(tempfile.mkdtemp(), "metrics.json"))
+        with open(filename, encoding='utf-8') as f:
+            json.load(f)
+        server = METRICS.serve(port=0)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        text = urllib.request.urlopen(url, timeout=5).read().decode('utf-8')
+        if f"molding_predict_seconds_count {METRICS.histograms['predict'].count}" not in text:
+            print("❌ Prometheus endpoint missing the predict histogram")
+            return False
+        print("✅ Exported as JSON file and Prometheus text endpoint")
+        
+        instrumentation.disable()
+        if OptimizationEngine.generate_suggestions.__name__ != 'generate_suggestions' or \
+                hasattr(OptimizationEngine.generate_suggestions, '__wrapped__'):
+            print("❌ Timing wrapper still installed while disabled")
+            return False
+        print("✅ Wrappers removed when disabled")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+    finally:
+        instrumentation.disable()
+        METRICS.stop_serving()
+        METRICS.reset()
+
+def test_import_paths():
+    """Test the inference-only load path and the lazy imports"""
+    print("\n" + "="*60)
+    print("TEST 19: Import Paths")
+    print("="*60)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor
+        from import_profile import profile
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        trained = MoldingQualityPredictor(model_path=model_path)
+        trained.train_models()
+        inputs, _, _ = trained.generate_training_data(samples=200, seed=11)
+        
+        light = MoldingQualityPredictor(model_path=model_path)
+        if not light.load_models(inference_only=True):
+            print(f"❌ Inference-only load failed: {light.load_error}")
+            return False
+        full = trained.predict_batch(inputs)
+        numpy_only = light.predict_batch(inputs)
+        for key in ['warpage_percent', 'sinkage_percent']:
+            if not np.allclose(full[key], numpy_only[key], atol=1e-9):
+                print(f"❌ Inference-only {key} differs from the scikit-learn models")
+                return False
+        print("✅ Inference-only predictions match the full models")
+        
+        report = profile('scoring_worker', model_path=model_path)
+        loaded = [m for m in ['sklearn', 'scipy', 'pandas'] if m in report['heavy_modules']]
+        if loaded:
+            print(f"❌ Scoring worker imported {', '.join(loaded)}")
+            return False
+        print(f"✅ Scoring worker starts in {report['seconds']:.2f} s without scikit-learn, scipy or pandas")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_analysis_cache():
+    """Test memoized Optimization Assistant results"""
+    print("\n" + "="*60)
+    print("TEST 20: Analysis Cache")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from optimization_engine import OptimizationEngine
+        from analysis_cache import AnalysisCache
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        predictor.train_models()
+        optimizer = OptimizationEngine()
+        cache = AnalysisCache(predictor, optimizer)
+        
+        process = {'melt_temp': 250, 'mold_temp': 40, 'part_temp': 60, 'injection_pressure': 75,
+                   'holding_pressure': 45, 'holding_time': 8, 'cooling_time': 25}
+        geometry = {'wall_thickness': 2.5, 'part_volume': 80, 'aspect_ratio': 1.5, 'time_to_fill': 8}
+        # Fixed predictions so every rule fires regardless of the trained model
+        analysis = {'process_params': process, 'geometry_params': geometry,
+                    'predictions': {'warpage_percent': 5.0, 'sinkage_percent': 4.5}}
+        
+        first = cache.assistant(analysis)
+        calls = predictor.predict
+        predictor.predict = None
+        second = cache.assistant(dict(analysis, process_params=dict(reversed(list(process.items())))))
+        predictor.predict = calls
+        if second is not first:
+            print("❌ Rerun recomputed the assistant results")
+            return False
+        expected = optimizer.generate_suggestions(process, geometry, analysis['predictions'])
+        if first['suggestions'] != expected:
+            print("❌ Cached suggestions differ from generate_suggestions()")
+            return False
+        print(f"✅ {expected['suggestion_count']} suggestions computed once, reused on rerun")
+        
+        misses = cache.misses
+        applied = cache.apply(analysis, ['Melt Temperature'])
+        if cache.misses != misses + 1 or applied['process_params']['melt_temp'] != 225 \
+                or applied['process_params']['mold_temp'] != 40:
+            print("❌ Applying one suggestion did not predict exactly one new parameter set")
+            return False
+        cache.apply(analysis, ['Melt Temperature'])
+        if cache.misses != misses + 1:
+            print("❌ Re-applying the same suggestion predicted again")
+            return False
+        print(f"✅ Apply predicts only the changed set (score {applied['quality_score']:.1f}%)")
+        
+        predictor.model_version = "retrained"
+        if cache.assistant(analysis) is first:
+            print("❌ Cache not keyed by model version")
+            return False
+        print("✅ New model version invalidates cached results")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_geometry_binding():
+    """Test geometry-bound predictions and the model-based setpoint search"""
+    print("\n" + "="*60)
+    print("TEST 21: Geometry Binding")
+    print("="*60)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor, PROCESS_FEATURES, GEOMETRY_FEATURES
+        from optimization_engine import OptimizationEngine
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        trained = MoldingQualityPredictor(model_path=model_path)
+        trained.train_models()
+        light = MoldingQualityPredictor(model_path=model_path)
+        light.load_models(inference_only=True)
+        
+        X, _, _ = trained.generate_training_data(samples=500, seed=21)
+        X[:, len(PROCESS_FEATURES):] = X[0, len(PROCESS_FEATURES):]
+        geometry = dict(zip(GEOMETRY_FEATURES, X[0, len(PROCESS_FEATURES):]))
+        for label, predictor in [("scikit-learn", trained), ("inference-only", light)]:
+            bound = predictor.bind_geometry(geometry)
+            full = predictor.predict_batch(X)
+            partial = bound.predict_batch(X[:, :len(PROCESS_FEATURES)])
+            for key in ['warpage_percent', 'sinkage_percent']:
+                if not np.allclose(full[key], partial[key], rtol=1e-12, atol=1e-12):
+                    print(f"❌ {label} bound {key} differs from predict_batch()")
+                    return False
+            process = dict(zip(PROCESS_FEATURES, X[1, :len(PROCESS_FEATURES)]))
+            single, bound_single = predictor.predict(process, geometry), bound.predict(process)
+            if abs(single['warpage_percent'] - bound_single['warpage_percent']) > 1e-12 or \
+                    single['out_of_range'] != bound_single['out_of_range']:
+                print(f"❌ {label} bound predict() differs from predict()")
+                return False
+        print("✅ Bound predictions match predict() for both model formats")
+        
+        optimizer = OptimizationEngine()
+        current = optimizer.calculate_quality_score(single['warpage_percent'], single['sinkage_percent'])
+        searched = optimizer.search_setpoints(bound, process, samples=512)
+        recheck = light.predict(searched['process_params'], geometry)
+        if searched['quality_score'] < current['overall_quality'] or \
+                abs(recheck['warpage_percent'] - searched['warpage_percent']) > 1e-9:
+            print("❌ Setpoint search result is worse than the start or does not reproduce")
+            return False
+        print(f"✅ Setpoint search: {current['overall_quality']:.1f}% → {searched['quality_score']:.1f}% "
+              f"in {searched['evaluations']} evaluations")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_setpoint_index():
+    """Test the geometry to setpoint nearest-neighbour index"""
+    print("\n" + "="*60)
+    print("TEST 22: Setpoint Index")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from optimization_engine import OptimizationEngine
+        from setpoint_index import SetpointIndex
+        
+        model_path = os.path.join(tempfile.mkdtemp(), "")
+        predictor = MoldingQualityPredictor(model_path=model_path)
+        predictor.train_models()
+        optimizer = OptimizationEngine()
+        
+        grid = SetpointIndex.geometry_grid(points_per_axis=2)
+        index = SetpointIndex.build(predictor, optimizer, grid, samples=128)
+        nearest = index.query(grid[5], k=3)
+        if len(index) != 16 or nearest[0]['distance'] != 0 or \
+                [r['distance'] for r in nearest] != sorted(r['distance'] for r in nearest):
+            print("❌ Grid geometry not returned first")
+            return False
+        print(f"✅ Indexed {len(index)} grid geometries; nearest recipe {nearest[0]['quality_score']:.1f}%")
+        
+        part = {'wall_thickness': 2.2, 'part_volume': 95, 'aspect_ratio': 1.8, 'time_to_fill': 6}
+        starts = [recipe['process_params'] for recipe in index.query(part)]
+        best = optimizer.search_setpoints(predictor.bind_geometry(part), samples=128, starts=starts)
+        start_scores = []
+        for start in starts:
+            prediction = predictor.predict(start, part)
+            start_scores.append(optimizer.calculate_quality_score(
+                prediction['warpage_percent'], prediction['sinkage_percent'])['overall_quality'])
+        if best['quality_score'] < max(start_scores) - 1e-9:
+            print("❌ Warm-started search scored below its start recipes")
+            return False
+        index.add(part, best['process_params'], best['quality_score'])
+        if index.tree_size != 16 or index.query(part, k=1)[0]['distance'] != 0:
+            print("❌ Incrementally added part not found in the buffer")
+            return False
+        print(f"✅ Warm-started search reached {best['quality_score']:.1f}%; new part found before a rebuild")
+        
+        filename = index.save(os.path.join(model_path, "setpoint_index.npz"))
+        loaded = SetpointIndex.load(filename)
+        if len(loaded) != 17 or loaded.model_version != predictor.model_version or \
+                loaded.query(part, k=1)[0]['process_params'] != index.query(part, k=1)[0]['process_params']:
+            print("❌ Saved index does not round-trip")
+            return False
+        print("✅ Index persisted and reloaded with its model version")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_doe_planner():
+    """Test space-filling designs and trial-shot proposals"""
+    print("\n" + "="*60)
+    print("TEST 23: DOE Planner")
+    print("="*60)
+    
+    try:
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor
+        from doe_planner import DOEPlanner
+        
+        planner = DOEPlanner(members=3)
+        lhs = planner.design(64)
+        sobol = planner.design(64, method='sobol')
+        uniform = np.random.default_rng(0).uniform(planner.lower, planner.upper, size=lhs.shape)
+        in_bounds = all(((d >= planner.lower) & (d <= planner.upper)).all() for d in [lhs, sobol])
+        # Latin hypercube: exactly one setting in each of the 64 slices of every feature
+        strata = np.floor(planner.to_unit(lhs) * 64).astype(int)
+        stratified = all(len(np.unique(strata[:, j])) == 64 for j in range(strata.shape[1]))
+        if not (in_bounds and stratified) or planner.discrepancy(sobol) >= planner.discrepancy(uniform):
+            print("❌ Designs out of bounds, not stratified or no more even than uniform sampling")
+            return False
+        print(f"✅ Discrepancy: uniform {planner.discrepancy(uniform):.4f}, LHS {planner.discrepancy(lhs):.4f}, "
+              f"Sobol {planner.discrepancy(sobol):.4f}")
+        
+        warpage, sinkage = MoldingQualityPredictor.simulate_shots(lhs, seed=0)
+        planner.fit(lhs, warpage, sinkage)
+        scores = planner.score_designs([planner.design(32, seed=s) for s in range(4)])
+        proposed = planner.propose(lhs, 8)
+        if len(scores) != 4 or 'mean_disagreement' not in scores[0] or proposed.shape != (8, 11) or \
+                len(np.unique(proposed, axis=0)) != 8:
+            print("❌ Design scoring or proposals malformed")
+            return False
+        gap = lambda X: np.sqrt(((planner.to_unit(X)[:, None] - planner.to_unit(lhs)[None]) ** 2).sum(-1)).min(1).mean()
+        if gap(proposed) <= gap(uniform[:8]):
+            print("❌ Proposed shots no farther from the existing data than random ones")
+            return False
+        print(f"✅ Proposed 8 trial shots, mean distance to existing {gap(proposed):.3f} vs random {gap(uniform[:8]):.3f}")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_coreset():
+    """Test weighted coreset reduction of the training set"""
+    print("\n" + "="*60)
+    print("TEST 24: Coreset Training")
+    print("="*60)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor
+        from coreset import build_coreset, fit_weighted
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        X, y_warpage, y_sinkage = predictor.generate_training_data(samples=6000, seed=5)
+        for method in ['kmeans', 'leverage']:
+            X_core, w_core, s_core, weights = build_coreset(X, y_warpage, y_sinkage, size=256,
+                                                            method=method, chunk_size=2000)
+            if len(X_core) != 256 or len(w_core) != 256 or abs(weights.sum() - 6000) > 1e-6 or (weights <= 0).any():
+                print(f"❌ {method} coreset has wrong size or weights")
+                return False
+            # Weighted feature means should track the full data
+            drift = np.abs(np.average(X_core, axis=0, weights=weights) - X.mean(axis=0)) / X.std(axis=0)
+            if drift.max() > 0.25:
+                print(f"❌ {method} coreset is not representative (mean off by {drift.max():.2f} std)")
+                return False
+            print(f"✅ {method}: 6000 rows → 256, weights sum to 6000, means within {drift.max():.2f} std")
+        
+        predictor.train_models(X=X, y_warpage=y_warpage, y_sinkage=y_sinkage, coreset_size=512)
+        X_test, _, _ = predictor.generate_training_data(samples=500, seed=6)
+        truth, _ = MoldingQualityPredictor.simulate_shots(X_test, noise=False)
+        rmse = np.sqrt(np.mean((predictor.predict_batch(X_test)['warpage_percent'] - truth) ** 2))
+        if not predictor.ready or rmse > 0.6:
+            print(f"❌ Coreset-trained model not ready or inaccurate (RMSE {rmse:.3f})")
+            return False
+        print(f"✅ Trained on a 512-row coreset of 6000 rows, warpage RMSE {rmse:.3f}")
+        
+        # Estimators without sample_weight (MLPRegressor before scikit-learn 1.7) get resampled rows
+        class Unweighted:
+            def fit(self, X, y):
+                self.rows = X
+                return self
+        counts = np.bincount(fit_weighted(Unweighted(), np.arange(4)[:, None], np.zeros(4),
+                                          np.array([1.0, 1.0, 2.0, 4.0])).rows[:, 0], minlength=4)
+        if list(counts) != [2, 2, 4, 8]:
+            print(f"❌ Resampling fallback does not follow the weights: {list(counts)}")
+            return False
+        print("✅ Without sample_weight, rows are resampled in proportion to their weights")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_checkpointed_training():
+    """Test resumable, time-budgeted training"""
+    print("\n" + "="*60)
+    print("TEST 25: Checkpointed Training")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from checkpointed_training import CheckpointedTrainer
+        from setpoint_index import SetpointIndex
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        X, y_warpage, y_sinkage = predictor.generate_training_data(samples=400, seed=7)
+        first = CheckpointedTrainer(predictor, checkpoint_every=5)
+        report = first.train(budget_seconds=0.0, X=X, y_warpage=y_warpage, y_sinkage=y_sinkage)
+        if report['stopped'] != 'budget' or not os.path.exists(first.checkpoint_file) or not predictor.ready:
+            print("❌ Budget stop did not keep a checkpoint and install a usable model")
+            return False
+        print(f"✅ Budget stop at epoch {report['epochs']}, checkpoint kept, model ready")
+        
+        # Simulate a crash mid-run: the next trainer picks up from the last periodic checkpoint
+        crashing = CheckpointedTrainer(predictor, checkpoint_every=5)
+        run_epoch = crashing.run_epoch
+        def crash_after_checkpoint():
+            run_epoch()
+            if crashing.state['epoch'] == 13:
+                raise KeyboardInterrupt
+        crashing.run_epoch = crash_after_checkpoint
+        try:
+            crashing.train()
+        except KeyboardInterrupt:
+            pass
+        optimizer_steps = CheckpointedTrainer(predictor).resume()['models']['warpage']._optimizer.t
+        
+        resumed = CheckpointedTrainer(predictor, checkpoint_every=5)
+        report = resumed.train()
+        if report['resumed_from'] != 11 or optimizer_steps == 0:
+            print(f"❌ Expected to resume from epoch 11 with optimizer state, got {report['resumed_from']}")
+            return False
+        if report['stopped'] != 'converged' or os.path.exists(resumed.checkpoint_file) or not predictor.ready:
+            print("❌ Resumed run did not converge, clean up and install its model")
+            return False
+        print(f"✅ Crash at epoch 13 resumed from epoch {report['resumed_from']}, "
+              f"converged at epoch {report['epochs']} (warpage RMSE {report['warpage_rmse']:.3f})")
+        
+        # The setpoint index is built offline with the models, so serving only loads it
+        index = SetpointIndex.load_current(predictor)
+        if index is None or len(index) != len(SetpointIndex.geometry_grid()):
+            print("❌ No setpoint index saved for the installed models")
+            return False
+        predictor.model_version = "older"
+        if SetpointIndex.load_current(predictor) is not None:
+            print("❌ Setpoint index for other models was loaded")
+            return False
+        print(f"✅ Setpoint index of {len(index)} geometries saved with the models")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_shot_stream():
+    """Test the streaming shot ingestion pipeline"""
+    print("\n" + "="*60)
+    print("TEST 26: Shot Stream Ingestion")
+    print("="*60)
+    
+    try:
+        import time
+        import socket
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor
+        from optimization_engine import OptimizationEngine
+        from history_store import HistoryStore
+        from spc_engine import SPCEngine
+        from shot_stream import ShotIngestionService, FileSource, SocketSource, synthetic_shots
+        from report_archive import ReportArchive
+        
+        predictor = MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), ""))
+        predictor.train_models()
+        directory = tempfile.mkdtemp()
+        
+        # 3000 shots from 12 machines, every 100th bad, through one-batch queues
+        lines = synthetic_shots(3000, machines=12, invalid_every=100)
+        shots_file = os.path.join(directory, "shots.jsonl")
+        with open(shots_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        store = HistoryStore(os.path.join(directory, "history.db"))
+        alarms = []
+        spc = SPCEngine()
+        spc.alarm_hooks.append(alarms.append)
+        service = ShotIngestionService(predictor, OptimizationEngine(), store, spc_engine=spc,
+                                       batch_size=50, queue_size=1)
+        archive = ReportArchive(os.path.join(directory, "archive"))
+        service.record_hooks.append(archive.append_many)
+        report = service.run(FileSource(shots_file, follow=False))
+        archive.close()
+        if store.count() != 2970 or report['rejected'] != 30 or len(store.machine_ids()) != 12:
+            print(f"❌ Stored {store.count()}, rejected {report['rejected']}; expected 2970 and 30")
+            return False
+        if report['alarms'] != len(alarms) or any(report['queue_depth'].values()) or \
+                archive.stats()['records'] != 2970:
+            print("❌ Alarm hooks, queue draining or the archive hook disagree with the report")
+            return False
+        
+        record = store.query(limit=1, newest_first=False)[0]
+        expected = predictor.predict(record['process_params'], record['geometry_params'])
+        if abs(record['predictions']['warpage_percent'] - expected['warpage_percent']) > 1e-9:
+            print("❌ Streamed prediction differs from predict()")
+            return False
+        throughput = report['stages']['store']['rows_per_second']
+        print(f"✅ File: 2970 stored and archived, 30 rejected, {len(alarms)} alarms, {throughput:,.0f} shots/s "
+              f"(reader blocked {report['stages']['read']['blocked_seconds']:.2f} s on a full queue)")
+        
+        # Several machines on one socket, with a record split across two sends
+        source = SocketSource(('127.0.0.1', 0))
+        store = HistoryStore(os.path.join(directory, "socket.db"))
+        service = ShotIngestionService(predictor, OptimizationEngine(), store, batch_timeout=0.05).start(source)
+        for machine in range(5):
+            with socket.create_connection(source.address) as client:
+                payload = "\n".join(synthetic_shots(20, seed=machine)) + "\n"
+                client.sendall(payload[:30].encode())
+                client.sendall(payload[30:].encode())
+        deadline = time.time() + 10
+        while service.report()['stages']['store']['rows'] < 100 and time.time() < deadline:
+            time.sleep(0.05)
+        service.stop()
+        if store.count() != 100 or service.rejected:
+            print(f"❌ Socket ingestion stored {store.count()} of 100 shots")
+            return False
+        print("✅ Socket: 100 shots from 5 connections stored")
+        
+        try:
+            ShotIngestionService(MoldingQualityPredictor(model_path=os.path.join(tempfile.mkdtemp(), "")),
+                                 OptimizationEngine(), store).start(FileSource(shots_file))
+            print("❌ Started without a ready predictor")
+            return False
+        except RuntimeError:
+            print("✅ Refuses to start before the predictor is ready")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_soak_harness():
+    """Test the replay-driven soak harness"""
+    print("\n" + "="*60)
+    print("TEST 27: Soak Harness")
+    print("="*60)
+    
+    try:
+        import tempfile
+        from quality_predictor import MoldingQualityPredictor
+        from benchmark_suite import compare
+        from soak_harness import SoakHarness, make_target
+        
+        directory = os.path.join(tempfile.mkdtemp(), "")
+        predictor = MoldingQualityPredictor(model_path=directory)
+        predictor.train_models()
+        X, _, _ = predictor.generate_training_data(samples=200, seed=8)
+        
+        # Paced run: 200 shots/s for 1.5 s should deliver about 300 shots in three windows
+        summary = SoakHarness(make_target('predictor', predictor, directory), X, rate=200, concurrency=2,
+                              duration=1.5, interval=0.5).run()
+        totals = summary['totals']
+        if totals['errors'] or not 250 <= totals['shots'] <= 301 or len(summary['windows']) < 3:
+            print(f"❌ Paced run delivered {totals['shots']} shots in {len(summary['windows'])} windows")
+            return False
+        if not 0 < summary['latency']['p50_ms'] <= summary['latency']['p99_ms']:
+            print("❌ Latency percentiles are inconsistent")
+            return False
+        print(f"✅ Paced: {totals['shots']} shots at {totals['shots_per_s']:.0f}/s, "
+              f"p99 {summary['latency']['p99_ms']:.2f} ms, RSS {summary['memory']['rss_growth_mb']:+.1f} MB")
+        
+        if any(row['regression'] for row in compare(summary, summary)):
+            print("❌ A summary compared with itself shows regressions")
+            return False
+        print("✅ Summary works with benchmark_suite.compare()")
+        
+        # End to end through the ingestion service on a local socket, as fast as it goes
+        summary = SoakHarness(make_target('stream', predictor, directory), X, concurrency=3, batch_size=10,
+                              max_shots=300, duration=10).run()
+        if summary['totals']['errors'] or summary['totals']['shots'] != 300:
+            print(f"❌ Stream run: {summary['totals']['shots']} shots, errors {summary['errors'][:1]}")
+            return False
+        print(f"✅ Stream: 300 shots end to end, p50 {summary['latency']['p50_ms']:.2f} ms per 10-shot batch")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_memory_accounting():
+    """Test memory accounting and budget enforcement"""
+    print("\n" + "="*60)
+    print("TEST 28: Memory Accounting")
+    print("="*60)
+    
+    try:
+        import gc
+        import tempfile
+        import numpy as np
+        from quality_predictor import MoldingQualityPredictor, PROCESS_FEATURES, GEOMETRY_FEATURES, FEATURE_NAMES
+        from optimization_engine import OptimizationEngine
+        from analysis_cache import AnalysisCache
+        from history_store import HistoryStore
+        from config_loader import memory_budgets
+        from memory_accounting import (MemoryAccountant, deep_sizeof, evict_analysis_cache,
+                                       spill_history, MB)
+        
+        array = np.zeros(100000)
+        if not array.nbytes <= deep_sizeof([array, array[10:], array[::2]]) < array.nbytes + 1000:
+            print("❌ deep_sizeof does not count a shared numpy buffer exactly once")
+            return False
+        if set(memory_budgets()) < {'process_mb', 'session_mb', 'check_interval_s'}:
+            print("❌ Budgets missing from config.json")
+            return False
+        print(f"✅ Array with two views sized once; budgets {memory_budgets()}")
+        
+        directory = tempfile.mkdtemp()
+        predictor = MoldingQualityPredictor(model_path=os.path.join(directory, ""))
+        predictor.train_models()
+        store = HistoryStore(os.path.join(directory, "history.db"), batch_size=10 ** 6)
+        accountant = MemoryAccountant({'process_mb': 10 ** 6, 'session_mb': 0.25, 'check_interval_s': 5})
+        accountant.register('predictor', predictor)
+        accountant.register('history_store', store, trim=spill_history)
+        
+        X, _, _ = predictor.generate_training_data(samples=600, seed=9)
+        caches = {}
+        for session in ['a', 'b']:
+            cache = caches[session] = AnalysisCache(predictor, OptimizationEngine(), max_entries=10 ** 6)
+            accountant.register('analysis_cache', cache, session=session, trim=evict_analysis_cache)
+            for row in X:
+                values = dict(zip(FEATURE_NAMES, row.tolist()))
+                process = {name: values[name] for name in PROCESS_FEATURES}
+                geometry = {name: values[name] for name in GEOMETRY_FEATURES}
+                result = cache.predict(process, geometry)
+                store.append({'timestamp': '2026-01-01 00:00:00', 'process_params': process,
+                              'geometry_params': geometry, 'predictions': result['predictions'],
+                              'quality_score': result['quality_score']})
+        
+        before = accountant.measure()
+        # Sized alone, a cache includes the predictor it references; in the report it must not
+        if before['process']['predictor'] != deep_sizeof(predictor) or \
+                before['sessions']['a']['analysis_cache'] >= deep_sizeof(caches['a']):
+            print("❌ The shared predictor is not counted once, outside the sessions")
+            return False
+        
+        accountant.enforce()
+        after = accountant.measure()
+        session_sizes = [sum(sizes.values()) for sizes in after['sessions'].values()]
+        if max(session_sizes) > 1.1 * 0.25 * MB or not 0 < len(caches['a'].entries) < 600:
+            print(f"❌ Session budget not enforced: {[f'{size / MB:.2f}' for size in session_sizes]} MB")
+            return False
+        print(f"✅ Session caches trimmed from {before['sessions']['a']['analysis_cache'] / MB:.2f} MB "
+              f"to {after['sessions']['a']['analysis_cache'] / MB:.2f} MB (budget 0.25 MB)")
+        
+        del caches['b'], cache
+        gc.collect()
+        accountant.budgets['process_mb'] = 0
+        accountant.enforce(min_interval=0)
+        report = accountant.measure()
+        if list(report['sessions']) != ['a'] or store.pending or store.count() != 1200:
+            print("❌ Ended session still listed, or history not spilled to disk on the process budget")
+            return False
+        print(f"✅ Ended session dropped; over the process budget {store.count()} queued rows were spilled to disk")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_chart_templates():
+    """Test chart templates and incremental trace updates"""
+    print("\n" + "="*60)
+    print("TEST 29: Chart Templates")
+    print("="*60)
+    
+    try:
+        import time
+        import numpy as np
+        import plotly.io as pio
+        from optimization_engine import OptimizationEngine
+        from history_aggregates import HistoryAggregates
+        from chart_templates import ChartTemplates, RADAR_AXES
+        
+        optimizer = OptimizationEngine()
+        templates = ChartTemplates(optimizer)
+        midpoints = {name: np.mean(optimizer.optimal_ranges[name]) for name, _ in RADAR_AXES}
+        if not np.allclose(templates.figures['radar'].data[1].r, templates.normalize(midpoints)):
+            print("❌ Radar optimal range does not come from OptimizationEngine.optimal_ranges")
+            return False
+        print("✅ Radar optimal range drawn from OptimizationEngine.optimal_ranges")
+        
+        charts = templates.session_copy()
+        process = {'melt_temp': 230, 'mold_temp': 55, 'injection_pressure': 80, 'holding_pressure': 65,
+                   'holding_time': 15, 'cooling_time': 35}
+        predictions = {'warpage_percent': 3.2, 'sinkage_percent': 1.4}
+        start = time.perf_counter()
+        for i in range(20):
+            charts.gauge(80 + i)
+            charts.defects(predictions)
+            charts.radar(dict(process, melt_temp=220 + i))
+        patch_ms = (time.perf_counter() - start) / 20 * 1e3
+        if charts.figures['gauge'].data[0].value != 99 or templates.figures['gauge'].data[0].value != 0 or \
+                list(charts.figures['defects'].data[0].y) != [3.2, 1.4]:
+            print("❌ Patched values missing, or the shared template was modified")
+            return False
+        print(f"✅ Gauge, bar and radar patched in {patch_ms:.2f} ms per render; template left untouched")
+        
+        aggregates = HistoryAggregates()
+        sizes = []
+        rng = np.random.default_rng(0)
+        for total in [3000, 6000]:
+            for record_id in range(aggregates.count + 1, total + 1):
+                aggregates.update(record_id, rng.uniform(60, 100), rng.uniform(0, 8), rng.uniform(0, 4))
+            sizes.append(len(pio.to_json(charts.trend(aggregates).to_dict(), validate=False)))
+        trace = charts.figures['trend'].data[0]
+        x = trace.x
+        charts.trend(aggregates)
+        if charts.figures['trend'].data[0].x is not x or len(x) > 2000 or trace.x[-1] != 6000:
+            print("❌ Trend re-decimated without new analyses, or not decimated")
+            return False
+        if abs(sizes[1] - sizes[0]) > 0.05 * sizes[0]:
+            print(f"❌ Trend payload grows with the history: {sizes}")
+            return False
+        print(f"✅ Trend payload {sizes[0] / 1024:.1f} KB at 3000 and {sizes[1] / 1024:.1f} KB at 6000 analyses")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def test_report_archive():
+    """Test the compressed, rotating report archive"""
+    print("\n" + "="*60)
+    print("TEST 30: Report Archive")
+    print("="*60)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from quality_predictor import PROCESS_FEATURES, GEOMETRY_FEATURES
+        from report_generator import QualityReport
+        from report_archive import ReportArchive
+        
+        directory = tempfile.mkdtemp()
+        archive = ReportArchive(directory, max_segment_bytes=16 * 1024)
+        rng = np.random.default_rng(4)
+        records = []
+        for i in range(3000):
+            records.append({
+                'timestamp': f"2026-04-{1 + i // 1000:02d} {(i % 1000) // 60:02d}:{i % 60:02d}:00",
+                'machine_id': f"M{i % 3}",
+                'process_params': {name: float(rng.uniform(10, 200)) for name in PROCESS_FEATURES},
+                'geometry_params': {name: float(rng.uniform(1, 50)) for name in GEOMETRY_FEATURES},
+                'predictions': {'warpage_percent': float(rng.uniform(0, 6)),
+                                'sinkage_percent': float(rng.uniform(0, 3))},
+                'quality_score': float(rng.uniform(85, 100))
+            })
+        for start in range(0, 3000, 100):
+            archive.append_many(records[start:start + 100])
+        QualityReport.generate_report(dict(records[0], timestamp=None), archive=archive)
+        archive.flush()
+        stats = archive.stats()
+        if stats['records'] != 3001 or stats['segments'] < 3 or stats['errors']:
+            print(f"❌ Archive did not write and rotate as expected: {stats}")
+            return False
+        print(f"✅ {stats['records']} rows in {stats['segments']} segments, {stats['bytes'] / stats['records']:.0f} bytes/row")
+        
+        day = dict(start="2026-04-02 00:00:00", end="2026-04-02 23:59:59", status='PASS')
+        rows = list(archive.read(**day))
+        expected = [r for r in records[1000:2000] if r['quality_score'] >= 95]
+        if len(rows) != len(expected) or archive.count(**day) != len(expected) or \
+                rows[0]['warpage_percent'] != expected[0]['predictions']['warpage_percent']:
+            print("❌ Filtered read does not match the archived records exactly")
+            return False
+        opened = len(archive._matching_segments(**day))
+        if opened >= stats['segments'] - 1:
+            print("❌ Reader did not skip segments outside the date range")
+            return False
+        print(f"✅ {len(rows)} passing rows for one day with full precision, from {opened} of {stats['segments']} segments")
+        
+        archive.close()
+        reopened = ReportArchive(directory)
+        reopened.append(records[0])
+        reopened.close()
+        if reopened.stats()['records'] != 3002 or reopened.stats()['segments'] != stats['segments'] + 1 or \
+                len(list(reopened.read(machine_id='M1'))) != 1000:
+            print("❌ Reopened archive lost rows or the machine filter is wrong")
+            return False
+        print("✅ Reopened archive appends to a new segment after the sealed ones")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+def main():
+    """Run all tests"""
+    print("\n" + "█"*60)
+    print("█" + " "*58 + "█")
+    print("█" + "  INJECTION MOLDING QUALITY CHECKER - TEST SUITE".center(58) + "█")
+    print("█" + " "*58 + "█")
+    print("█"*60 + "\n")
+    
+    tests = [
+        ("Imports", test_imports),
+        ("Quality Predictor", test_quality_predictor),
+        ("Optimization Engine", test_optimization_engine),
+        ("Report Generator", test_report_generator),
+        ("Configuration", test_configuration),
+        ("Cascade Predictor", test_cascade_predictor),
+        ("Surrogate Distiller", test_surrogate_distiller),
+        ("Hyperparameter Search", test_hyperparameter_search),
+        ("Warm-Start Retraining", test_warm_start_retraining),
+        ("Model Readiness", test_model_readiness),
+        ("History Store", test_history_store),
+        ("History Aggregates", test_history_aggregates),
+        ("SPC Engine", test_spc_engine),
+        ("Drift Monitor", test_drift_monitor),
+        ("Bulk Reports", test_bulk_reports),
+        ("Input Validation", test_input_validation),
+        ("Benchmark Suite", test_benchmark_suite),
+        ("Instrumentation", test_instrumentation),
+        ("Import Paths", test_import_paths),
+        ("Analysis Cache", test_analysis_cache),
+        ("Geometry Binding", test_geometry_binding),
+        ("Setpoint Index", test_setpoint_index),
+        ("DOE Planner", test_doe_planner),
+        ("Coreset Training", test_coreset),
+        ("Checkpointed Training", test_checkpointed_training),
+        ("Shot Stream Ingestion", test_shot_stream),
+        ("Soak Harness", test_soak_harness),
+        ("Memory Accounting", test_memory_accounting),
+        ("Chart Templates", test_chart_templates),
+        ("Report Archive", test_report_archive)
+    ]
+    
+    results = []
+    
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"\n❌ Unexpected error in {test_name}: {str(e)}")
+            results.append((test_name, False))
+    
+    # Summary
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    
+    for test_name, result in results:
+        status = "✅ PASSED" if result else "❌ FAILED"
+        print(f"{test_name:.<40} {status}")
+    
+    print("\n" + "-"*60)
+    print(f"Total: {passed}/{total} tests passed")
+    
+    if passed == total:
+        print("\n🎉 All tests passed! Application is ready to use.")
+        print("\nTo start the application, run:")
+        print("  Windows: run.bat")
+        print("  Linux/Mac: ./run.sh")
+        print("  Or: streamlit run app.py")
+        return 0
+    else:
+        print(f"\n⚠️  {total - passed} test(s) failed. Please fix the issues above.")
+        print("Install dependencies with: pip install -r requirements.txt")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())